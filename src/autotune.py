@@ -0,0 +1,177 @@
+"""
+Detection Autotuner Module
+検出レイテンシを目標FPSに合わせてモデルの複雑度と入力縮小率を切り替える自動調整
+
+(model_complexity, input_scale) の組を軽い順に並べた段階（levels）を持ち、
+直近window回の検出レイテンシの中央値がフレーム予算を超えたら1段軽くし、
+予算に十分な余裕（upgrade_ratio未満）がある状態が続いたら1段重くします。
+段階を変えたあとは次のwindow回を計測し直すまで判断しません。
+上げた直後に下げ戻した場合は、次に上げるまでに必要な余裕のある区間を倍にして
+上げ下げの繰り返しを抑えます（ヒステリシス）。
+
+Handsの作り直しはmodel_complexityが変わるときだけ行い、縮小率の変更は
+次のフレームからそのまま反映されます。判断は全てログに出力し、decisionsに記録します。
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# 軽い順の (model_complexity, input_scale)
+DEFAULT_LEVELS = [[0, 0.5], [0, 0.75], [0, 1.0], [1, 0.75], [1, 1.0]]
+
+
+class DetectionAutotuner:
+    """
+    HandDetectorの負荷を目標FPSに合わせて調整するクラス
+
+    使い方:
+        start = time.perf_counter()
+        result = detector.detect(frame)
+        autotuner.observe(time.perf_counter() - start)
+
+    Attributes:
+        target_fps (float): 目標のフレームレート
+        budget (float): 1回の検出に使える秒数（1 / target_fps × budget_fraction）
+        levels (List[Tuple[int, float]]): 軽い順の (model_complexity, input_scale)
+        level (int): 現在の段階（levelsのインデックス）
+        decisions (List[Dict]): 段階を変えた判断の記録
+    """
+
+    def __init__(self, detector, config: dict):
+        """
+        自動調整の初期化（検出器の現在の設定に最も近い段階から始める）
+
+        Args:
+            detector: 調整するHandDetector
+            config (dict): 自動調整の設定
+                - target_fps: 目標のフレームレート (default: 30)
+                - budget_fraction: フレーム時間のうち検出に使える割合 (default: 0.8)
+                - window: 判断に使う検出回数 (default: 30)
+                - upgrade_ratio: レイテンシが予算のこの割合未満なら1段重くする (default: 0.6)
+                - max_upgrade_hold: 上げ下げを繰り返したときに待つ区間数の上限 (default: 8)
+                - levels: 軽い順の [model_complexity, input_scale] のリスト
+        """
+        self.detector = detector
+        self.logger = logging.getLogger(__name__)
+        self.target_fps = config.get("target_fps", 30)
+        self.budget = config.get("budget_fraction", 0.8) / self.target_fps
+        self.window = max(1, config.get("window", 30))
+        self.upgrade_ratio = config.get("upgrade_ratio", 0.6)
+        self.max_upgrade_hold = max(1, config.get("max_upgrade_hold", 8))
+        self.levels: List[Tuple[int, float]] = [
+            (int(complexity), float(scale)) for complexity, scale in config.get("levels", DEFAULT_LEVELS)
+        ]
+
+        self._samples = np.zeros(self.window, dtype=np.float64)
+        self._count = 0
+        self._good_windows = 0
+        self._upgrade_hold = 1
+        self._last_action: Optional[str] = None
+        self.decisions: List[Dict] = []
+
+        self.level = self._initial_level(detector.model_complexity, detector.input_scale)
+        self._apply(self.level)
+
+    def observe(self, latency: float) -> Optional[Dict]:
+        """
+        1回の検出レイテンシを記録し、必要なら段階を変える
+
+        Args:
+            latency (float): detect()にかかった秒数
+
+        Returns:
+            Optional[Dict]: 段階を変えた場合はその判断、それ以外はNone
+        """
+        self._samples[self._count % self.window] = latency
+        self._count += 1
+        if self._count < self.window:
+            return None
+
+        median = float(np.median(self._samples))
+        self._count = 0
+
+        if median > self.budget and self.level > 0:
+            self._good_windows = 0
+            if self._last_action == "up":
+                # 上げた直後に下げ戻した段階にはすぐ戻らない
+                self._upgrade_hold = min(self._upgrade_hold * 2, self.max_upgrade_hold)
+            return self._change(self.level - 1, "down", median)
+
+        if median < self.budget * self.upgrade_ratio and self.level < len(self.levels) - 1:
+            self._good_windows += 1
+            if self._good_windows >= self._upgrade_hold:
+                self._good_windows = 0
+                return self._change(self.level + 1, "up", median)
+        else:
+            self._good_windows = 0
+
+        self.logger.debug(
+            f"Autotune: keep level {self.level} {self.levels[self.level]} "
+            f"(p50 {median * 1000:.1f}ms, budget {self.budget * 1000:.1f}ms)"
+        )
+        return None
+
+    def get_stats(self) -> Dict:
+        """
+        自動調整の状態を返す
+
+        Returns:
+            Dict: level, model_complexity, input_scale, changes
+        """
+        complexity, scale = self.levels[self.level]
+        return {
+            "level": self.level,
+            "model_complexity": complexity,
+            "input_scale": scale,
+            "changes": len(self.decisions),
+        }
+
+    def _initial_level(self, model_complexity: int, input_scale: float) -> int:
+        """
+        検出器の現在の設定を超えない最も重い段階を選ぶ
+        """
+        level = 0
+        for index, (complexity, scale) in enumerate(self.levels):
+            if complexity <= model_complexity and scale <= input_scale:
+                level = index
+        return level
+
+    def _change(self, level: int, action: str, median: float) -> Dict:
+        """
+        段階を変えて判断を記録する
+        """
+        previous = self.level
+        rebuilt = self._apply(level)
+        self.level = level
+        self._last_action = action
+        decision = {
+            "time": time.time(),
+            "action": action,
+            "from": self.levels[previous],
+            "to": self.levels[level],
+            "latency_ms": median * 1000,
+            "budget_ms": self.budget * 1000,
+            "rebuilt": rebuilt,
+        }
+        self.decisions.append(decision)
+        self.logger.info(
+            f"Autotune: {action} {self.levels[previous]} -> {self.levels[level]} "
+            f"(p50 {median * 1000:.1f}ms, budget {self.budget * 1000:.1f}ms"
+            f"{', rebuilt Hands' if rebuilt else ''})"
+        )
+        return decision
+
+    def _apply(self, level: int) -> bool:
+        """
+        段階の設定を検出器に反映
+
+        Returns:
+            bool: Handsを作り直した場合True
+        """
+        complexity, scale = self.levels[level]
+        self.detector.input_scale = scale
+        return self.detector.set_model_complexity(complexity)
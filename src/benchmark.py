@@ -0,0 +1,387 @@
+"""
+Pipeline Benchmark
+録画または合成フレームで実際のパイプラインを動かし、性能を計測するハーネス
+
+設定から作ったHandTrackingAppのステージ（capture_frame / detect_hands /
+measure_joints / send_measurements）をそのまま呼び、取得 → 検出 → 計測 →
+シリアライズ → 送信 の各ステージのレイテンシ（p50/p95/p99）、スループット、
+ピークRSSを計測し、JSONで保存します。
+送信先にはローカルのスタブ受信サーバーを使うため、ネットワーク環境に依存しません。
+
+使い方:
+    python src/benchmark.py --source synthetic --frames 300 --output bench.json
+    python src/benchmark.py --source video --path recordings/session.mp4 --serializer binary
+"""
+
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import numpy as np
+import yaml
+
+try:
+    from .main import HandTrackingApp
+    from .landmarks import HandLandmarks
+except ImportError:
+    from main import HandTrackingApp
+    from landmarks import HandLandmarks
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+STAGES = ("capture", "detect", "measure", "serialize", "send", "total")
+
+
+class StubIngestServer:
+    """
+    ベンチマーク用のローカル受信サーバー（keep-alive対応、常に200を返す）
+
+    Attributes:
+        url (str): データ送信先のURL
+        requests_received (int): 受信したPOSTの数
+        bytes_received (int): 受信したボディの合計バイト数
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 0):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # ヘッダーとボディを別々に書くので、Nagleと遅延ACKで約40ms待たされないようにする
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._reply()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                with stub._lock:
+                    stub.requests_received += 1
+                    stub.bytes_received += length
+                self._reply()
+
+            def _reply(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self.requests_received = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+        self.url = f"http://{host}:{self._server.server_address[1]}/api/hand-data"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class BenchmarkApp(HandTrackingApp):
+    """
+    設定ファイルの代わりに設定辞書から作るHandTrackingApp
+
+    ログの出力先はベンチマーク側に任せ、ファイルや標準出力のハンドラは設定しません
+    （結果のJSONを標準出力に出すため）。
+    """
+
+    def __init__(self, config: dict):
+        """
+        ベンチマーク用アプリケーションの初期化
+
+        Args:
+            config (dict): アプリケーション設定
+        """
+        self._benchmark_config = config
+        super().__init__()
+
+    def load_config(self, config_path: str) -> dict:
+        return self._benchmark_config
+
+    def setup_logging(self):
+        pass
+
+
+def summarize_latencies(samples: np.ndarray) -> Dict:
+    """
+    レイテンシのサンプルを統計にまとめる
+
+    Args:
+        samples (np.ndarray): レイテンシ（秒）
+
+    Returns:
+        Dict: count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms
+    """
+    if samples.size == 0:
+        return {"count": 0}
+    ms = samples * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": int(samples.size),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    プロセスのピークRSSを返す
+
+    Returns:
+        Optional[float]: ピークRSS（MB）、取得できない環境ではNone
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linuxはキロバイト、macOSはバイト単位
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _fake_hands(count: int, rng: np.random.Generator) -> List[Dict]:
+    """
+    検出結果がないときに使う合成の手（計測・送信の負荷を実データに近づける）
+    """
+    labels = ("Right", "Left")
+    return [
+        {
+            "label": labels[i % 2],
+            "landmarks": HandLandmarks(rng.random((21, 3), dtype=np.float32)),
+            "confidence": 1.0
+        }
+        for i in range(count)
+    ]
+
+
+def benchmark_config(config: dict, endpoint: str) -> dict:
+    """
+    アプリケーション設定をベンチマーク用に書き換えたコピーを返す
+
+    送信先をスタブサーバーに向け、同期送信にします。計測対象は単一カメラの
+    逐次ループなので、マルチカメラ・検出プール・パイプライン・メトリクスは無効にします。
+    それ以外（ケイデンス・追跡・平滑化・自動調整など）は設定どおりに動かします。
+
+    Args:
+        config (dict): アプリケーション設定
+        endpoint (str): データ送信先のURL
+
+    Returns:
+        dict: ベンチマーク用の設定
+    """
+    config = dict(config)
+    sender_config = dict(config.get("data_sender", {}))
+    sender_config.update({
+        "endpoint": endpoint,
+        "method": "POST",
+        "async_send": False,
+        "retry_attempts": 1,
+    })
+    config["data_sender"] = sender_config
+    config["cameras"] = []
+    config["detector_pool"] = dict(config.get("detector_pool", {}), enabled=False)
+    config["pipeline"] = dict(config.get("pipeline", {}), enabled=False)
+    config["metrics"] = dict(config.get("metrics", {}), enabled=False)
+    return config
+
+
+def _timed(func, samples: List[float]):
+    """
+    呼び出しごとの処理時間をsamplesに追加する関数でラップ
+    """
+    clock = time.perf_counter
+
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(clock() - start)
+
+    return timed
+
+
+def run_benchmark(config: dict, frames: int = 300, fake_hands: int = 1,
+                  warmup: int = 5) -> Dict:
+    """
+    ベンチマークを実行
+
+    設定からHandTrackingAppを作り、そのステージメソッドを順に呼んで時間を計ります。
+    serializeはsend_measurements()の中のDataSender.prepare_body()の時間で、
+    sendはsend_measurements()からそれを除いた時間です。
+
+    Args:
+        config (dict): アプリケーション設定（camera / hand_detection /
+            measurement / data_sender など）。data_senderの送信先はスタブサーバーに置き換えます
+        frames (int): 計測するフレーム数
+        fake_hands (int): 手が検出されなかったフレームで代わりに使う合成の手の数
+            （0なら手がないフレームは計測・送信しない）
+        warmup (int): 計測前に捨てるフレーム数
+
+    Returns:
+        Dict: ベンチマーク結果
+
+    Raises:
+        RuntimeError: アプリケーションを初期化できなかった場合
+    """
+    server = StubIngestServer()
+    server.start()
+
+    config = benchmark_config(config, server.url)
+    app = BenchmarkApp(config)
+    rng = np.random.default_rng(0)
+
+    # 送信ステージの中のシリアライズ時間を取り出す
+    serialize_samples: List[float] = []
+    if app.sender is not None:
+        app.sender.prepare_body = _timed(app.sender.prepare_body, serialize_samples)
+
+    # ステージごとのレイテンシ（事前確保）
+    latencies = {stage: np.zeros(frames, dtype=np.float64) for stage in STAGES}
+    counts = {stage: 0 for stage in STAGES}
+    processed = 0
+    duration = 0.0
+
+    def observe(stage: str, value: float):
+        latencies[stage][counts[stage]] = value
+        counts[stage] += 1
+
+    try:
+        if not app.initialize():
+            raise RuntimeError("Failed to initialize hand tracking app")
+        app.running = True
+
+        for _ in range(warmup):
+            item = app.capture_frame()
+            if item is not None:
+                app.detect_hands(item)
+
+        start_wall = time.perf_counter()
+        while processed < frames:
+            t0 = time.perf_counter()
+            item = app.capture_frame()
+            t1 = time.perf_counter()
+            if item is None:
+                break
+
+            detected = app.detect_hands(item)
+            t2 = time.perf_counter()
+            observe("capture", t1 - t0)
+            observe("detect", t2 - t1)
+            processed += 1
+
+            if detected is None:
+                if fake_hands <= 0:
+                    observe("total", t2 - t0)
+                    continue
+                hands = _fake_hands(fake_hands, rng)
+                item["detection"] = {"hand_count": len(hands), "hands": hands}
+
+            app.measure_joints(item)
+            t3 = time.perf_counter()
+
+            serialize_samples.clear()
+            app.send_measurements(item)
+            t4 = time.perf_counter()
+
+            serialize = sum(serialize_samples)
+            observe("measure", t3 - t2)
+            observe("serialize", serialize)
+            observe("send", t4 - t3 - serialize)
+            observe("total", t4 - t0)
+
+        duration = time.perf_counter() - start_wall
+    finally:
+        app.running = False
+        app.cleanup()
+        server.stop()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "frames": processed,
+        "duration_s": round(duration, 3),
+        "throughput_fps": round(processed / duration, 2) if duration > 0 else 0.0,
+        "stages": {
+            stage: summarize_latencies(latencies[stage][:counts[stage]]) for stage in STAGES
+        },
+        "send_failures": app.sender.get_stats()["send_failures"],
+        "bytes_sent": server.bytes_received,
+        "bytes_per_frame": round(server.bytes_received / processed, 1) if processed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "settings": {
+            "source": config.get("camera", {}).get("source", "camera"),
+            "serializer": config["data_sender"].get("serializer", "json"),
+            "model_complexity": config.get("hand_detection", {}).get("model_complexity", 1),
+            "fake_hands": fake_hands,
+        },
+        "platform": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+    }
+
+
+def main():
+    """
+    エントリーポイント
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hand Tracking System - Pipeline Benchmark")
+    parser.add_argument("--config", default="config.yaml", help="Path to configuration file")
+    parser.add_argument("--source", default="synthetic",
+                        choices=["synthetic", "video", "images", "camera"],
+                        help="Frame source (default: synthetic)")
+    parser.add_argument("--path", help="Video file or image directory for video/images sources")
+    parser.add_argument("--pacing", default="fast", choices=["fast", "realtime", "fixed"],
+                        help="Frame pacing for non-camera sources (default: fast)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to measure")
+    parser.add_argument("--serializer", choices=["json", "binary"], help="Override serializer")
+    parser.add_argument("--fake-hands", type=int, default=1,
+                        help="Synthetic hands to use when none are detected (default: 1)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    camera_config = dict(config.get("camera", {}))
+    camera_config.update({"source": args.source, "pacing": args.pacing, "threaded": False})
+    if args.path:
+        camera_config["path"] = args.path
+    config["camera"] = camera_config
+    if args.serializer:
+        config.setdefault("data_sender", {})["serializer"] = args.serializer
+
+    results = run_benchmark(config, frames=args.frames, fake_hands=args.fake_hands)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
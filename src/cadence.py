@@ -0,0 +1,146 @@
+"""
+Detection Cadence Module
+手検出の実行頻度を状況に応じて切り替えるコントローラー
+
+手が見えている間は毎フレーム検出し（active）、一定フレーム手が見つからなければ
+低頻度の検出に落とします（idle）。idle中は縮小したグレースケール画像の
+フレーム差分で動きを監視し、動きがあれば即座にactiveに戻って検出します。
+常時稼働のキオスク端末で、誰もいない間のCPU使用率を下げるために使います。
+"""
+
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class CadenceController:
+    """
+    検出ケイデンスの制御
+
+    使い方:
+        if controller.should_detect(frame):
+            result = detector.detect(frame)
+            controller.update(result["hand_count"])
+
+    Attributes:
+        state (str): "active"（毎フレーム検出）または "idle"（低頻度検出）
+        idle_after (int): 手のない検出がこの回数続いたらidleにする
+        idle_fps (float): idle中の検出頻度
+        motion_threshold (float): 動きとみなす平均輝度差（0〜255）
+    """
+
+    def __init__(self, config: dict):
+        """
+        ケイデンスコントローラーの初期化
+
+        Args:
+            config (dict): ケイデンス設定
+                - idle_after: idleに入るまでの手のない検出回数 (default: 30)
+                - idle_fps: idle中の検出頻度 (default: 2.0)
+                - motion_threshold: 動き検知の平均輝度差 (default: 4.0)
+                - motion_size: 差分を取る縮小画像の幅 (default: 64)
+        """
+        self.idle_after = max(1, config.get("idle_after", 30))
+        self.idle_fps = config.get("idle_fps", 2.0)
+        self.motion_threshold = config.get("motion_threshold", 4.0)
+        self.motion_size = max(8, config.get("motion_size", 64))
+
+        self.state = "active"
+        self.frames_skipped = 0
+        self.wakeups = 0
+        self._misses = 0
+        self._last_detect = 0.0
+        self._small: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._reference: Optional[np.ndarray] = None
+
+    def should_detect(self, frame: np.ndarray) -> bool:
+        """
+        このフレームで検出を実行するか判定
+
+        Args:
+            frame (np.ndarray): 入力画像フレーム（BGR）
+
+        Returns:
+            bool: 検出するならTrue
+        """
+        if self.state == "active":
+            return True
+
+        if self._motion(frame):
+            # 動きがあれば反応時間を優先してすぐに検出する
+            self.state = "active"
+            self._misses = 0
+            self.wakeups += 1
+            return True
+
+        if self.idle_fps > 0 and time.monotonic() - self._last_detect >= 1.0 / self.idle_fps:
+            return True
+
+        self.frames_skipped += 1
+        return False
+
+    def update(self, hand_count: int):
+        """
+        検出結果を反映して状態を更新
+
+        Args:
+            hand_count (int): 検出された手の数
+        """
+        self._last_detect = time.monotonic()
+        if hand_count > 0:
+            self.state = "active"
+            self._misses = 0
+            return
+
+        self._misses += 1
+        if self.state == "active" and self._misses >= self.idle_after:
+            self.state = "idle"
+            # idleに入った時点の画像を差分の基準にし直す
+            self._reference = None
+
+    def _motion(self, frame: np.ndarray) -> bool:
+        """
+        前回の基準画像とのフレーム差分で動きを検知
+
+        縮小・グレースケール化のバッファは最初のフレームで確保して再利用します。
+
+        Args:
+            frame (np.ndarray): 入力画像フレーム（BGR）
+
+        Returns:
+            bool: 平均輝度差がmotion_thresholdを超えたらTrue
+        """
+        height, width = frame.shape[:2]
+        size = (self.motion_size, max(1, round(self.motion_size * height / width)))
+        if self._small is None or self._small.shape[1::-1] != size:
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+            self._reference = None
+
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        if self._reference is None:
+            self._reference = self._gray.copy()
+            return False
+
+        difference = cv2.norm(self._gray, self._reference, cv2.NORM_L1) / self._gray.size
+        # 照明のゆっくりした変化は基準画像の更新で吸収する
+        self._reference, self._gray = self._gray, self._reference
+        return difference > self.motion_threshold
+
+    def get_stats(self) -> dict:
+        """
+        ケイデンスの統計を返す
+
+        Returns:
+            dict: state, frames_skipped, wakeups
+        """
+        return {
+            "state": self.state,
+            "frames_skipped": self.frames_skipped,
+            "wakeups": self.wakeups,
+        }
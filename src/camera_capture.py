@@ -14,9 +14,16 @@ TODO for Agent1:
 
 import cv2
 import yaml
+import threading
+import time
 from typing import Optional, Tuple
 import numpy as np
 
+try:
+    from .frame_sources import create_frame_source
+except ImportError:
+    from frame_sources import create_frame_source
+
 
 class CameraCapture:
     """
@@ -25,6 +32,9 @@ class CameraCapture:
     Attributes:
         config (dict): カメラ設定
         cap (cv2.VideoCapture): OpenCVのVideoCaptureオブジェクト
+        threaded (bool): バックグラウンドスレッドでフレームを取得するか
+        buffer_size (int): スレッドモードで使うリングバッファのスロット数
+        reuse_buffers (bool): 非スレッドモードで同じフレームバッファに読み出すか
     """
 
     def __init__(self, config: dict):
@@ -37,14 +47,46 @@ class CameraCapture:
                 - width: フレーム幅
                 - height: フレーム高さ
                 - fps: フレームレート
+                - threaded: バックグラウンド取得モードを使うか (default: False)
+                - buffer_size: リングバッファのスロット数 (最小3)
+                - source: フレームソース ("camera", "video", "images", "synthetic")
+                - path: 動画ファイルまたは画像ディレクトリ（video / images）
+                - pacing: 払い出し速度 ("realtime", "fast", "fixed")
+                - loop: 終端で先頭に戻るか（video / images）
+                - num_frames: 生成フレーム数（synthetic、省略時は無限）
+                - reuse_buffers: 非スレッドモードでフレームバッファを再利用するか (default: False)
         """
         self.config = config
         self.device_id = config.get('device_id', 0)
         self.width = config.get('width', 1280)
         self.height = config.get('height', 720)
         self.fps = config.get('fps', 30)
+        self.source = config.get('source', 'camera')
         self.cap: Optional[cv2.VideoCapture] = None
 
+        # バックグラウンド取得モード（最新フレームのみを渡す）
+        self.threaded = config.get('threaded', False)
+        # 書き込み中・最新・読み出し中の3スロットが常に必要
+        self.buffer_size = max(3, config.get('buffer_size', 3))
+        self._ring: Optional[np.ndarray] = None
+        self._ring_seq = np.zeros(self.buffer_size, dtype=np.int64)
+        self._ring_ts = np.zeros(self.buffer_size, dtype=np.float64)
+        self._latest_slot = -1
+        self._reader_slot = -1
+        self._latest_seq = 0
+        self._delivered_seq = 0
+        self._frames_captured = 0
+        self._frames_delivered = 0
+        self._frames_dropped = 0
+        self._read_failures = 0
+        self._frame_ready = threading.Condition()
+        self._stop_event = threading.Event()
+        self._grabber: Optional[threading.Thread] = None
+
+        # 非スレッドモードのフレームバッファ（毎フレームの確保を避ける）
+        self.reuse_buffers = config.get('reuse_buffers', False)
+        self._frame_buffer: Optional[np.ndarray] = None
+
     def start(self) -> bool:
         """
         カメラキャプチャを開始
@@ -53,16 +95,24 @@ class CameraCapture:
             bool: 成功した場合True
         """
         try:
-            self.cap = cv2.VideoCapture(self.device_id)
+            if self.source == 'camera':
+                self.cap = cv2.VideoCapture(self.device_id)
 
-            if not self.cap.isOpened():
-                print(f"Error: Could not open camera with device_id {self.device_id}")
-                return False
+                if not self.cap.isOpened():
+                    print(f"Error: Could not open camera with device_id {self.device_id}")
+                    return False
 
-            # カメラ設定を適用
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+                # カメラ設定を適用
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+                self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+            else:
+                # 動画ファイル・画像ディレクトリ・合成映像（VideoCapture互換）
+                self.cap = create_frame_source(self.config)
+
+                if not self.cap.isOpened():
+                    print(f"Error: Could not open {self.source} source {self.config.get('path', '')}")
+                    return False
 
             # 設定が正しく適用されたか確認
             actual_width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
@@ -70,6 +120,10 @@ class CameraCapture:
             actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
 
             print(f"Camera started: {actual_width}x{actual_height} @ {actual_fps}fps")
+
+            if self.threaded:
+                self._start_grabber()
+
             return True
 
         except Exception as e:
@@ -82,28 +136,178 @@ class CameraCapture:
 
         Returns:
             Tuple[bool, Optional[np.ndarray]]: (成功フラグ, フレーム画像)
+
+        Note:
+            スレッドモードでは最新フレームをリングバッファのビューとして返します。
+            ビューは次にget_frame()を呼ぶまで上書きされません。
+            reuse_buffersでも同様に、次の呼び出しで同じバッファに上書きされます。
         """
         if self.cap is None or not self.cap.isOpened():
             print("Error: Camera is not opened. Call start() first.")
             return False, None
 
+        if self.threaded:
+            success, frame, _, _ = self.read_latest()
+            if not success:
+                print("Error: Failed to capture frame")
+            return success, frame
+
         try:
-            ret, frame = self.cap.read()
+            if self.reuse_buffers and self._frame_buffer is not None:
+                # 形状が同じなら前回のバッファに直接デコードされる
+                ret, frame = self.cap.read(self._frame_buffer)
+            else:
+                ret, frame = self.cap.read()
 
             if not ret:
                 print("Error: Failed to capture frame")
                 return False, None
 
+            if self.reuse_buffers:
+                self._frame_buffer = frame
             return True, frame
 
         except Exception as e:
             print(f"Error capturing frame: {e}")
             return False, None
 
+    def read_latest(
+        self, timeout: float = 1.0
+    ) -> Tuple[bool, Optional[np.ndarray], int, float]:
+        """
+        スレッドモードで最新フレームを取得
+
+        前回渡したフレームより新しいフレームが届くまで最大timeout秒待ちます。
+        読まれずに上書きされたフレームはドロップとしてカウントされます。
+
+        Args:
+            timeout (float): 新しいフレームを待つ最大秒数
+
+        Returns:
+            Tuple[bool, Optional[np.ndarray], int, float]:
+                (成功フラグ, フレーム画像, シーケンス番号, 取得時刻(UNIX秒))
+        """
+        with self._frame_ready:
+            ready = self._frame_ready.wait_for(
+                lambda: self._latest_seq > self._delivered_seq
+                or self._grabber is None,
+                timeout=timeout
+            )
+            if not ready or self._latest_seq <= self._delivered_seq:
+                return False, None, -1, 0.0
+
+            slot = self._latest_slot
+            # 読み出し中のスロットはグラバーが上書きしない
+            self._reader_slot = slot
+            self._delivered_seq = self._latest_seq
+            self._frames_delivered += 1
+            return True, self._ring[slot], int(self._ring_seq[slot]), float(self._ring_ts[slot])
+
+    def get_stats(self) -> dict:
+        """
+        スレッドモードの取得統計を返す
+
+        Returns:
+            dict: captured / delivered / dropped / read_failures の各カウント
+        """
+        with self._frame_ready:
+            return {
+                "captured": self._frames_captured,
+                "delivered": self._frames_delivered,
+                "dropped": self._frames_dropped,
+                "read_failures": self._read_failures,
+            }
+
+    def _start_grabber(self):
+        """
+        バックグラウンド取得スレッドを起動
+        """
+        self._stop_event.clear()
+        self._grabber = threading.Thread(
+            target=self._grab_loop, name="camera-grabber", daemon=True
+        )
+        self._grabber.start()
+
+    def _stop_grabber(self):
+        """
+        バックグラウンド取得スレッドを停止して待機中の読み出しを解放
+        """
+        if self._grabber is None:
+            return
+        self._stop_event.set()
+        self._grabber.join(timeout=2.0)
+        with self._frame_ready:
+            self._grabber = None
+            self._frame_ready.notify_all()
+
+    def _next_write_slot(self) -> int:
+        """
+        次に書き込むスロットを選択（最新スロットと読み出し中スロットは避ける）
+
+        Returns:
+            int: スロット番号
+        """
+        with self._frame_ready:
+            slot = (self._latest_slot + 1) % self.buffer_size
+            while slot == self._latest_slot or slot == self._reader_slot:
+                slot = (slot + 1) % self.buffer_size
+            return slot
+
+    def _grab_loop(self):
+        """
+        カメラから連続してフレームを読み出し、リングバッファに書き込む
+        """
+        while not self._stop_event.is_set():
+            slot = self._next_write_slot()
+            try:
+                if self._ring is not None:
+                    # 事前確保したバッファに直接デコードさせる
+                    ret, frame = self.cap.read(self._ring[slot])
+                else:
+                    ret, frame = self.cap.read()
+            except Exception as e:
+                print(f"Error capturing frame: {e}")
+                ret, frame = False, None
+
+            if not ret or frame is None:
+                with self._frame_ready:
+                    self._read_failures += 1
+                # デバイスエラー時にCPUを占有しないよう少し待つ
+                self._stop_event.wait(0.01)
+                continue
+
+            captured_at = time.time()
+
+            if self._ring is None or self._ring.shape[1:] != frame.shape:
+                # 初回（または解像度変更時）にリングを確保
+                with self._frame_ready:
+                    self._ring = np.empty(
+                        (self.buffer_size,) + frame.shape, dtype=frame.dtype
+                    )
+                    self._latest_slot = -1
+                    self._reader_slot = -1
+                slot = self._next_write_slot()
+
+            if not np.may_share_memory(frame, self._ring[slot]):
+                np.copyto(self._ring[slot], frame)
+
+            with self._frame_ready:
+                if self._latest_seq > self._delivered_seq:
+                    # 前の最新フレームは読まれずに上書きされた
+                    self._frames_dropped += 1
+                self._latest_seq += 1
+                self._frames_captured += 1
+                self._ring_seq[slot] = self._latest_seq
+                self._ring_ts[slot] = captured_at
+                self._latest_slot = slot
+                self._frame_ready.notify_all()
+
     def stop(self):
         """
         カメラを停止してリソースを解放
         """
+        self._stop_grabber()
+
         if self.cap is not None:
             self.cap.release()
             self.cap = None
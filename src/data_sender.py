@@ -13,11 +13,208 @@ TODO for Agent4:
 """
 
 import requests
-import json
-from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Union
 import time
 from datetime import datetime
 
+try:
+    from .serializers import get_serializer
+    from .delta import DeltaEncoder
+    from .spool import DiskSpool
+except ImportError:
+    from serializers import get_serializer
+    from delta import DeltaEncoder
+    from spool import DiskSpool
+
+
+class WebSocketTransport:
+    """
+    永続WebSocket接続による送信トランスポート
+
+    バックグラウンドスレッドが接続を保持し、切断時は指数バックオフで
+    再接続します。切断中に送られたメッセージはバッファに溜め、
+    再接続後に順番通り送信します。
+
+    Attributes:
+        url (str): WebSocket URL
+        buffer_size (int): 切断中に保持する最大メッセージ数
+        connected (bool): 接続状態
+    """
+
+    def __init__(self, url: str, buffer_size: int = 1000,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 10.0,
+                 open_timeout: float = 5.0):
+        """
+        トランスポートの初期化
+
+        Args:
+            url (str): WebSocket URL
+            buffer_size (int): 送信待ちバッファの上限（超えると古いものから捨てる）
+            reconnect_delay (float): 再接続バックオフの初期値（秒）
+            max_reconnect_delay (float): 再接続バックオフの上限（秒）
+            open_timeout (float): 接続確立のタイムアウト（秒）
+        """
+        self.url = url
+        self.buffer_size = max(1, buffer_size)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.open_timeout = open_timeout
+        self.connected = False
+        self.stats = {
+            "sent": 0,
+            "dropped": 0,
+            "connects": 0,
+            "disconnects": 0,
+        }
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+
+    def start(self):
+        """
+        接続スレッドを起動
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="websocket-transport", daemon=True
+        )
+        self._thread.start()
+
+    def wait_connected(self, timeout: float) -> bool:
+        """
+        接続が確立するまで待つ
+
+        Args:
+            timeout (float): 最大待機秒数
+
+        Returns:
+            bool: 接続済みならTrue
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self.connected, timeout=timeout)
+
+    def send(self, message: Union[str, bytes]) -> bool:
+        """
+        メッセージを送信バッファに積む
+
+        Args:
+            message (Union[str, bytes]): 送信するメッセージ（strはテキスト、bytesはバイナリ）
+
+        Returns:
+            bool: 常にTrue（送信は接続スレッドが行う）
+        """
+        with self._cond:
+            if len(self._buffer) >= self.buffer_size:
+                self._buffer.popleft()
+                self.stats["dropped"] += 1
+            self._buffer.append(message)
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        バッファが空になるまで待つ
+
+        Args:
+            timeout (float): 最大待機秒数
+
+        Returns:
+            bool: 期限内にバッファが空になった場合True
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._buffer, timeout=timeout)
+
+    def pending(self) -> int:
+        """
+        送信待ちのメッセージ数を返す
+
+        Returns:
+            int: バッファ内のメッセージ数
+        """
+        with self._cond:
+            return len(self._buffer)
+
+    def close(self, timeout: float = 2.0):
+        """
+        接続スレッドを停止して接続を閉じる
+
+        Args:
+            timeout (float): スレッド終了の待機秒数
+        """
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self):
+        """
+        接続・送信・再接続を繰り返す接続スレッド本体
+        """
+        # websocketsはWEBSOCKETモードでのみ必要なため遅延インポート
+        from websockets.sync.client import connect as ws_connect
+
+        delay = self.reconnect_delay
+        while not self._stop_event.is_set():
+            try:
+                self._ws = ws_connect(self.url, open_timeout=self.open_timeout)
+            except Exception as e:
+                print(f"WebSocket connection failed: {e} (retry in {delay:.1f}s)")
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+
+            delay = self.reconnect_delay
+            with self._cond:
+                self.connected = True
+                self.stats["connects"] += 1
+                self._cond.notify_all()
+
+            try:
+                self._pump()
+            except Exception as e:
+                print(f"WebSocket connection lost: {e}")
+            finally:
+                try:
+                    self._ws.close()
+                except Exception:
+                    pass
+                self._ws = None
+                with self._cond:
+                    self.connected = False
+                    self.stats["disconnects"] += 1
+                    self._cond.notify_all()
+
+    def _pump(self):
+        """
+        接続中にバッファのメッセージを順番に送信する
+
+        送信に失敗したメッセージはバッファに残したまま例外を送出します。
+        """
+        while not self._stop_event.is_set():
+            with self._cond:
+                if not self._buffer:
+                    self._cond.wait(timeout=0.1)
+                    continue
+                message = self._buffer[0]
+
+            self._ws.send(message)
+
+            with self._cond:
+                # 送信済みのメッセージだけを取り除く
+                if self._buffer and self._buffer[0] is message:
+                    self._buffer.popleft()
+                self.stats["sent"] += 1
+                self._cond.notify_all()
+
 
 class DataSender:
     """
@@ -29,6 +226,7 @@ class DataSender:
         method (str): 送信方法 ("POST" or "WEBSOCKET")
         retry_attempts (int): リトライ回数
         connected (bool): 接続状態
+        async_send (bool): 非同期バッチ送信モード
     """
 
     def __init__(self, config: dict):
@@ -42,6 +240,29 @@ class DataSender:
                 - websocket_url: WebSocket URL
                 - retry_attempts: リトライ回数
                 - retry_delay: リトライ間隔（秒）
+                - async_send: 非同期バッチ送信モードを使うか (default: False)
+                - queue_size: 非同期モードの送信キュー上限
+                - batch_size: 1リクエストにまとめる最大フレーム数
+                - batch_max_age: バッチ内の最古フレームを待たせる最大秒数
+                - ws_buffer_size: WebSocket切断中に保持する最大フレーム数
+                - ws_reconnect_delay: WebSocket再接続バックオフの初期値（秒）
+                - ws_max_reconnect_delay: WebSocket再接続バックオフの上限（秒）
+                - pool_connections: キャッシュするホスト別コネクションプール数
+                - pool_maxsize: ホストごとに保持する最大コネクション数
+                - pool_block: プールが埋まったとき空きを待つか
+                - serializer: ペイロード形式 ("json" or "binary")
+                - serializer_options: シリアライザのオプション（binaryのschema_intervalなど）
+                - delta_encoding: キーフレーム / 差分メッセージで送るか（JSONのみ、default: False）
+                - keyframe_interval: キーフレームの間隔（フレーム数）
+                - delta_epsilon: 差分で送る関節距離の変化しきい値
+                - delta_landmark_epsilon: ランドマークを送り直す座標の変化しきい値
+                - spool_dir: 送信できなかったデータを保存するディレクトリ（未指定なら無効、POSTのみ）
+                - spool_segment_size: スプールの1セグメントのサイズ（バイト）
+                - spool_max_bytes: スプール全体の上限サイズ（超えたら古い順に削除）
+                - spool_max_delay: スプール再送のバックオフ上限（秒）
+
+        Raises:
+            ValueError: 差分エンコードとバイナリ形式を同時に指定した場合
         """
         self.endpoint = config.get("endpoint", "http://localhost:8000/api/hand-data")
         self.method = config.get("method", "POST")
@@ -51,6 +272,125 @@ class DataSender:
         self.connected = False
         self.timeout = 5
 
+        # 非同期バッチ送信（送信・リトライをキャプチャループから切り離す）
+        self.async_send = config.get("async_send", False)
+        self.queue_size = max(1, config.get("queue_size", 256))
+        self.batch_size = max(1, config.get("batch_size", 10))
+        self.batch_max_age = config.get("batch_max_age", 0.1)
+        self._queue = deque()
+        self._queue_cond = threading.Condition()
+        self._inflight = 0
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "sent_batches": 0,
+            "sent_frames": 0,
+            "failed_frames": 0,
+            "send_failures": 0,
+            "retries": 0,
+            "spooled": 0,
+            "replayed": 0,
+        }
+
+        # ペイロードのシリアライザ（デフォルトはJSON）
+        serializer_name = config.get("serializer", "json")
+        serializer_options = dict(config.get("serializer_options") or {})
+        if serializer_name == "binary" and self.method != "WEBSOCKET":
+            # HTTPのリクエストは失敗・破棄されうるので、リクエストごとにスキーマを含める
+            serializer_options.setdefault("self_contained", True)
+        self.serializer = get_serializer(serializer_name, **serializer_options)
+
+        # 差分エンコード（静止中の帯域を減らす）
+        self.delta: Optional[DeltaEncoder] = None
+        if config.get("delta_encoding", False):
+            if self.serializer.binary:
+                raise ValueError("delta_encoding is only supported with the json serializer")
+            self.delta = DeltaEncoder(
+                keyframe_interval=config.get("keyframe_interval", 30),
+                epsilon=config.get("delta_epsilon", 0.05),
+                landmark_epsilon=config.get("delta_landmark_epsilon", 0.002)
+            )
+        self._transport_connects = 0
+
+        # keep-aliveのコネクションプールを持つセッション（フレームごとのTCP接続を避ける）
+        self.pool_connections = config.get("pool_connections", 4)
+        self.pool_maxsize = config.get("pool_maxsize", 4)
+        self.pool_block = config.get("pool_block", False)
+        self.session = self._create_session()
+
+        # 送信できなかったデータをディスクに保存し、バックグラウンドで順に再送する
+        self.spool: Optional[DiskSpool] = None
+        self.spool_max_delay = config.get("spool_max_delay", 10.0)
+        self._drainer: Optional[threading.Thread] = None
+        self._drain_event = threading.Event()
+        self._drain_stop = threading.Event()
+        if config.get("spool_dir") and self.method != "WEBSOCKET":
+            self.spool = DiskSpool(
+                config["spool_dir"],
+                segment_size=config.get("spool_segment_size", 4 * 1024 * 1024),
+                max_bytes=config.get("spool_max_bytes", 64 * 1024 * 1024)
+            )
+            if len(self.spool) > 0:
+                # 前回の実行で送れなかった分
+                self._ensure_drainer()
+
+        # WEBSOCKETモードでは永続接続のトランスポートを使う
+        self.transport: Optional[WebSocketTransport] = None
+        if self.method == "WEBSOCKET":
+            self.transport = WebSocketTransport(
+                self.websocket_url,
+                buffer_size=config.get("ws_buffer_size", 1000),
+                reconnect_delay=config.get("ws_reconnect_delay", 0.5),
+                max_reconnect_delay=config.get("ws_max_reconnect_delay", 10.0),
+                open_timeout=self.timeout
+            )
+
+    def _create_session(self) -> requests.Session:
+        """
+        コネクションプール設定済みのセッションを作成
+
+        Returns:
+            requests.Session: HTTP/HTTPS用アダプタをマウントしたセッション
+        """
+        session = requests.Session()
+        # リトライはDataSender側で制御するためアダプタでは行わない
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0,
+            pool_block=self.pool_block
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_connection_stats(self) -> Dict:
+        """
+        コネクションプールの利用統計を返す
+
+        Returns:
+            Dict: requests（総リクエスト数）, opened（新規接続数）, reused（再利用数）
+        """
+        opened = 0
+        total = 0
+        for adapter in set(self.session.adapters.values()):
+            pool_manager = getattr(adapter, "poolmanager", None)
+            if pool_manager is None:
+                continue
+            for key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                total += pool.num_requests
+        return {
+            "requests": total,
+            "opened": opened,
+            "reused": max(0, total - opened),
+        }
+
     def connect(self) -> bool:
         """
         WEBアプリケーションへの接続を確立
@@ -58,10 +398,16 @@ class DataSender:
         Returns:
             bool: 接続成功でTrue
         """
+        if self.transport is not None:
+            # 接続できなくてもスレッドが再接続を続け、その間はバッファに溜める
+            self.transport.start()
+            self.connected = self.transport.wait_connected(self.timeout)
+            return self.connected
+
         try:
             # エンドポイントにhealth checkを送信
             health_endpoint = self.endpoint.replace("/hand-data", "/health")
-            response = requests.get(health_endpoint, timeout=self.timeout)
+            response = self.session.get(health_endpoint, timeout=self.timeout)
             self.connected = response.status_code == 200
             return self.connected
         except Exception as e:
@@ -84,10 +430,156 @@ class DataSender:
                 }
 
         Returns:
-            bool: 送信成功でTrue
+            bool: 送信成功でTrue（非同期モードではキューに積めた時点でTrue）
         """
+        if self.transport is not None and self.transport.stats["connects"] != self._transport_connects:
+            # 再接続した受信側は差分の基準もスキーマも持っていない
+            self._transport_connects = self.transport.stats["connects"]
+            if self.delta is not None:
+                self.delta.force_keyframe()
+            if self.serializer.binary:
+                self.serializer.reset()
+        if self.delta is not None:
+            data = self.delta.encode(data)
+
+        if self.transport is not None:
+            self.transport.start()
+            if self.serializer.binary:
+                return self.transport.send(self.serializer.encode(data))
+            return self.transport.send(self.serializer.encode(data).decode("utf-8"))
+        if self.async_send:
+            return self._enqueue(data)
         return self._send_with_retry(data)
 
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        非同期モードで、キュー内のデータが全て送信処理されるまで待つ
+
+        Args:
+            timeout (float): 最大待機秒数
+
+        Returns:
+            bool: 期限内にキューが空になった場合True
+        """
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+            return self._queue_cond.wait_for(
+                lambda: not self._queue and self._inflight == 0,
+                timeout=timeout
+            )
+
+    def get_stats(self) -> Dict:
+        """
+        送信統計を返す
+
+        Returns:
+            Dict: enqueued, dropped, sent_batches, sent_frames, failed_frames,
+                send_failures（リトライ後も失敗したリクエスト数）, retries, queue_depth,
+                spooled, replayed, spool_depth, spool_evicted
+        """
+        with self._queue_cond:
+            stats = dict(self.stats)
+            stats["queue_depth"] = len(self._queue)
+        stats["spool_depth"] = len(self.spool) if self.spool is not None else 0
+        stats["spool_evicted"] = self.spool.stats["evicted"] if self.spool is not None else 0
+        return stats
+
+    def _enqueue(self, data: Dict) -> bool:
+        """
+        送信キューにデータを積む（満杯時は最も古いデータを捨てる）
+
+        Args:
+            data (Dict): 送信データ
+
+        Returns:
+            bool: 常にTrue
+        """
+        self._ensure_worker()
+        with self._queue_cond:
+            if len(self._queue) >= self.queue_size:
+                self._queue.popleft()
+                self.stats["dropped"] += 1
+            self._queue.append((time.monotonic(), data))
+            self.stats["enqueued"] += 1
+            if len(self._queue) >= self.batch_size:
+                self._queue_cond.notify_all()
+        return True
+
+    def _ensure_worker(self):
+        """
+        送信ワーカースレッドが動いていなければ起動
+        """
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(
+            target=self._worker_loop, name="data-sender", daemon=True
+        )
+        self._worker.start()
+
+    def _next_batch(self) -> Optional[List[Dict]]:
+        """
+        次に送るバッチを取り出す
+
+        batch_size分溜まるか、最古のデータがbatch_max_ageを超えるまで待ちます。
+
+        Returns:
+            Optional[List[Dict]]: バッチ、停止時でキューが空ならNone
+        """
+        with self._queue_cond:
+            while True:
+                if self._queue:
+                    age = time.monotonic() - self._queue[0][0]
+                    if (len(self._queue) >= self.batch_size
+                            or age >= self.batch_max_age
+                            or self._stop_event.is_set()):
+                        break
+                    self._queue_cond.wait(timeout=self.batch_max_age - age)
+                elif self._stop_event.is_set():
+                    return None
+                else:
+                    self._queue_cond.wait(timeout=0.1)
+
+            count = min(self.batch_size, len(self._queue))
+            batch = [self._queue.popleft()[1] for _ in range(count)]
+            self._inflight = count
+            return batch
+
+    def _worker_loop(self):
+        """
+        キューからバッチを取り出して送信し続ける
+        """
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+
+            success = self._send_with_retry({"frames": batch})
+
+            with self._queue_cond:
+                if success:
+                    self.stats["sent_batches"] += 1
+                    self.stats["sent_frames"] += len(batch)
+                else:
+                    self.stats["failed_frames"] += len(batch)
+                self._inflight = 0
+                self._queue_cond.notify_all()
+
+    def _stop_worker(self, timeout: float = 5.0):
+        """
+        残りのキューを送信してからワーカースレッドを停止
+
+        Args:
+            timeout (float): 最大待機秒数
+        """
+        if self._worker is None:
+            return
+        self._stop_event.set()
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+        self._worker.join(timeout=timeout)
+        self._worker = None
+
     def _send_with_retry(self, data: Dict) -> bool:
         """
         リトライ機能付きでデータを送信
@@ -95,35 +587,147 @@ class DataSender:
         Args:
             data (Dict): 送信データ
 
+        スプールが有効な場合は1回だけ送信し、失敗したらスプールに保存して
+        バックグラウンドで再送します（スプールに未送信分があれば順序を保つため直接保存します）。
+
+        Returns:
+            bool: 送信成功でTrue（スプールに保存できた場合もTrue）
+        """
+        body = self.prepare_body(data)
+        if self.spool is None:
+            return self.post_body(body)
+        if len(self.spool) == 0 and self.post_body(body, attempts=1):
+            return True
+        self._spool_body(body)
+        return True
+
+    def prepare_body(self, data: Dict) -> Dict:
+        """
+        ペイロードをHTTPリクエストのボディ引数に変換
+
+        リトライで再エンコードしないよう、送信前に1回だけ呼びます。
+        JSONもここでバイト列にするため、送られるのはこの出力そのものです。
+
+        Args:
+            data (Dict): 送信データ
+
+        Returns:
+            Dict: session.postに渡すキーワード引数（{"data": bytes}）
+        """
+        return {"data": self.serializer.encode(data)}
+
+    def post_body(self, body: Dict, attempts: Optional[int] = None) -> bool:
+        """
+        prepare_body()で作ったボディをリトライ付きでPOST
+
+        Args:
+            body (Dict): prepare_body()の出力
+            attempts (Optional[int]): 試行回数（省略時はretry_attempts）
+
         Returns:
             bool: 送信成功でTrue
         """
-        for attempt in range(self.retry_attempts):
+        attempts = self.retry_attempts if attempts is None else attempts
+        for attempt in range(attempts):
             try:
-                response = requests.post(
+                response = self.session.post(
                     self.endpoint,
-                    json=data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=self.timeout
+                    headers={"Content-Type": self.serializer.content_type},
+                    timeout=self.timeout,
+                    **body
                 )
 
                 if response.status_code == 200:
                     return True
                 else:
-                    print(f"Send failed with status {response.status_code} (attempt {attempt+1}/{self.retry_attempts})")
+                    print(f"Send failed with status {response.status_code} (attempt {attempt+1}/{attempts})")
 
             except Exception as e:
-                print(f"Send failed (attempt {attempt+1}/{self.retry_attempts}): {e}")
+                print(f"Send failed (attempt {attempt+1}/{attempts}): {e}")
 
-            if attempt < self.retry_attempts - 1:
+            if attempt < attempts - 1:
+                with self._queue_cond:
+                    self.stats["retries"] += 1
                 time.sleep(self.retry_delay)
 
+        with self._queue_cond:
+            self.stats["send_failures"] += 1
         return False
 
+    def _spool_body(self, body: Dict):
+        """
+        ボディをスプールに保存し、再送スレッドを起こす
+
+        Args:
+            body (Dict): prepare_body()の出力
+        """
+        self.spool.append(body["data"])
+        with self._queue_cond:
+            self.stats["spooled"] += 1
+        self._ensure_drainer()
+        self._drain_event.set()
+
+    def _ensure_drainer(self):
+        """
+        スプールの再送スレッドが動いていなければ起動
+        """
+        if self._drainer is not None and self._drainer.is_alive():
+            return
+        self._drain_stop.clear()
+        self._drainer = threading.Thread(
+            target=self._drain_loop, name="data-sender-spool", daemon=True
+        )
+        self._drainer.start()
+
+    def _drain_loop(self):
+        """
+        スプールの先頭から順に再送する（失敗したらバックオフして同じデータを再送）
+        """
+        delay = self.retry_delay
+        while not self._drain_stop.is_set():
+            payload = self.spool.peek()
+            if payload is None:
+                self._drain_event.wait(timeout=0.5)
+                self._drain_event.clear()
+                continue
+
+            if self.post_body({"data": payload}, attempts=1):
+                self.spool.ack()
+                with self._queue_cond:
+                    self.stats["replayed"] += 1
+                delay = self.retry_delay
+            else:
+                self._drain_stop.wait(delay)
+                delay = min(delay * 2, self.spool_max_delay)
+
+    def _stop_drainer(self, timeout: float = 2.0):
+        """
+        再送スレッドを停止（未送信のデータはディスクに残り、次回起動時に再送する）
+
+        Args:
+            timeout (float): 最大待機秒数
+        """
+        if self._drainer is None:
+            return
+        self._drain_stop.set()
+        self._drain_event.set()
+        self._drainer.join(timeout=timeout)
+        self._drainer = None
+
     def disconnect(self):
         """
         接続を終了
+
+        非同期モードでは残りのキューを送信してから終了します。
         """
+        self._stop_worker()
+        self._stop_drainer()
+        if self.spool is not None:
+            self.spool.close()
+        if self.transport is not None:
+            self.transport.flush(timeout=self.timeout if self.transport.connected else 0)
+            self.transport.close()
+        self.session.close()
         self.connected = False
         print("Disconnected from server")
 
@@ -134,6 +738,8 @@ class DataSender:
         Returns:
             bool: 接続中の場合True
         """
+        if self.transport is not None:
+            return self.transport.connected
         return self.connected
 
 
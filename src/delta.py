@@ -0,0 +1,251 @@
+"""
+Delta Encoding Module
+送信ストリームのキーフレーム / 差分エンコーダと、検証用のリファレンスデコーダ
+
+一定間隔（keyframe_interval）でフレーム全体をキーフレームとして送り、
+その間は前回受信側に送った値から epsilon を超えて変化した関節だけを送ります。
+手はhand_idで対応付けるため、フレームをまたいで安定したIDが前提です。
+
+メッセージには連番（seq）が付き、受信側は抜けを検出したら次のキーフレームまで
+差分を適用せずに待ちます。カメラごとに独立したストリーム（状態と連番）を持ちます。
+
+キーフレーム:
+    {"seq": n, "type": "key", "timestamp", "frame_number", ["camera_id"],
+     "hand_data": {"hand_count", "measurements": [送信ペイロードと同じ手のリスト]}}
+差分:
+    {"seq": n, "type": "delta", "timestamp", "frame_number", ["camera_id"], "hand_count",
+     "hands": [{"hand_id", "joints": {関節名: 距離}, ["label"], ["predicted"], ["landmarks"]}],
+     "removed": [hand_id, ...]}
+"""
+
+import copy
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class _StreamState:
+    """
+    1ストリーム（カメラ）分の状態
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self.frames_since_key = 0
+        # hand_id → 受信側が持っているはずの手の状態
+        self.hands: Dict[int, Dict] = {}
+
+
+class DeltaEncoder:
+    """
+    送信ペイロードをキーフレーム / 差分メッセージに変換するエンコーダ
+
+    Attributes:
+        keyframe_interval (int): キーフレームを送る間隔（フレーム数）
+        epsilon (float): 関節距離の変化をしきい値（これ以下の変化は送らない）
+        landmark_epsilon (float): ランドマークを送り直す座標の変化しきい値
+    """
+
+    def __init__(self, keyframe_interval: int = 30, epsilon: float = 0.05,
+                 landmark_epsilon: float = 0.002):
+        """
+        エンコーダの初期化
+
+        Args:
+            keyframe_interval (int): キーフレームの間隔（1なら全フレームがキーフレーム）
+            epsilon (float): 関節距離の変化しきい値（距離の単位）
+            landmark_epsilon (float): ランドマーク座標の変化しきい値（正規化座標）
+        """
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.epsilon = epsilon
+        self.landmark_epsilon = landmark_epsilon
+        self._streams: Dict = {}
+
+    def encode(self, data: Dict) -> Dict:
+        """
+        1フレームのペイロードをストリームメッセージに変換
+
+        Args:
+            data (Dict): 送信ペイロード（measure_jointsのdata）
+
+        Returns:
+            Dict: キーフレームまたは差分メッセージ
+        """
+        stream = self._streams.setdefault(data.get("camera_id"), _StreamState())
+        stream.seq += 1
+
+        message = {
+            "seq": stream.seq,
+            "timestamp": data.get("timestamp"),
+            "frame_number": data.get("frame_number"),
+        }
+        if "camera_id" in data:
+            message["camera_id"] = data["camera_id"]
+
+        hands = data["hand_data"]["measurements"]
+        if stream.frames_since_key == 0 or stream.frames_since_key >= self.keyframe_interval:
+            stream.frames_since_key = 1
+            stream.hands = {hand["hand_id"]: self._snapshot(hand) for hand in hands}
+            message["type"] = "key"
+            message["hand_data"] = data["hand_data"]
+            return message
+
+        stream.frames_since_key += 1
+        message["type"] = "delta"
+        message["hand_count"] = data["hand_data"]["hand_count"]
+        message["hands"] = [self._diff_hand(stream, hand) for hand in hands]
+        present = {hand["hand_id"] for hand in hands}
+        message["removed"] = [hand_id for hand_id in stream.hands if hand_id not in present]
+        for hand_id in message["removed"]:
+            del stream.hands[hand_id]
+        return message
+
+    def force_keyframe(self):
+        """
+        全ストリームの次のフレームをキーフレームにする（受信側の状態が失われたときなど）
+        """
+        for stream in self._streams.values():
+            stream.frames_since_key = 0
+
+    def _diff_hand(self, stream: _StreamState, hand: Dict) -> Dict:
+        """
+        1つの手の差分を作り、受信側の状態を更新する
+        """
+        hand_id = hand["hand_id"]
+        reference = stream.hands.get(hand_id)
+        if reference is None:
+            # 新しい手は全体を送る
+            stream.hands[hand_id] = self._snapshot(hand)
+            entry = {key: value for key, value in hand.items()}
+            entry["joints"] = {name: joint["distance"] for name, joint in hand["joints"].items()}
+            entry["units"] = {name: joint["unit"] for name, joint in hand["joints"].items()}
+            return entry
+
+        entry = {"hand_id": hand_id, "joints": {}}
+        for name, joint in hand["joints"].items():
+            distance = joint["distance"]
+            previous = reference["joints"].get(name)
+            if previous is None or abs(distance - previous["distance"]) > self.epsilon:
+                entry["joints"][name] = distance
+                reference["joints"][name] = dict(joint)
+
+        if hand["label"] != reference["label"]:
+            entry["label"] = reference["label"] = hand["label"]
+        predicted = bool(hand.get("predicted", False))
+        if predicted != reference["predicted"]:
+            entry["predicted"] = reference["predicted"] = predicted
+
+        landmarks = hand.get("landmarks")
+        if landmarks is not None:
+            points = np.asarray(landmarks, dtype=np.float32)
+            if (reference["landmarks"] is None
+                    or np.abs(points - reference["landmarks"]).max() > self.landmark_epsilon):
+                entry["landmarks"] = landmarks
+                reference["landmarks"] = points.copy()
+        return entry
+
+    @staticmethod
+    def _snapshot(hand: Dict) -> Dict:
+        landmarks = hand.get("landmarks")
+        return {
+            "label": hand["label"],
+            "predicted": bool(hand.get("predicted", False)),
+            "joints": {name: dict(joint) for name, joint in hand["joints"].items()},
+            "landmarks": None if landmarks is None else np.array(landmarks, dtype=np.float32),
+        }
+
+
+class DeltaDecoder:
+    """
+    キーフレーム / 差分メッセージから元のペイロードを復元するリファレンスデコーダ
+
+    Attributes:
+        gaps (int): 検出した連番の抜けの数
+        skipped (int): 抜けのあと同期できずに捨てた差分メッセージの数
+    """
+
+    def __init__(self):
+        self.gaps = 0
+        self.skipped = 0
+        self._streams: Dict = {}
+
+    def decode(self, message: Dict) -> Optional[Dict]:
+        """
+        1メッセージを復元
+
+        Args:
+            message (Dict): DeltaEncoder.encode()の出力
+
+        Returns:
+            Optional[Dict]: 復元したペイロード、同期していない差分の場合None
+        """
+        key = message.get("camera_id")
+        stream = self._streams.get(key)
+        expected = None if stream is None else stream["seq"] + 1
+        if expected is not None and message["seq"] != expected:
+            self.gaps += 1
+            stream["synced"] = False
+
+        if message["type"] == "key":
+            stream = {
+                "seq": message["seq"],
+                "synced": True,
+                "hands": {hand["hand_id"]: copy.deepcopy(hand)
+                          for hand in message["hand_data"]["measurements"]},
+            }
+            self._streams[key] = stream
+            return self._frame(message, message["hand_data"]["hand_count"],
+                               message["hand_data"]["measurements"])
+
+        if stream is None or not stream["synced"]:
+            if stream is not None:
+                stream["seq"] = message["seq"]
+            self.skipped += 1
+            return None
+        stream["seq"] = message["seq"]
+
+        hands = stream["hands"]
+        for hand_id in message["removed"]:
+            hands.pop(hand_id, None)
+
+        measurements = []
+        for entry in message["hands"]:
+            hand_id = entry["hand_id"]
+            if "units" in entry:
+                hand = {k: v for k, v in entry.items() if k not in ("joints", "units")}
+                hand["joints"] = {
+                    name: {"distance": distance, "unit": entry["units"][name]}
+                    for name, distance in entry["joints"].items()
+                }
+                hands[hand_id] = hand
+            else:
+                hand = hands[hand_id]
+                for name, distance in entry["joints"].items():
+                    unit = hand["joints"].get(name, {}).get("unit")
+                    hand["joints"][name] = {"distance": distance, "unit": unit}
+                if "label" in entry:
+                    hand["label"] = entry["label"]
+                if "predicted" in entry:
+                    if entry["predicted"]:
+                        hand["predicted"] = True
+                    else:
+                        hand.pop("predicted", None)
+                if "landmarks" in entry:
+                    hand["landmarks"] = entry["landmarks"]
+            measurements.append(copy.deepcopy(hand))
+
+        return self._frame(message, message["hand_count"], measurements)
+
+    @staticmethod
+    def _frame(message: Dict, hand_count: int, measurements: List[Dict]) -> Dict:
+        frame = {
+            "timestamp": message["timestamp"],
+            "frame_number": message["frame_number"],
+            "hand_data": {
+                "hand_count": hand_count,
+                "measurements": copy.deepcopy(measurements)
+            }
+        }
+        if "camera_id" in message:
+            frame["camera_id"] = message["camera_id"]
+        return frame
@@ -0,0 +1,288 @@
+"""
+Detector Pool Module
+1台のカメラのフレームを複数のワーカープロセスで並列に手検出するプール
+
+各ワーカープロセスが自分のHandDetector（MediaPipe Hands）を持ちます。
+フレームは共有メモリのFrameRingにコピーして渡し、キューにはリングの連番だけを
+流します（画像をpickleしない）。ワーカーは空いているものから順に
+フレームを受け取るため結果は順不同で返りますが、get_result()は連番の順に並べ直して返します。
+
+フレームは複数のワーカーに振り分けられるため、各ワーカーは既定で
+静止画モード（static_image_mode）で検出します。
+"""
+
+import multiprocessing as mp
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .frame_ring import FrameRing
+except ImportError:
+    from frame_ring import FrameRing
+
+
+def _detector_worker(index: int, detection_config: dict, task_queue, result_queue,
+                     warmup_frames: int = 0, warmup_size: Tuple[int, int] = (1280, 720)):
+    """
+    FrameRingのフレームを検出するワーカープロセス本体
+
+    Args:
+        index (int): ワーカー番号
+        detection_config (dict): HandDetectorの設定
+        task_queue: (seq, リング名, リングの連番) を受け取るキュー（Noneで終了）
+        result_queue: (seq, ワーカー番号, 検出結果, エラー, 検出の処理時間（秒）) を流すキュー
+        warmup_frames (int): 最初のフレームの前に行うダミーの検出の回数
+        warmup_size (Tuple[int, int]): ダミー画像の (幅, 高さ)
+    """
+    # 重いモジュールはワーカープロセス内でだけ読み込む
+    try:
+        from .hand_detector import HandDetector
+    except ImportError:
+        from hand_detector import HandDetector
+
+    detector = HandDetector(detection_config)
+    if warmup_frames > 0:
+        detector.warmup(warmup_size[0], warmup_size[1], warmup_frames)
+    ring = None
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            seq, name, ring_seq = task
+            try:
+                if ring is None or ring.name != name:
+                    if ring is not None:
+                        ring.close()
+                    ring = FrameRing.attach(name)
+                # プールは結果が返るまでスロットを再利用しないので、そのまま読める
+                frame = ring.view(ring_seq)
+                if frame is None:
+                    raise RuntimeError(f"frame {ring_seq} was overwritten")
+                start = time.perf_counter()
+                detection = detector.detect(frame)
+                detect_seconds = time.perf_counter() - start
+                del frame
+                result_queue.put((seq, index, detection, None, detect_seconds))
+            except Exception as e:
+                result_queue.put((seq, index, None, f"Detector worker {index} failed: {e}", None))
+    finally:
+        detector.hands.close()
+        if ring is not None:
+            ring.close()
+
+
+class DetectorPool:
+    """
+    フレームを複数の検出ワーカーに振り分け、結果を順番どおりに返すプール
+
+    使い方:
+        pool.start()
+        pool.submit(frame, meta)          # 空きスロットがなければ待つ
+        result = pool.get_result()        # (meta, detection, detect_seconds)（submitした順）
+
+    Attributes:
+        num_workers (int): ワーカープロセス数
+        num_slots (int): FrameRingのスロット数
+        stats (Dict): submitted, completed, errors
+    """
+
+    def __init__(self, detection_config: dict, config: Optional[dict] = None):
+        """
+        検出プールの初期化
+
+        Args:
+            detection_config (dict): 手検出設定（各ワーカーのHandDetectorに渡す）
+            config (Optional[dict]): プールの設定
+                - workers: ワーカープロセス数 (default: 2)
+                - slots_per_worker: ワーカーあたりのフレームスロット数 (default: 2)
+                - image_mode: ワーカーを静止画モードで動かすか (default: True)
+                - start_method: プロセス起動方式 (default: "spawn")
+                - warmup_frames: 各ワーカーが最初のフレームの前に行うダミーの検出の回数 (default: 0)
+                - warmup_size: ダミー画像の (幅, 高さ) (default: (1280, 720))
+        """
+        config = config or {}
+        self.num_workers = max(1, config.get("workers", 2))
+        self.num_slots = self.num_workers * max(1, config.get("slots_per_worker", 2))
+        self.detection_config = dict(
+            detection_config, static_image_mode=config.get("image_mode", True)
+        )
+        self.warmup_frames = config.get("warmup_frames", 0)
+        self.warmup_size = tuple(config.get("warmup_size", (1280, 720)))
+        self._context = mp.get_context(config.get("start_method", "spawn"))
+
+        self._ring: Optional[FrameRing] = None
+
+        self._processes = []
+        self._task_queues = []
+        self._result_queue = None
+        self._cond = threading.Condition()
+        self._inflight: Dict[int, int] = {}                # seq → ワーカー番号
+        self._meta: Dict[int, Any] = {}
+        self._load = [0] * self.num_workers
+        self._ready: Dict[int, Tuple] = {}                 # 並べ直し待ちの (結果, 処理時間)
+        self._next_seq = 0
+        self._submitted = 0
+        self.stats = {"submitted": 0, "completed": 0, "errors": 0}
+
+    def start(self) -> bool:
+        """
+        ワーカープロセスを起動
+
+        Returns:
+            bool: 起動できた場合True
+        """
+        self._result_queue = self._context.Queue()
+        for index in range(self.num_workers):
+            task_queue = self._context.Queue()
+            process = self._context.Process(
+                target=_detector_worker,
+                args=(index, self.detection_config, task_queue, self._result_queue,
+                      self.warmup_frames, self.warmup_size),
+                name=f"detector-worker-{index}",
+                daemon=True
+            )
+            process.start()
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+        return True
+
+    def submit(self, frame: np.ndarray, meta: Any = None, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        フレームをFrameRingにコピーしてワーカーに渡す（1スレッドから呼ぶ）
+
+        Args:
+            frame (np.ndarray): 入力画像フレーム（コピーするので呼び出し後に再利用してよい）
+            meta (Any): get_result()で結果と一緒に返す任意の値
+            timeout (Optional[float]): 空きスロットを待つ最大秒数（Noneなら無制限）
+
+        Returns:
+            Optional[int]: フレームの連番、待ちきれなかった場合None
+
+        Raises:
+            ValueError: フレームの形状・dtypeが最初のフレームと異なる場合
+        """
+        if self._ring is None:
+            self._ring = FrameRing.create(frame.shape, frame.dtype, self.num_slots)
+        elif frame.shape != self._ring.shape or frame.dtype != self._ring.dtype:
+            raise ValueError(f"Frame shape {frame.shape} does not match pool frames {self._ring.shape}")
+
+        with self._cond:
+            # リングの次のスロットを使っていたフレームの結果が返るまで待つ
+            if not self._cond.wait_for(
+                lambda: self._submitted - self.num_slots not in self._inflight, timeout=timeout
+            ):
+                return None
+            # 処理中のフレームが最も少ない生きているワーカーに渡す
+            workers = [i for i, process in enumerate(self._processes) if process.is_alive()]
+            worker = min(workers or range(self.num_workers), key=self._load.__getitem__)
+            seq = self._submitted
+            self._submitted += 1
+            self._inflight[seq] = worker
+            self._meta[seq] = meta
+            self._load[worker] += 1
+            self.stats["submitted"] += 1
+
+        ring_seq = self._ring.write(frame)
+        self._task_queues[worker].put((seq, self._ring.name, ring_seq))
+        return seq
+
+    def get_result(self, timeout: float = 0.5) -> Optional[Tuple[Any, Optional[Dict], Optional[float]]]:
+        """
+        次の連番の結果を返す（submitした順）
+
+        検出に失敗したフレームや、終了したワーカーに渡したフレームは
+        detectionとdetect_secondsがNoneの結果として返ります。
+
+        Args:
+            timeout (float): 結果を待つ最大秒数
+
+        Returns:
+            Optional[Tuple[Any, Optional[Dict], Optional[float]]]:
+                (meta, 検出結果, ワーカーでの検出の処理時間（秒）)、時間内に届かなければNone
+        """
+        while True:
+            with self._cond:
+                if self._next_seq in self._ready:
+                    seq = self._next_seq
+                    self._next_seq += 1
+                    detection, detect_seconds = self._ready.pop(seq)
+                    return self._meta.pop(seq), detection, detect_seconds
+                if self._next_seq < self._submitted:
+                    self._reap_dead_workers()
+                    if self._next_seq in self._ready:
+                        continue
+
+            try:
+                seq, worker, detection, error, detect_seconds = self._result_queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if error is not None:
+                print(error)
+            self._complete(seq, detection, detect_seconds)
+
+    def pending(self) -> int:
+        """
+        ワーカーに渡して結果を返していないフレーム数
+
+        Returns:
+            int: フレーム数
+        """
+        with self._cond:
+            return self._submitted - self._next_seq
+
+    def stop(self, timeout: float = 2.0):
+        """
+        ワーカープロセスを停止して共有メモリを解放
+        """
+        for task_queue in self._task_queues:
+            try:
+                task_queue.put(None)
+            except Exception:
+                pass
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout=timeout)
+        self._processes = []
+        self._task_queues = []
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+    def _complete(self, seq: int, detection: Optional[Dict], detect_seconds: Optional[float]):
+        """
+        結果を並べ直し待ちに入れてリングのスロットを空ける
+        """
+        with self._cond:
+            if seq not in self._inflight:
+                return
+            worker = self._inflight.pop(seq)
+            self._load[worker] -= 1
+            self._ready[seq] = (detection, detect_seconds)
+            self.stats["completed"] += 1
+            if detection is None:
+                self.stats["errors"] += 1
+            self._cond.notify_all()
+
+    def _reap_dead_workers(self):
+        """
+        終了したワーカーに渡したフレームを失敗として扱う（_condを保持して呼ぶ）
+        """
+        for index, process in enumerate(self._processes):
+            if process.is_alive() or self._load[index] == 0:
+                continue
+            for seq, worker in list(self._inflight.items()):
+                if worker != index:
+                    continue
+                print(f"Detector worker {index} exited, dropping frame {seq}")
+                del self._inflight[seq]
+                self._load[worker] -= 1
+                self._ready[seq] = (None, None)
+                self.stats["errors"] += 1
+            self._cond.notify_all()
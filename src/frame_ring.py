@@ -0,0 +1,394 @@
+"""
+Frame Ring Module
+プロセス間でフレームを受け渡す共有メモリのリングバッファ
+
+multiprocessing.shared_memory上に固定数のスロットを確保し、書き込み側（1プロセス）が
+フレームを連番順にスロットへ1回だけコピーします。読み出し側（複数プロセス可）は
+スロットをnumpyのビューとしてそのまま読むため、pickleもキューへのコピーも発生しません。
+
+ロックは使いません。各スロットのヘッダに連番を2つ（書き込み開始時と完了時）持たせ、
+読み出し側は完了側の連番で書き込み済みか、開始側の連番で読んでいる間に
+上書きされていないかを確認します（seqlock）。読み出し側は共有メモリに何も書かないので、
+遅い読み出し側がいても書き込み側は待ちません（古いフレームは上書きされます）。
+8バイト境界の連番の書き込みが分割されず、書いた順に見えること（x86-64など）を前提にしています。
+
+メモリ配置:
+    ヘッダ (64バイト) | 最新の連番 (u64) | スロットヘッダ (begin, end) × スロット数 | スロット × スロット数
+
+使い方:
+    ring = FrameRing.create((720, 1280, 3), np.uint8, slots=8)   # 書き込み側
+    seq = ring.write(frame)
+
+    ring = FrameRing.attach(name)                                # 読み出し側
+    seq = ring.wait(last_seq, timeout=1.0)
+    frame = ring.read(seq)
+
+マイクロベンチマーク（キュー経由のpickle転送との比較）:
+    python src/frame_ring.py --frames 300 --width 1280 --height 720
+"""
+
+import multiprocessing as mp
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+MAGIC = b"HTFR"
+HEADER = struct.Struct("<4sIQI8s4I")   # magic, スロット数, スロットのバイト数, 次元数, dtype, 形状
+HEADER_SIZE = 64
+ALIGNMENT = 64
+MAX_DIMS = 4
+
+
+def _align(size: int) -> int:
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class FrameRing:
+    """
+    固定長スロットのリングバッファ（単一の書き込み側、複数の読み出し側）
+
+    連番は1から始まり、連番seqのフレームはスロット (seq - 1) % slots に入ります。
+
+    Attributes:
+        name (str): 共有メモリの名前（attach()に渡す）
+        shape (Tuple[int, ...]): フレームの形状
+        dtype (np.dtype): フレームのdtype
+        slots (int): スロット数
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+        共有メモリからリングを組み立てる（create()またはattach()を使う）
+
+        Args:
+            shm (SharedMemory): リングの共有メモリ
+            owner (bool): 作成した側か（unlink()できるのは作成した側のみ）
+
+        Raises:
+            ValueError: 共有メモリがフレームリングでない場合
+        """
+        magic, slots, slot_bytes, ndim, dtype, *shape = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory {shm.name} is not a frame ring")
+
+        self._shm = shm
+        self._owner = owner
+        self.name = shm.name
+        self.slots = slots
+        self.shape = tuple(shape[:ndim])
+        self.dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+        self._slot_bytes = slot_bytes
+
+        self._published = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=HEADER_SIZE)
+        self._headers = np.ndarray((slots, 2), dtype=np.uint64, buffer=shm.buf, offset=HEADER_SIZE + 8)
+        self._data_offset = _align(HEADER_SIZE + 8 + slots * 16)
+        self._frames = [
+            np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf,
+                       offset=self._data_offset + index * slot_bytes)
+            for index in range(slots)
+        ]
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype=np.uint8, slots: int = 8) -> "FrameRing":
+        """
+        新しいリングを作成
+
+        Args:
+            shape (Tuple[int, ...]): フレームの形状（例: (720, 1280, 3)）
+            dtype: フレームのdtype
+            slots (int): スロット数
+
+        Returns:
+            FrameRing: 書き込み側のリング
+
+        Raises:
+            ValueError: スロット数や次元数が範囲外の場合
+        """
+        dtype = np.dtype(dtype)
+        if slots < 1:
+            raise ValueError(f"slots must be at least 1, got {slots}")
+        if not 1 <= len(shape) <= MAX_DIMS:
+            raise ValueError(f"Frame must have 1-{MAX_DIMS} dimensions, got shape {shape}")
+
+        slot_bytes = _align(int(np.prod(shape)) * dtype.itemsize)
+        data_offset = _align(HEADER_SIZE + 8 + slots * 16)
+        shm = shared_memory.SharedMemory(create=True, size=data_offset + slots * slot_bytes)
+        padded_shape = list(shape) + [0] * (MAX_DIMS - len(shape))
+        HEADER.pack_into(shm.buf, 0, MAGIC, slots, slot_bytes, len(shape),
+                         dtype.str.encode("ascii"), *padded_shape)
+        # 連番0は「未書き込み」
+        shm.buf[HEADER_SIZE:data_offset] = bytes(data_offset - HEADER_SIZE)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        """
+        既存のリングに接続（読み出し側）
+
+        Args:
+            name (str): create()したリングのname
+
+        Returns:
+            FrameRing: 読み出し側のリング
+        """
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    def write(self, frame: np.ndarray) -> int:
+        """
+        次のスロットにフレームをコピーして公開（書き込み側のみ、1スレッドから呼ぶ）
+
+        Args:
+            frame (np.ndarray): フレーム（shape・dtypeはリングと同じ）
+
+        Returns:
+            int: フレームの連番
+
+        Raises:
+            ValueError: フレームの形状・dtypeがリングと異なる場合
+        """
+        if frame.shape != self.shape or frame.dtype != self.dtype:
+            raise ValueError(
+                f"Frame {frame.shape} {frame.dtype} does not match ring {self.shape} {self.dtype}"
+            )
+        seq = int(self._published[0]) + 1
+        slot = (seq - 1) % self.slots
+        header = self._headers[slot]
+        header[0] = seq                 # 書き込み開始（読み出し中のビューは無効になる）
+        np.copyto(self._frames[slot], frame)
+        header[1] = seq                 # 書き込み完了
+        self._published[0] = seq
+        return seq
+
+    def latest(self) -> int:
+        """
+        最後に公開されたフレームの連番を返す
+
+        Returns:
+            int: 連番（まだ書き込まれていなければ0）
+        """
+        return int(self._published[0])
+
+    def wait(self, after: int, timeout: Optional[float] = None, poll: float = 0.0005) -> Optional[int]:
+        """
+        連番afterより新しいフレームが公開されるまで待つ
+
+        Args:
+            after (int): 最後に読んだ連番
+            timeout (Optional[float]): 最大待ち秒数（Noneなら無制限）
+            poll (float): 確認間隔（秒）
+
+        Returns:
+            Optional[int]: 最新の連番、時間内に公開されなければNone
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            seq = int(self._published[0])
+            if seq > after:
+                return seq
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll)
+
+    def view(self, seq: int) -> Optional[np.ndarray]:
+        """
+        連番seqのフレームをコピーせずにビューとして返す
+
+        ビューは書き込み側が同じスロットを再利用すると書き換わるため、
+        使い終わったらvalid(seq)で上書きされていないことを確認してください。
+
+        Args:
+            seq (int): フレームの連番
+
+        Returns:
+            Optional[np.ndarray]: 読み取り専用のビュー、未公開または上書き済みならNone
+        """
+        slot = (seq - 1) % self.slots
+        if seq < 1 or self._headers[slot, 1] != seq:
+            return None
+        frame = self._frames[slot].view()
+        frame.flags.writeable = False
+        return frame
+
+    def valid(self, seq: int) -> bool:
+        """
+        連番seqのフレームがまだ上書きされていないか
+
+        Args:
+            seq (int): フレームの連番
+
+        Returns:
+            bool: スロットに連番seqのフレームが残っている場合True
+        """
+        slot = (seq - 1) % self.slots
+        return seq >= 1 and self._headers[slot, 0] == seq and self._headers[slot, 1] == seq
+
+    def read(self, seq: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        連番seqのフレームをコピーして返す（コピー中の上書きを検出する）
+
+        Args:
+            seq (int): フレームの連番
+            out (Optional[np.ndarray]): コピー先（省略時は新しく確保）
+
+        Returns:
+            Optional[np.ndarray]: フレーム、未公開または上書きされた場合None
+        """
+        frame = self.view(seq)
+        if frame is None:
+            return None
+        if out is None:
+            out = np.empty(self.shape, dtype=self.dtype)
+        np.copyto(out, frame)
+        if not self.valid(seq):
+            return None
+        return out
+
+    def close(self):
+        """
+        このプロセスでの共有メモリへの接続を閉じる
+        """
+        if self._shm is None:
+            return
+        # バッファを参照するビューを先に手放す
+        self._published = None
+        self._headers = None
+        self._frames = []
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+
+def _ring_consumer(name: str, frames: int, done):
+    ring = FrameRing.attach(name)
+    last = 0
+    checksum = 0
+    try:
+        while last < frames:
+            seq = ring.wait(last, timeout=10.0)
+            if seq is None:
+                break
+            # 書き込み側はスロットが空くのを待つので、取りこぼさず順に読める
+            for current in range(last + 1, seq + 1):
+                frame = ring.view(current)
+                if frame is not None:
+                    checksum += int(frame[0, 0, 0])
+                del frame
+            last = seq
+            done.value = last
+    finally:
+        ring.close()
+
+
+def _queue_consumer(frame_queue, frames: int, done):
+    checksum = 0
+    for count in range(1, frames + 1):
+        frame = frame_queue.get()
+        checksum += int(frame[0, 0, 0])
+        done.value = count
+
+
+def benchmark_transport(method: str, frames: int = 300, shape: Tuple[int, ...] = (720, 1280, 3),
+                        slots: int = 8) -> Dict:
+    """
+    1つの読み出しプロセスへフレームを送る速さを計測
+
+    Args:
+        method (str): "ring"（FrameRing）または "queue"（multiprocessing.Queueでpickle）
+        frames (int): 送るフレーム数
+        shape (Tuple[int, ...]): フレームの形状
+        slots (int): リングのスロット数（queueではキューの最大長）
+
+    Returns:
+        Dict: method, frames, seconds, fps, mb_per_s, us_per_frame
+
+    Raises:
+        ValueError: methodが不明な場合
+    """
+    if method not in ("ring", "queue"):
+        raise ValueError(f"Unknown transport: {method}")
+
+    context = mp.get_context("spawn")
+    done = context.Value("q", 0, lock=False)
+    frame = np.zeros(shape, dtype=np.uint8)
+    ring = None
+    frame_queue = None
+
+    if method == "ring":
+        ring = FrameRing.create(shape, np.uint8, slots)
+        consumer = context.Process(target=_ring_consumer, args=(ring.name, frames, done), daemon=True)
+    else:
+        frame_queue = context.Queue(maxsize=slots)
+        consumer = context.Process(target=_queue_consumer, args=(frame_queue, frames, done), daemon=True)
+    consumer.start()
+
+    try:
+        # プロセスの起動を計測に含めないよう、1フレーム目の受信を待ってから計測する
+        if ring is not None:
+            ring.write(frame)
+        else:
+            frame_queue.put(frame)
+        while done.value < 1:
+            time.sleep(0.001)
+
+        start = time.perf_counter()
+        for index in range(2, frames + 1):
+            frame[0, 0, 0] = index % 256
+            if ring is not None:
+                # 読み出し側が追いつく前にスロットを上書きしない
+                while index - done.value > slots:
+                    time.sleep(0)
+                ring.write(frame)
+            else:
+                frame_queue.put(frame)
+        while done.value < frames:
+            time.sleep(0.0001)
+        elapsed = time.perf_counter() - start
+    finally:
+        consumer.join(timeout=10.0)
+        if consumer.is_alive():
+            consumer.terminate()
+        if ring is not None:
+            ring.close()
+
+    measured = frames - 1
+    return {
+        "method": method,
+        "frames": measured,
+        "seconds": elapsed,
+        "fps": measured / elapsed if elapsed > 0 else float("inf"),
+        "mb_per_s": measured * frame.nbytes / elapsed / 1e6 if elapsed > 0 else float("inf"),
+        "us_per_frame": elapsed / measured * 1e6 if measured else 0.0,
+    }
+
+
+def main():
+    """
+    エントリーポイント（FrameRingとキュー経由のpickle転送の比較）
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hand Tracking System - Frame Transport Benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to send")
+    parser.add_argument("--width", type=int, default=1280, help="Frame width")
+    parser.add_argument("--height", type=int, default=720, help="Frame height")
+    parser.add_argument("--slots", type=int, default=8, help="Ring slots / queue size")
+    args = parser.parse_args()
+
+    shape = (args.height, args.width, 3)
+    results = [benchmark_transport(method, args.frames, shape, args.slots) for method in ("queue", "ring")]
+    for result in results:
+        print(f"{result['method']:>5}: {result['fps']:8.1f} frames/s  "
+              f"{result['mb_per_s']:8.1f} MB/s  {result['us_per_frame']:8.1f} us/frame")
+    speedup = results[1]["fps"] / results[0]["fps"] if results[0]["fps"] else float("inf")
+    print(f"ring is {speedup:.1f}x faster than queue pickling", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
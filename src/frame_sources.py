@@ -0,0 +1,340 @@
+"""
+Frame Sources Module
+物理カメラ以外のフレームソース（動画ファイル / 画像ディレクトリ / 合成映像）
+
+各ソースはcv2.VideoCaptureと同じ最小限のインターフェース
+（isOpened / read / get / set / release）を持つため、CameraCaptureの
+self.capとしてそのまま差し替えられます。ベンチマークやCIでの
+再現可能なテスト、本番録画の再生に使います。
+
+ペーシング:
+    - "realtime": ソース本来のフレームレートで出す（動画はファイルのFPS）
+    - "fast": 待たずにできるだけ速く出す
+    - "fixed": 設定したfpsで出す
+"""
+
+import glob
+import os
+import time
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+PACING_MODES = ("realtime", "fast", "fixed")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class Pacer:
+    """
+    フレームの払い出し間隔を制御するクラス
+
+    目標時刻を積み上げて待つため、処理時間のばらつきで周期がずれません。
+    大きく遅れた場合は追いつこうとせずに基準時刻をリセットします。
+
+    Attributes:
+        period (float): フレーム間隔（秒）。0なら待たない
+    """
+
+    def __init__(self, fps: float):
+        """
+        ペーサーの初期化
+
+        Args:
+            fps (float): 目標フレームレート（0以下なら待たない）
+        """
+        self.period = 1.0 / fps if fps and fps > 0 else 0.0
+        self._next_time: Optional[float] = None
+
+    def wait(self):
+        """
+        次のフレームの時刻まで待つ
+        """
+        if self.period <= 0:
+            return
+        now = time.monotonic()
+        if self._next_time is None or now - self._next_time > self.period:
+            self._next_time = now
+        else:
+            delay = self._next_time - now
+            if delay > 0:
+                time.sleep(delay)
+        self._next_time += self.period
+
+    def reset(self):
+        self._next_time = None
+
+
+def _pacing_fps(pacing: str, native_fps: float, fixed_fps: float) -> float:
+    """
+    ペーシングモードから実際に使うfpsを決める
+
+    Args:
+        pacing (str): ペーシングモード
+        native_fps (float): ソース本来のfps
+        fixed_fps (float): fixedモードで使うfps
+
+    Returns:
+        float: ペーサーに渡すfps（0なら待たない）
+
+    Raises:
+        ValueError: 未知のペーシングモードの場合
+    """
+    if pacing not in PACING_MODES:
+        raise ValueError(f"Unknown pacing mode: {pacing}")
+    if pacing == "fast":
+        return 0.0
+    if pacing == "fixed":
+        return fixed_fps
+    return native_fps
+
+
+class FrameSource:
+    """
+    フレームソースの基底クラス（cv2.VideoCapture互換のサブセット）
+
+    サブクラスは _read_frame() を実装します。
+    """
+
+    def __init__(self, width: int, height: int, fps: float, pacing: str, fixed_fps: float):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.pacing = pacing
+        self.frames_read = 0
+        self._pacer = Pacer(_pacing_fps(pacing, fps, fixed_fps))
+        self._opened = True
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        次のフレームを読み出す（ペーシングに従って待つ）
+
+        Args:
+            image (Optional[np.ndarray]): 書き込み先バッファ（形状が合えばそこに書く）
+
+        Returns:
+            Tuple[bool, Optional[np.ndarray]]: (成功フラグ, フレーム画像)
+        """
+        if not self._opened:
+            return False, None
+        self._pacer.wait()
+        frame = self._read_frame(image)
+        if frame is None:
+            return False, None
+        self.frames_read += 1
+        return True, frame
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.frames_read)
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        # 解像度などはソース側で決まるため変更しない
+        return False
+
+    def release(self):
+        self._opened = False
+
+    def _read_frame(self, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+
+def _write_into(image: Optional[np.ndarray], frame: np.ndarray) -> np.ndarray:
+    """
+    書き込み先バッファが使えればそこにコピーして返す
+    """
+    if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+        np.copyto(image, frame)
+        return image
+    return frame
+
+
+class VideoFileSource(FrameSource):
+    """
+    動画ファイルのフレームソース
+
+    Attributes:
+        path (str): 動画ファイルのパス
+        loop (bool): 終端で先頭に戻るか
+    """
+
+    def __init__(self, path: str, pacing: str = "realtime", fixed_fps: float = 30.0,
+                 loop: bool = False):
+        """
+        動画ファイルソースの初期化
+
+        Args:
+            path (str): 動画ファイルのパス
+            pacing (str): ペーシングモード
+            fixed_fps (float): fixedモードのfps
+            loop (bool): 終端で先頭に戻るか
+        """
+        self.path = path
+        self.loop = loop
+        self._cap = cv2.VideoCapture(path)
+        opened = self._cap.isOpened()
+        native_fps = self._cap.get(cv2.CAP_PROP_FPS) if opened else 0.0
+        super().__init__(
+            int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if opened else 0,
+            int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if opened else 0,
+            native_fps or fixed_fps,
+            pacing,
+            fixed_fps
+        )
+        self._opened = opened
+
+    def _read_frame(self, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        ret, frame = self._cap.read(image) if image is not None else self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read(image) if image is not None else self._cap.read()
+        return frame if ret else None
+
+    def release(self):
+        self._cap.release()
+        super().release()
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    画像ディレクトリのフレームソース（ファイル名順に読み出す）
+
+    Attributes:
+        files (List[str]): 読み出す画像ファイルのリスト
+        loop (bool): 最後まで読んだら先頭に戻るか
+    """
+
+    def __init__(self, path: str, pacing: str = "realtime", fps: float = 30.0,
+                 fixed_fps: float = 30.0, loop: bool = False):
+        """
+        画像ディレクトリソースの初期化
+
+        Args:
+            path (str): 画像ディレクトリ
+            pacing (str): ペーシングモード
+            fps (float): realtimeモードで使う本来のfps
+            fixed_fps (float): fixedモードのfps
+            loop (bool): 最後まで読んだら先頭に戻るか
+        """
+        self.files: List[str] = sorted(
+            f for f in glob.glob(os.path.join(path, "*"))
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.loop = loop
+        self._index = 0
+
+        width = height = 0
+        if self.files:
+            first = cv2.imread(self.files[0])
+            if first is not None:
+                height, width = first.shape[:2]
+        super().__init__(width, height, fps, pacing, fixed_fps)
+        self._opened = bool(self.files) and width > 0
+
+    def _read_frame(self, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if self._index >= len(self.files):
+            if not self.loop:
+                return None
+            self._index = 0
+        frame = cv2.imread(self.files[self._index])
+        self._index += 1
+        if frame is None:
+            return None
+        return _write_into(image, frame)
+
+
+class SyntheticSource(FrameSource):
+    """
+    合成映像のフレームソース
+
+    グラデーション背景の上を矩形が動く決定的な映像を生成します。
+    同じフレーム番号からは常に同じ画像が得られます。
+
+    Attributes:
+        num_frames (Optional[int]): 生成するフレーム数（Noneなら無限）
+    """
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 30.0,
+                 pacing: str = "realtime", fixed_fps: float = 30.0,
+                 num_frames: Optional[int] = None):
+        """
+        合成ソースの初期化
+
+        Args:
+            width (int): フレーム幅
+            height (int): フレーム高さ
+            fps (float): realtimeモードで使う本来のfps
+            pacing (str): ペーシングモード
+            fixed_fps (float): fixedモードのfps
+            num_frames (Optional[int]): 生成するフレーム数（Noneなら無限）
+        """
+        super().__init__(width, height, fps, pacing, fixed_fps)
+        self.num_frames = num_frames
+        # 背景は一度だけ作って毎フレームコピーする
+        gradient = np.linspace(0, 255, width, dtype=np.float32).astype(np.uint8)
+        self._background = np.empty((height, width, 3), dtype=np.uint8)
+        self._background[:] = gradient[np.newaxis, :, np.newaxis]
+
+    def _read_frame(self, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        index = self.frames_read
+        if self.num_frames is not None and index >= self.num_frames:
+            return None
+
+        # 書き込み先が渡されたとき（reuse_buffers）だけ上書きし、それ以外は毎回新しい配列を返す
+        if image is None or image.shape != self._background.shape or image.dtype != np.uint8:
+            image = self._background.copy()
+        else:
+            np.copyto(image, self._background)
+
+        size = max(1, min(self.width, self.height) // 4)
+        x = (index * 8) % max(1, self.width - size)
+        y = (index * 4) % max(1, self.height - size)
+        image[y:y + size, x:x + size] = (0, 0, 255)
+        return image
+
+
+def create_frame_source(config: dict):
+    """
+    設定からフレームソースを生成
+
+    Args:
+        config (dict): カメラ設定
+            - source: "video", "images", "synthetic"
+            - path: 動画ファイルまたは画像ディレクトリのパス
+            - pacing: "realtime", "fast", "fixed" (default: "realtime")
+            - fps: fixedモードのfps、画像・合成ソースの本来のfps
+            - loop: 終端で先頭に戻るか
+            - num_frames: 合成ソースのフレーム数
+
+    Returns:
+        FrameSource: フレームソース
+
+    Raises:
+        ValueError: 未知のソース種別の場合
+    """
+    source = config.get("source")
+    pacing = config.get("pacing", "realtime")
+    fps = config.get("fps", 30)
+    loop = config.get("loop", False)
+
+    if source == "video":
+        return VideoFileSource(config["path"], pacing=pacing, fixed_fps=fps, loop=loop)
+    if source == "images":
+        return ImageDirectorySource(config["path"], pacing=pacing, fps=fps, fixed_fps=fps, loop=loop)
+    if source == "synthetic":
+        return SyntheticSource(
+            config.get("width", 1280), config.get("height", 720), fps,
+            pacing=pacing, fixed_fps=fps, num_frames=config.get("num_frames")
+        )
+    raise ValueError(f"Unknown frame source: {source}")
@@ -13,20 +13,39 @@ TODO for Agent2:
 """
 
 import cv2
-import mediapipe as mp
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+try:
+    from .landmarks import HandLandmarks
+except ImportError:
+    from landmarks import HandLandmarks
+
 
 class HandDetector:
     """
     MediaPipe Handsを使用して手を検出し、ランドマークを取得するクラス
 
+    ROIモード（roi_enabled）では前フレームの手のバウンディングボックスの周辺だけを
+    切り出して検出し、ランドマークをフレーム全体の座標に戻します。一定フレームごと、
+    またはROI内で手を見失ったときはフレーム全体で検出し直します。
+    切り出し範囲はフレームごとに変わり、前フレームの結果を追跡に使うと座標がずれるため、
+    ROIモードのHandsは常にstatic_image_modeで作ります。
+
+    バッファ再利用モード（reuse_buffers）では、縮小・RGB変換・描画の出力先を
+    事前確保したバッファに書き込み、フレームごとの画像の確保を行いません。
+
     Attributes:
         config (dict): 手検出の設定
         mp_hands: MediaPipe Handsオブジェクト
         mp_drawing: MediaPipe描画ユーティリティ
+        roi_enabled (bool): ROIモードを使うか
+        static_image_mode (bool): Handsをフレームごとに独立して検出させるか（ROIモードでは常にTrue）
+        roi (Optional[Tuple[int, int, int, int]]): 次フレームで使う切り出し範囲 (x0, y0, x1, y1)
+        reuse_buffers (bool): 画像バッファを再利用するか
+        model_complexity (int): 使用中のモデルの複雑度
+        input_scale (float): 検出器に渡す前の画像の縮小率（1.0で縮小しない）
     """
 
     def __init__(self, config: dict):
@@ -39,21 +58,91 @@ class HandDetector:
                 - min_detection_confidence: 検出信頼度閾値
                 - min_tracking_confidence: トラッキング信頼度閾値
                 - max_num_hands: 最大検出手数
+                - roi_enabled: 前フレームの手の周辺だけを検出するか (default: False)
+                - roi_margin: バウンディングボックスに足す余白（ボックスの長辺に対する比率、default: 0.5）
+                - roi_max_size: 切り出した領域の長辺がこれを超えたら縮小する（ピクセル、0で縮小しない）
+                - roi_redetect_interval: フレーム全体で検出し直す間隔（フレーム数、default: 30）
+                - reuse_buffers: 変換・描画の出力先バッファを再利用するか (default: False)
+                - input_scale: 検出器に渡す前に画像を縮小する率 (default: 1.0)
+                - static_image_mode: フレームごとに独立して検出するか（追跡しない、default: False。
+                  roi_enabledでは常にTrue）
         """
+        # MediaPipeは読み込みに時間がかかるので、検出器を作るときに初めて読み込む
+        import mediapipe as mp
+
         self.config = config
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
 
+        # ROIモード
+        self.roi_enabled = config.get("roi_enabled", False)
+        self.roi_margin = config.get("roi_margin", 0.5)
+        self.roi_max_size = config.get("roi_max_size", 0)
+        self.roi_redetect_interval = max(1, config.get("roi_redetect_interval", 30))
+        self.roi: Optional[Tuple[int, int, int, int]] = None
+        self._frames_since_full = 0
+
         # MediaPipe Handsの初期化
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            model_complexity=config.get("model_complexity", 1),
-            min_detection_confidence=config.get("min_detection_confidence", 0.5),
-            min_tracking_confidence=config.get("min_tracking_confidence", 0.5),
-            max_num_hands=config.get("max_num_hands", 2)
+        # （切り出しと全体検出が混ざるため、ROIモードではフレーム間の追跡を使わない）
+        self.static_image_mode = config.get("static_image_mode", False) or self.roi_enabled
+        self.model_complexity = config.get("model_complexity", 1)
+        self.hands = self._create_hands(self.model_complexity)
+        self.input_scale = config.get("input_scale", 1.0)
+
+        # 用途ごとの再利用バッファ（大きさが足りなければ確保し直す）
+        self.reuse_buffers = config.get("reuse_buffers", False)
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def _create_hands(self, model_complexity: int):
+        """
+        MediaPipe Handsを作成
+
+        Args:
+            model_complexity (int): モデルの複雑度 (0, 1, 2)
+
+        Returns:
+            MediaPipe Handsオブジェクト
+        """
+        return self.mp_hands.Hands(
+            static_image_mode=self.static_image_mode,
+            model_complexity=model_complexity,
+            min_detection_confidence=self.config.get("min_detection_confidence", 0.5),
+            min_tracking_confidence=self.config.get("min_tracking_confidence", 0.5),
+            max_num_hands=self.config.get("max_num_hands", 2)
         )
 
+    def set_model_complexity(self, model_complexity: int) -> bool:
+        """
+        モデルの複雑度を変更（変わる場合だけHandsを作り直す）
+
+        Args:
+            model_complexity (int): 新しいモデルの複雑度
+
+        Returns:
+            bool: Handsを作り直した場合True
+        """
+        if model_complexity == self.model_complexity:
+            return False
+        hands = self._create_hands(model_complexity)
+        self.hands.close()
+        self.hands = hands
+        self.model_complexity = model_complexity
+        return True
+
+    def warmup(self, width: int, height: int, frames: int = 1):
+        """
+        黒画像でダミーの検出を行い、最初の実フレームの検出を速くする
+
+        Args:
+            width (int): ダミー画像の幅（実際のフレームと同じにする）
+            height (int): ダミー画像の高さ
+            frames (int): ダミーの検出を行う回数
+        """
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for _ in range(frames):
+            self.detect(frame)
+
     def detect(self, frame: np.ndarray) -> Dict:
         """
         フレームから手を検出してランドマークを取得
@@ -68,21 +157,72 @@ class HandDetector:
                     "hands": [
                         {
                             "label": "Left" or "Right",
-                            "landmarks": [[x, y, z], ...],  # 21 points
+                            "landmarks": HandLandmarks,  # float32 (21, 3)
                             "confidence": float
                         }
                     ],
                     "timestamp": str
                 }
         """
+        height, width = frame.shape[:2]
+        roi = None
+        if self.roi_enabled and self.roi is not None and self._frames_since_full < self.roi_redetect_interval:
+            roi = self.roi
+
+        hands_data = self._detect_in_region(frame, roi)
+        if roi is not None and not hands_data:
+            # ROI内で見失ったらフレーム全体で検出し直す
+            roi = None
+            hands_data = self._detect_in_region(frame, None)
+
+        if self.roi_enabled:
+            self._frames_since_full = self._frames_since_full + 1 if roi is not None else 1
+            self.roi = self.compute_roi(hands_data, width, height) if hands_data else None
+
+        return {
+            "hand_count": len(hands_data),
+            "hands": hands_data,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _detect_in_region(self, frame: np.ndarray,
+                          roi: Optional[Tuple[int, int, int, int]]) -> List[Dict]:
+        """
+        フレーム全体またはROIで手を検出
+
+        Args:
+            frame (np.ndarray): 入力画像フレーム（BGR）
+            roi (Optional[Tuple[int, int, int, int]]): 切り出し範囲、Noneならフレーム全体
+
+        Returns:
+            List[Dict]: 手ごとの検出結果（ランドマークはフレーム全体の正規化座標）
+        """
+        height, width = frame.shape[:2]
+        image = frame if roi is None else frame[roi[1]:roi[3], roi[0]:roi[2]]
+
+        # input_scaleで縮小し、大きすぎるROIはroi_max_sizeまで縮小する
+        # （正規化座標は縮小の影響を受けない）
+        scale = self.input_scale
+        if roi is not None and self.roi_max_size > 0:
+            scale = min(scale, self.roi_max_size / max(image.shape[:2]))
+        if scale < 1.0:
+            size = (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale)))
+            if self.reuse_buffers:
+                image = cv2.resize(image, size, dst=self._buffer("resize", (size[1], size[0], 3)),
+                                   interpolation=cv2.INTER_AREA)
+            else:
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
         # RGB変換（MediaPipeはRGBを期待）
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.reuse_buffers:
+            rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._buffer("rgb", image.shape))
+        else:
+            rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
         # 手を検出
         results = self.hands.process(rgb_frame)
 
         # 結果を整形
-        hand_count = self.get_hand_count(results)
         hands_data = []
 
         if results.multi_hand_landmarks and results.multi_handedness:
@@ -93,11 +233,10 @@ class HandDetector:
                 label = handedness.classification[0].label
                 confidence = handedness.classification[0].score
 
-                # ランドマークを[[x, y, z], ...]の形式で抽出
-                landmarks = [
-                    [landmark.x, landmark.y, landmark.z]
-                    for landmark in hand_landmarks.landmark
-                ]
+                # ランドマークを (21, 3) のfloat32配列として抽出
+                landmarks = HandLandmarks.from_mediapipe(hand_landmarks)
+                if roi is not None:
+                    self._roi_to_frame(landmarks.array, roi, width, height)
 
                 hands_data.append({
                     "label": label,
@@ -105,11 +244,75 @@ class HandDetector:
                     "confidence": confidence
                 })
 
-        return {
-            "hand_count": hand_count,
-            "hands": hands_data,
-            "timestamp": datetime.now().isoformat()
-        }
+        return hands_data
+
+    def _buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        用途nameの再利用バッファを指定の形状のビューとして返す
+
+        ROIの大きさはフレームごとに変わるため、1次元のバッファを必要な大きさまで
+        広げて保持し、その先頭部分を連続したビューとして使います。
+
+        Args:
+            name (str): バッファの用途
+            shape (Tuple[int, ...]): 必要な形状（uint8）
+
+        Returns:
+            np.ndarray: 形状shapeのC連続なビュー
+        """
+        size = int(np.prod(shape))
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=np.uint8)
+            self._buffers[name] = buffer
+        return buffer[:size].reshape(shape)
+
+    @staticmethod
+    def _roi_to_frame(points: np.ndarray, roi: Tuple[int, int, int, int], width: int, height: int):
+        """
+        ROI内の正規化座標をフレーム全体の正規化座標にその場で変換
+
+        Args:
+            points (np.ndarray): (21, 3) のランドマーク配列（書き換える）
+            roi (Tuple[int, int, int, int]): 切り出し範囲 (x0, y0, x1, y1)
+            width (int): フレーム幅
+            height (int): フレーム高さ
+        """
+        x0, y0, x1, y1 = roi
+        scale_x = (x1 - x0) / width
+        points[:, 0] *= scale_x
+        points[:, 0] += x0 / width
+        points[:, 1] *= (y1 - y0) / height
+        points[:, 1] += y0 / height
+        # zはxと同じスケール（画像幅基準）
+        points[:, 2] *= scale_x
+
+    def compute_roi(self, hands: List[Dict], width: int, height: int) -> Tuple[int, int, int, int]:
+        """
+        手のランドマークから次フレームの切り出し範囲を計算
+
+        全ての手を囲むボックスに余白を足した正方形を、フレーム内に収まるように配置します。
+
+        Args:
+            hands (List[Dict]): 検出結果の手のリスト
+            width (int): フレーム幅
+            height (int): フレーム高さ
+
+        Returns:
+            Tuple[int, int, int, int]: (x0, y0, x1, y1) ピクセル座標
+        """
+        points = np.concatenate([np.asarray(hand["landmarks"])[:, :2] for hand in hands])
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
+
+        box = max((max_x - min_x) * width, (max_y - min_y) * height)
+        side = int(min(max(box * (1 + 2 * self.roi_margin), 32), width, height))
+        center_x = (min_x + max_x) / 2 * width
+        center_y = (min_y + max_y) / 2 * height
+
+        x0 = int(np.clip(center_x - side / 2, 0, width - side))
+        y0 = int(np.clip(center_y - side / 2, 0, height - side))
+        return x0, y0, x0 + side, y0 + side
 
     def draw_landmarks(self, frame: np.ndarray, landmarks) -> np.ndarray:
         """
@@ -121,9 +324,14 @@ class HandDetector:
 
         Returns:
             np.ndarray: ランドマークが描画されたフレーム
+                （reuse_buffersでは次の呼び出しで上書きされる共有バッファ）
         """
         # フレームのコピーを作成（元のフレームを変更しない）
-        annotated_frame = frame.copy()
+        if self.reuse_buffers:
+            annotated_frame = self._buffer("annotated", frame.shape)
+            np.copyto(annotated_frame, frame)
+        else:
+            annotated_frame = frame.copy()
 
         # ランドマークを描画
         self.mp_drawing.draw_landmarks(
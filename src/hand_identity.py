@@ -0,0 +1,139 @@
+"""
+Hand Identity Module
+フレームをまたいで同じ手に同じIDを付ける割り当てトラッカー
+
+MediaPipeが返す手の順序はフレームごとに変わるため（手が交差したときなど）、
+検出した手を既存の追跡に重心の距離と左右ラベルで対応付け、追跡ごとに
+安定したhand_idと追跡年齢（フレーム数）を付けます。一定時間見えなかった
+追跡は破棄し、IDは使われていない最小の番号から再利用します。
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class HandIdentity:
+    """
+    1つの手の追跡
+
+    Attributes:
+        hand_id (int): 安定したID
+        label (str): 最後に観測したラベル（Left/Right）
+        centroid (np.ndarray): 最後に観測した重心 (x, y)（正規化座標）
+        age (int): 追跡を始めてから観測したフレーム数
+        last_seen (float): 最後に観測した時刻（秒）
+    """
+
+    def __init__(self, hand_id: int, label: str, centroid: np.ndarray, timestamp: float):
+        self.hand_id = hand_id
+        self.label = label
+        self.centroid = centroid
+        self.age = 1
+        self.last_seen = timestamp
+
+
+class HandIdentityTracker:
+    """
+    検出した手にフレームをまたいで安定したIDを割り当てるクラス
+
+    Attributes:
+        max_distance (float): 同じ手とみなす重心の最大移動量（正規化座標）
+        label_penalty (float): ラベルが異なる対応に加えるコスト
+        expire_after (float): この秒数見えなかった追跡を破棄する
+        tracks (List[HandIdentity]): 追跡中の手
+    """
+
+    def __init__(self, config: dict):
+        """
+        割り当てトラッカーの初期化
+
+        Args:
+            config (dict): ID追跡の設定
+                - max_distance: 同じ手とみなす重心の最大移動量 (default: 0.2)
+                - label_penalty: ラベルが異なる対応に加えるコスト (default: 0.1)
+                - expire_after: 追跡を破棄するまでの秒数 (default: 0.5)
+        """
+        self.max_distance = config.get("max_distance", 0.2)
+        self.label_penalty = config.get("label_penalty", 0.1)
+        self.expire_after = config.get("expire_after", 0.5)
+        self.tracks: List[HandIdentity] = []
+
+    def assign(self, hands: List[Dict], timestamp: float) -> List[int]:
+        """
+        検出した手にIDを割り当てる
+
+        各手に "hand_id" と "track_age" を書き込みます。
+
+        Args:
+            hands (List[Dict]): 検出結果の手のリスト
+            timestamp (float): フレームの時刻（秒）
+
+        Returns:
+            List[int]: 手ごとのhand_id
+        """
+        self.tracks = [
+            track for track in self.tracks if timestamp - track.last_seen <= self.expire_after
+        ]
+
+        centroids = np.array(
+            [np.asarray(hand["landmarks"])[:, :2].mean(axis=0) for hand in hands],
+            dtype=np.float64
+        ).reshape(len(hands), 2)
+        matches = self._match(hands, centroids)
+
+        ids = []
+        for index, (hand, track) in enumerate(zip(hands, matches)):
+            if track is None:
+                track = HandIdentity(self._next_id(), hand["label"], centroids[index], timestamp)
+                self.tracks.append(track)
+            else:
+                track.label = hand["label"]
+                track.centroid = centroids[index]
+                track.age += 1
+                track.last_seen = timestamp
+            hand["hand_id"] = track.hand_id
+            hand["track_age"] = track.age
+            ids.append(track.hand_id)
+        return ids
+
+    def _match(self, hands: List[Dict], centroids: np.ndarray) -> List[Optional[HandIdentity]]:
+        """
+        コストの小さい組から順に検出と追跡を対応付ける（貪欲法）
+
+        Args:
+            hands (List[Dict]): 検出結果の手のリスト
+            centroids (np.ndarray): 手ごとの重心 (N, 2)
+
+        Returns:
+            List[Optional[HandIdentity]]: 手ごとの対応する追跡（新しい手はNone）
+        """
+        matches: List[Optional[HandIdentity]] = [None] * len(hands)
+        if not self.tracks or not hands:
+            return matches
+
+        track_centroids = np.array([track.centroid for track in self.tracks])
+        distance = np.linalg.norm(centroids[:, np.newaxis, :] - track_centroids[np.newaxis, :, :], axis=2)
+        label_mismatch = np.array(
+            [[hand["label"] != track.label for track in self.tracks] for hand in hands]
+        )
+        cost = np.where(distance <= self.max_distance, distance + self.label_penalty * label_mismatch, np.inf)
+
+        for _ in range(min(cost.shape)):
+            hand_index, track_index = np.unravel_index(np.argmin(cost), cost.shape)
+            if not np.isfinite(cost[hand_index, track_index]):
+                break
+            matches[hand_index] = self.tracks[track_index]
+            cost[hand_index, :] = np.inf
+            cost[:, track_index] = np.inf
+        return matches
+
+    def _next_id(self) -> int:
+        """
+        使われていない最小のIDを返す
+        """
+        used = {track.hand_id for track in self.tracks}
+        hand_id = 0
+        while hand_id in used:
+            hand_id += 1
+        return hand_id
@@ -25,8 +25,19 @@ class JointMeasurement:
         config (dict): 計測設定
         landmarks_to_measure (List[Tuple[int, int]]): 計測する関節ペアのリスト
         scale_factor (float): 実寸への変換スケール
+        joint_names (List[str]): 各ペアの関節名（landmarks_to_measureと同じ順）
     """
 
+    # ランドマークインデックス → 名前
+    LANDMARK_NAMES = {
+        0: "wrist",
+        4: "thumb",
+        8: "index",
+        12: "middle",
+        16: "ring",
+        20: "pinky"
+    }
+
     def __init__(self, config: dict):
         """
         関節計測の初期化
@@ -41,12 +52,19 @@ class JointMeasurement:
         self.scale_factor = config.get("scale_factor", 1.0)
         self.unit = config.get("unit", "cm")
 
+        # ペアのインデックス配列と関節名は毎フレーム作らず、ここで一度だけ用意する
+        pairs = np.asarray(self.landmarks_to_measure, dtype=np.intp).reshape(-1, 2)
+        self._idx1 = pairs[:, 0].copy()
+        self._idx2 = pairs[:, 1].copy()
+        self.joint_names = [self._get_joint_name(int(i), int(j)) for i, j in pairs]
+
     def calculate_distances(self, landmarks: List[List[float]]) -> Dict:
         """
         ランドマーク間の距離を計算
 
         Args:
-            landmarks (List[List[float]]): 21個のランドマーク座標 [[x, y, z], ...]
+            landmarks: 21個のランドマーク座標（HandLandmarks、(21, 3)配列、
+                または [[x, y, z], ...]）
 
         Returns:
             Dict: 計測結果
@@ -58,27 +76,60 @@ class JointMeasurement:
                     }
                 }
         """
-        measurements = {}
+        distances = self.compute_distance_array(np.asarray(landmarks, dtype=np.float32))
+        return {"measurements": self._to_measurements(distances)}
+
+    def calculate_distances_for_hands(self, hands_landmarks: List) -> List[Dict]:
+        """
+        複数の手の距離をまとめて計算
+
+        全ての手を (N_hands, 21, 3) のfloat32配列にまとめ、1回のNumPy演算で計算します。
+        HandLandmarksと同じfloat32のままなので、変換のコピーが発生しません。
 
-        for pair in self.landmarks_to_measure:
-            idx1, idx2 = pair
-            point1 = landmarks[idx1]
-            point2 = landmarks[idx2]
+        Args:
+            hands_landmarks (List): 手ごとのランドマーク（HandLandmarksまたは21x3の配列）
 
-            # 距離計算
-            distance = self._euclidean_distance(point1, point2)
+        Returns:
+            List[Dict]: 手ごとのcalculate_distances()と同じ形式の結果
+        """
+        if len(hands_landmarks) == 0:
+            return []
+        stacked = np.stack([np.asarray(hand, dtype=np.float32) for hand in hands_landmarks])
+        distances = self.compute_distance_array(stacked)
+        return [{"measurements": self._to_measurements(row)} for row in distances]
 
-            # スケール変換（ピクセル → cm）
-            distance_scaled = distance * self.scale_factor
+    def compute_distance_array(self, landmarks: np.ndarray) -> np.ndarray:
+        """
+        全ペアの距離をスケール変換済みの配列として計算
 
-            # 関節名を決定
-            name = self._get_joint_name(idx1, idx2)
-            measurements[name] = {
-                "distance": round(distance_scaled, 2),
-                "unit": self.unit
-            }
+        Args:
+            landmarks (np.ndarray): 形状 (..., 21, 3) のランドマーク配列
+                （1つの手、(N_hands, 21, 3)、(N_frames, N_hands, 21, 3) など）
 
-        return {"measurements": measurements}
+        Returns:
+            np.ndarray: 形状 (..., ペア数) の距離配列（丸めなし、入力と同じdtype）
+        """
+        diff = landmarks[..., self._idx1, :] - landmarks[..., self._idx2, :]
+        distances = np.sqrt(np.einsum("...ij,...ij->...i", diff, diff))
+        distances *= distances.dtype.type(self.scale_factor)
+        return distances
+
+    def _to_measurements(self, distances: np.ndarray) -> Dict:
+        """
+        1つの手の距離配列を計測結果の辞書に変換
+
+        Args:
+            distances (np.ndarray): 形状 (ペア数,) の距離配列
+
+        Returns:
+            Dict: 関節名 → {"distance": float, "unit": str}
+        """
+        # float32のまま丸めると 12.35 → 12.350000381... のような値になるので、float64で丸める
+        rounded = np.round(distances.astype(np.float64), 2).tolist()
+        return {
+            name: {"distance": distance, "unit": self.unit}
+            for name, distance in zip(self.joint_names, rounded)
+        }
 
     def _get_joint_name(self, idx1: int, idx2: int) -> str:
         """
@@ -91,17 +142,8 @@ class JointMeasurement:
         Returns:
             str: 関節名（例: "wrist_to_thumb"）
         """
-        landmark_names = {
-            0: "wrist",
-            4: "thumb",
-            8: "index",
-            12: "middle",
-            16: "ring",
-            20: "pinky"
-        }
-
-        name1 = landmark_names.get(idx1, f"landmark_{idx1}")
-        name2 = landmark_names.get(idx2, f"landmark_{idx2}")
+        name1 = self.LANDMARK_NAMES.get(idx1, f"landmark_{idx1}")
+        name2 = self.LANDMARK_NAMES.get(idx2, f"landmark_{idx2}")
         return f"{name1}_to_{name2}"
 
     def _euclidean_distance(self, point1: List[float], point2: List[float]) -> float:
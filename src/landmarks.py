@@ -0,0 +1,115 @@
+"""
+Hand Landmarks Container
+21点の手ランドマークを1つの連続したfloat32配列 (21, 3) で保持するコンテナ
+
+検出 → 計測 → シリアライズの間で点ごとのPythonオブジェクトを作らずに
+ランドマークを受け渡すために使います。リストへの変換はJSONに書き出す
+ときだけ行います（tolist()）。
+"""
+
+from itertools import chain
+from typing import Iterable, Iterator, List
+
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+
+
+class HandLandmarks:
+    """
+    float32 (21, 3) 配列をバックエンドに持つランドマークコンテナ
+
+    np.asarray()でそのまま配列として扱え、インデックスや反復は
+    [x, y, z] の行（配列ビュー）を返します。
+
+    Attributes:
+        array (np.ndarray): 形状 (21, 3)、dtype float32 の座標配列
+    """
+
+    __slots__ = ("_array",)
+
+    def __init__(self, array: np.ndarray):
+        """
+        コンテナの初期化
+
+        Args:
+            array (np.ndarray): 形状 (21, 3) の座標配列（float32以外は変換）
+
+        Raises:
+            ValueError: 形状が (21, 3) でない場合
+        """
+        array = np.ascontiguousarray(array, dtype=np.float32)
+        if array.shape != (NUM_LANDMARKS, 3):
+            raise ValueError(f"Landmarks must have shape ({NUM_LANDMARKS}, 3), got {array.shape}")
+        self._array = array
+
+    @classmethod
+    def from_mediapipe(cls, hand_landmarks) -> "HandLandmarks":
+        """
+        MediaPipeのNormalizedLandmarkListから生成
+
+        Args:
+            hand_landmarks: MediaPipeのランドマーク（.landmarkに21点）
+
+        Returns:
+            HandLandmarks: ランドマークコンテナ
+        """
+        values = np.fromiter(
+            chain.from_iterable((lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark),
+            dtype=np.float32,
+            count=NUM_LANDMARKS * 3
+        )
+        return cls(values.reshape(NUM_LANDMARKS, 3))
+
+    @classmethod
+    def from_list(cls, landmarks: Iterable) -> "HandLandmarks":
+        """
+        [[x, y, z], ...] 形式から生成
+
+        Args:
+            landmarks (Iterable): 21点の座標
+
+        Returns:
+            HandLandmarks: ランドマークコンテナ
+        """
+        return cls(np.asarray(landmarks, dtype=np.float32))
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._array
+
+    def tolist(self) -> List[List[float]]:
+        """
+        [[x, y, z], ...] 形式のリストに変換（JSON出力用）
+
+        Returns:
+            List[List[float]]: 21点の座標
+        """
+        return self._array.tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self._array.dtype:
+            return self._array.copy() if copy else self._array
+        return self._array.astype(dtype)
+
+    def __len__(self) -> int:
+        return NUM_LANDMARKS
+
+    def __getitem__(self, index):
+        return self._array[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self._array)
+
+    def __eq__(self, other) -> bool:
+        try:
+            other_array = np.asarray(other, dtype=np.float32)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return other_array.shape == self._array.shape and bool(np.array_equal(self._array, other_array))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"HandLandmarks(wrist={self._array[0].tolist()})"
@@ -6,29 +6,54 @@ Agent5担当: 全モジュールの統合とメインループ実装
 手追跡システムのメインループを実装します。
 """
 
+import time
+
+# 起動時間レポートの基準時刻
+STARTUP_ORIGIN = time.perf_counter()
+
 import yaml
 import logging
-from pythonjsonlogger import jsonlogger
 import signal
 import sys
-from typing import Optional
+import threading
+from typing import Dict, List, Optional
 from datetime import datetime
 import os
 
+from startup import StartupTimer
+
 # 他のモジュールをインポート
+# （cv2・requests・mediapipeを読み込むモジュール（camera_capture, hand_detector, data_sender,
+#   cadence, multi_camera, detector_pool, recorder）は、使う設定のときに作る場所で読み込む。
+#   --helpや設定エラーでは読み込まない）
 try:
-    from camera_capture import CameraCapture
-    from hand_detector import HandDetector
     from joint_measurement import JointMeasurement
-    from data_sender import DataSender
+    from pipeline import Pipeline
+    from metrics import MetricsRegistry, MetricsServer, RateMeter
+    from tracker import LandmarkTracker
+    from smoothing import LandmarkSmoother
+    from hand_identity import HandIdentityTracker
+    from landmarks import HandLandmarks
+    from autotune import DetectionAutotuner
 except ImportError as e:
     # モジュールが未実装の場合は警告を出すが、続行する（テスト用）
     logging.warning(f"Some modules not available: {e}")
     # テスト用にNoneで定義
-    CameraCapture = None
-    HandDetector = None
     JointMeasurement = None
-    DataSender = None
+    Pipeline = None
+    MetricsRegistry = None
+    MetricsServer = None
+    RateMeter = None
+    LandmarkTracker = None
+    LandmarkSmoother = None
+    HandIdentityTracker = None
+    HandLandmarks = None
+    DetectionAutotuner = None
+
+IMPORTS_DONE = time.perf_counter()
+
+
+STAGE_LATENCY_METRIC = "hand_tracker_stage_latency_seconds"
 
 
 class HandTrackingApp:
@@ -45,45 +70,160 @@ class HandTrackingApp:
         detector: 手検出器インスタンス
         measurement: 関節計測インスタンス
         sender: データ送信インスタンス
+        source: マルチカメラソース（cameras設定がある場合のみ）
+        metrics: メトリクスレジストリ（metrics.enabledの場合のみ）
         running (bool): アプリケーション実行状態
         logger: ロガーインスタンス
     """
 
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", warmup: Optional[bool] = None):
         """
         アプリケーションの初期化
 
+        単一カメラモードのMediaPipe Handsはここでは作らず、initialize()で
+        カメラの起動と並行して読み込みます。
+
         Args:
             config_path (str): 設定ファイルのパス
+            warmup (Optional[bool]): 最初のフレームの前にダミーの検出を行うか
+                （Noneならconfigのstartup.warmupに従う）
         """
-        self.config = self.load_config(config_path)
-        self.setup_logging()
+        self.startup = StartupTimer(origin=STARTUP_ORIGIN)
+        self.startup.record("imports", STARTUP_ORIGIN, IMPORTS_DONE)
+        with self.startup.phase("config"):
+            self.config = self.load_config(config_path)
+        with self.startup.phase("logging"):
+            self.setup_logging()
+        construct_start = time.perf_counter()
+
+        startup_config = self.config.get("startup", {})
+        if warmup is None:
+            warmup = startup_config.get("warmup", False)
+        self.warmup_frames = max(1, startup_config.get("warmup_frames", 1)) if warmup else 0
+
         self.running = False
+        self.frame_count = 0
+        self.pipeline = None
+        # 送信ペイロードに生のランドマークを含めるか
+        self.include_landmarks = self.config.get("data_sender", {}).get("include_landmarks", False)
         self.logger = logging.getLogger(__name__)
 
+        # メトリクス（無効時はステージの計測を一切行わない）
+        self.metrics = None
+        self.metrics_server = None
+        self.fps_meter = None
+        if self.config.get("metrics", {}).get("enabled", False) and MetricsRegistry is not None:
+            self.metrics = MetricsRegistry()
+            self.fps_meter = RateMeter()
+
+        # cameras設定がある場合はカメラごとのワーカープロセスで取得・検出する
+        self.source = None
+        camera_configs = self.config.get("cameras") or []
+
+        # 検出ケイデンス（手がない間は検出頻度を落とす）
+        self.cadence = None
+        self.tracker = None
+        self.detect_every = 1
+        # 1台のカメラのフレームを複数の検出ワーカープロセスで処理する
+        self.detector_pool = None
+        # 空きスロットを待ちきれずにプールに渡せなかったフレーム数
+        self.detector_pool_dropped = 0
+        pool_config = self.config.get("detector_pool", {})
+        # 検出レイテンシに合わせてモデルの複雑度と入力縮小率を調整する
+        self.autotuner = None
+        autotune_config = self.config.get("autotune", {})
+        autotune_enabled = autotune_config.get("enabled", False)
+        self.autotune_config = None
+        # HandDetectorの作成をinitialize()（または最初のmain_loop()）まで遅らせている
+        self._detector_pending = False
+        # initialize()が並行して読み込むスレッドと、起動を中止したことの通知
+        self._model_load_thread = None
+        self._startup_cancelled = threading.Event()
+
+        # ランドマークの平滑化（カメラごとに状態を持つ）
+        self.smoothing_config = self.config.get("smoothing", {})
+        if LandmarkSmoother is None or not self.smoothing_config.get("enabled", False):
+            self.smoothing_config = None
+        self.smoothers: Dict = {}
+        # フレームをまたいで安定したhand_idを付ける（カメラごと）
+        self.hand_ids: Dict = {}
+        # 検出した生のランドマークの記録（オフラインで再計測するため）
+        self.recorder = None
+        recording_config = self.config.get("recording", {})
+        if recording_config.get("enabled", False):
+            from recorder import SessionRecorder
+            self.recorder = SessionRecorder(
+                recording_config.get("path", "recordings/session.htr"),
+                buffer_size=recording_config.get("buffer_size", 1024)
+            )
+        cadence_config = self.config.get("cadence", {})
+        cadence_enabled = cadence_config.get("enabled", False)
+
         # 各モジュールのインスタンスを初期化
         # 他のAgentが実装完了したらコメントを外す
         try:
-            if CameraCapture is not None:
-                self.camera = CameraCapture(self.config["camera"])
-            else:
+            if camera_configs:
+                from multi_camera import MultiCameraSource
+                # 共通のcamera設定を各カメラのデフォルトとして使う
+                defaults = self.config.get("camera", {})
+                multi_camera_config = dict(self.config.get("multi_camera", {}))
+                if cadence_enabled:
+                    # ケイデンスはワーカープロセス側でカメラごとに制御する
+                    multi_camera_config["cadence"] = cadence_config
+                if autotune_enabled:
+                    multi_camera_config["autotune"] = autotune_config
+                if self.warmup_frames > 0:
+                    # ウォームアップも各ワーカーが自分の検出器で行う
+                    multi_camera_config["warmup_frames"] = self.warmup_frames
+                self.source = MultiCameraSource(
+                    [dict(defaults, **camera_config) for camera_config in camera_configs],
+                    self.config["hand_detection"],
+                    multi_camera_config
+                )
+                # 取得と検出はワーカープロセス側で行う
                 self.camera = None
-
-            if HandDetector is not None:
-                self.detector = HandDetector(self.config["hand_detection"])
-            else:
                 self.detector = None
+            else:
+                from camera_capture import CameraCapture
+                self.camera = CameraCapture(self.config["camera"])
+
+                if pool_config.get("enabled", False):
+                    from detector_pool import DetectorPool
+                    # 検出（とウォームアップ）はワーカープロセス側で行う
+                    if self.warmup_frames > 0:
+                        camera_config = self.config["camera"]
+                        pool_config = dict(
+                            pool_config, warmup_frames=self.warmup_frames,
+                            warmup_size=(camera_config.get("width", 1280), camera_config.get("height", 720))
+                        )
+                    self.detector_pool = DetectorPool(self.config["hand_detection"], pool_config)
+                    self.detector = None
+                else:
+                    # MediaPipe Handsの構築は重いので、load_detector()で行う
+                    self.detector = None
+                    self._detector_pending = True
+
+                if cadence_enabled:
+                    from cadence import CadenceController
+                    self.cadence = CadenceController(cadence_config)
+
+                if autotune_enabled and DetectionAutotuner is not None and self._detector_pending:
+                    self.autotune_config = autotune_config
+
+                # 検出をdetect_everyフレームに1回にし、間のフレームは予測で補う
+                tracking_config = self.config.get("tracking", {})
+                if tracking_config.get("enabled", False) and LandmarkTracker is not None:
+                    self.tracker = LandmarkTracker(tracking_config)
+                    self.detect_every = max(1, tracking_config.get("detect_every", 2))
 
             if JointMeasurement is not None:
                 self.measurement = JointMeasurement(self.config["measurement"])
             else:
                 self.measurement = None
 
-            if DataSender is not None:
-                self.sender = DataSender(self.config["data_sender"])
-            else:
-                self.sender = None
-        except (NameError, AttributeError, TypeError) as e:
+            from data_sender import DataSender
+            self.sender = DataSender(self.config["data_sender"])
+        except (ImportError, NameError, AttributeError, TypeError) as e:
             self.logger.warning(f"Modules not fully implemented yet: {e}")
             self.camera = None
             self.detector = None
@@ -93,6 +233,7 @@ class HandTrackingApp:
         # シグナルハンドラの設定
         signal.signal(signal.SIGINT, self.handle_shutdown)
         signal.signal(signal.SIGTERM, self.handle_shutdown)
+        self.startup.record("construct", construct_start, time.perf_counter())
 
     def load_config(self, config_path: str) -> dict:
         """
@@ -136,6 +277,8 @@ class HandTrackingApp:
 
         # ログフォーマットの設定
         if log_format == "json":
+            from pythonjsonlogger import jsonlogger
+
             formatter = jsonlogger.JsonFormatter(
                 '%(timestamp)s %(name)s %(levelname)s %(message)s'
             )
@@ -165,7 +308,8 @@ class HandTrackingApp:
         """
         全モジュールを初期化
 
-        各モジュールの起動と接続を確立します。
+        カメラの起動・送信先のhealth check・MediaPipe Handsの読み込み（とウォームアップ）を
+        並行して行います。カメラを起動できなかった場合はモデルの読み込みを待たずに失敗を返します。
 
         Returns:
             bool: 初期化成功でTrue、失敗でFalse
@@ -173,30 +317,149 @@ class HandTrackingApp:
         self.logger.info("Initializing Hand Tracking System...")
 
         # モジュールが利用可能かチェック
-        if not all([self.camera, self.detector, self.measurement, self.sender]):
+        if self.source is not None:
+            required = [self.source, self.measurement, self.sender]
+        elif self.detector_pool is not None:
+            required = [self.camera, self.detector_pool, self.measurement, self.sender]
+        else:
+            detector_available = self.detector is not None or self._detector_pending
+            required = [self.camera, detector_available, self.measurement, self.sender]
+        if not all(required):
             self.logger.error("Not all modules are available")
             return False
 
-        # カメラ起動
+        # 送信先の確認とモデルの読み込みはカメラの起動と並行して行う
+        errors: Dict[str, Exception] = {}
+        background = [self._start_phase_thread("health_check", self.connect_sender, errors)]
+        if self._detector_pending:
+            self._model_load_thread = self._start_phase_thread("model_load", self.load_detector, errors)
+            background.append(self._model_load_thread)
+
+        # カメラ起動（マルチカメラモードではワーカープロセスを起動）
         try:
-            if not self.camera.start():
-                self.logger.error("Failed to start camera")
-                return False
-            self.logger.info("Camera started successfully")
+            with self.startup.phase("camera_open"):
+                camera_started = self.start_camera()
         except Exception as e:
             self.logger.error(f"Exception while starting camera: {e}")
+            camera_started = False
+        if not camera_started:
+            # 読み込み中のモデルは使わない（cleanup()で読み込みの終了を待つ）
+            self._startup_cancelled.set()
+            return False
+
+        for thread in background:
+            thread.join()
+        if "model_load" in errors:
+            self.logger.error(f"Failed to load hand detector: {errors['model_load']}")
             return False
 
-        # データ送信先に接続
+        if self.metrics is not None:
+            self.start_metrics_server()
+
+        self.logger.info("Initialization complete")
+        self.log_startup_report()
+        return True
+
+    def start_camera(self) -> bool:
+        """
+        カメラを起動（マルチカメラモードではワーカープロセス、検出プールではそのワーカーも起動）
+
+        Returns:
+            bool: 起動できた場合True
+        """
+        if self.source is not None:
+            if not self.source.start():
+                self.logger.error("Failed to start camera workers")
+                return False
+            self.logger.info(f"Started {len(self.source.camera_configs)} camera worker(s)")
+        elif not self.camera.start():
+            self.logger.error("Failed to start camera")
+            return False
+        else:
+            self.logger.info("Camera started successfully")
+        if self.detector_pool is not None:
+            self.detector_pool.start()
+            self.logger.info(f"Started {self.detector_pool.num_workers} detector worker(s)")
+        return True
+
+    def connect_sender(self):
+        """
+        データ送信先に接続（HTTPではhealth checkを送る）
+        """
         try:
-            if not self.sender.connect():
+            with self.startup.phase("health_check"):
+                connected = self.sender.connect()
+            if not connected:
                 self.logger.warning("Failed to connect to data endpoint")
                 # データ送信は必須ではないので、続行
         except Exception as e:
             self.logger.warning(f"Exception while connecting to sender: {e}")
 
-        self.logger.info("Initialization complete")
-        return True
+    def load_detector(self):
+        """
+        手検出器（MediaPipe Hands）を作成し、自動調整とウォームアップを行う
+
+        initialize()がカメラの起動と並行して呼びます。initialize()を経ずに
+        main_loop()を呼んだ場合はmain_loop()の先頭で呼ばれます。
+        読み込み中に起動が中止された場合は、作った検出器を閉じて使いません。
+        """
+        with self.startup.phase("model_load"):
+            from hand_detector import HandDetector
+            detector = HandDetector(self.config["hand_detection"])
+        autotuner = None
+        if self.autotune_config is not None:
+            autotuner = DetectionAutotuner(detector, self.autotune_config)
+        if self.warmup_frames > 0 and not self._startup_cancelled.is_set():
+            with self.startup.phase("warmup"):
+                self.warmup_detector(detector)
+        if self._startup_cancelled.is_set():
+            detector.hands.close()
+            return
+        self.autotuner = autotuner
+        self.detector = detector
+        self._detector_pending = False
+
+    def warmup_detector(self, detector):
+        """
+        黒画像でダミーの検出を行い、最初の実フレームの検出を速くする
+
+        Args:
+            detector: ウォームアップするHandDetector
+        """
+        camera_config = self.config.get("camera", {})
+        detector.warmup(camera_config.get("width", 1280), camera_config.get("height", 720),
+                        self.warmup_frames)
+
+    def _start_phase_thread(self, name: str, func, errors: Dict[str, Exception]) -> threading.Thread:
+        """
+        起動フェーズを別スレッドで開始する（例外はerrorsに入れる）
+
+        Args:
+            name (str): フェーズ名（errorsのキー）
+            func: 実行する関数
+            errors (Dict[str, Exception]): 例外の格納先
+
+        Returns:
+            threading.Thread: 起動したスレッド
+        """
+        def run():
+            try:
+                func()
+            except Exception as e:
+                errors[name] = e
+
+        # カメラの起動に失敗したときにこのスレッドを待たずに終了できるようデーモンにする
+        thread = threading.Thread(target=run, name=f"startup-{name}", daemon=True)
+        thread.start()
+        return thread
+
+    def log_startup_report(self):
+        """
+        起動フェーズごとの所要時間をログに出力
+        """
+        self.logger.info("Startup report:")
+        for line in self.startup.report():
+            self.logger.info(f"  {line}")
 
     def main_loop(self):
         """
@@ -209,74 +472,572 @@ class HandTrackingApp:
         4. データの送信
         5. 次のフレームへ
 
+        config.yamlで pipeline.enabled が有効な場合は、各処理を別スレッドの
+        ステージとして並行実行します（run_pipeline()参照）。
+
         Ctrl+C (SIGINT) またはSIGTERMで終了します。
         """
+        if self.source is not None:
+            self.run_multi_camera()
+            return
+
+        if self.detector_pool is not None:
+            self.run_detector_pool()
+            return
+
+        if self._detector_pending:
+            self.load_detector()
+
+        if self.config.get("pipeline", {}).get("enabled", False) and Pipeline is not None:
+            self.run_pipeline()
+            return
+
         self.logger.info("Starting main loop...")
         self.running = True
 
-        frame_count = 0
+        capture_frame = self.instrument("capture", self.capture_frame)
+        detect_hands = self.instrument("detect", self.detect_hands)
+        measure_joints = self.instrument("measure", self.measure_joints)
+        send_measurements = self.instrument("send", self.send_measurements)
 
         while self.running:
             try:
                 # 1. フレーム取得
-                success, frame = self.camera.get_frame()
-                if not success:
-                    self.logger.warning("Failed to get frame")
+                item = capture_frame()
+                if item is None:
                     continue
 
-                frame_count += 1
+                # 2. 手検出（手が検出されなければスキップ）
+                item = detect_hands(item)
+                if item is None:
+                    continue
+
+                # 3. 各手について距離計測
+                item = measure_joints(item)
+
+                # 4. データ送信
+                send_measurements(item)
+
+            except KeyboardInterrupt:
+                # Ctrl+Cでの終了
+                self.logger.info("Keyboard interrupt received")
+                break
+            except Exception as e:
+                self.logger.error(f"Error in main loop: {e}", exc_info=True)
+                # エラーが発生しても続行
+                continue
+
+        self.logger.info("Main loop ended")
+
+    def run_pipeline(self):
+        """
+        パイプラインモードでメインループを実行
 
-                # 2. 手検出
-                detection_result = self.detector.detect(frame)
+        取得 → 検出 → 計測 → 送信 の各ステージを有界キューでつないだ
+        ワーカースレッドで並行実行し、定期的にステージ統計をログ出力します。
+        """
+        pipeline_config = self.config.get("pipeline", {})
+        stats_interval = pipeline_config.get("stats_interval", 10.0)
+
+        self.pipeline = Pipeline(
+            [
+                ("capture", self.instrument("capture", self._capture_owned_frame)),
+                ("detect", self.instrument("detect", self.detect_hands)),
+                ("measure", self.instrument("measure", self.measure_joints)),
+                ("send", self.instrument("send", self.send_measurements)),
+            ],
+            queue_size=pipeline_config.get("queue_size", 2),
+            backpressure=pipeline_config.get("backpressure", "drop_oldest")
+        )
+
+        self.logger.info("Starting pipelined main loop...")
+        self.running = True
+        self.pipeline.start()
 
+        last_report = time.monotonic()
+        try:
+            while self.running:
+                time.sleep(0.1)
+                if time.monotonic() - last_report >= stats_interval:
+                    self.logger.info("Pipeline stats", extra={"pipeline": self.pipeline.get_stats()})
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            self.logger.info("Keyboard interrupt received")
+        finally:
+            self.pipeline.stop()
+            self.logger.info("Pipeline stats", extra={"pipeline": self.pipeline.get_stats()})
+
+        self.logger.info("Main loop ended")
+
+    def run_multi_camera(self):
+        """
+        マルチカメラモードでメインループを実行
+
+        各カメラのワーカープロセスが検出した結果を1本のストリームとして受け取り、
+        camera_id付きで計測・送信します。全ワーカーが終了するとループを抜けます。
+        ワーカー側の取得・検出の処理時間は結果の"timings"から記録します。
+        """
+        self.logger.info("Starting multi-camera main loop...")
+        self.running = True
+
+        measure_joints = self.instrument("measure", self.measure_joints)
+        send_measurements = self.instrument("send", self.send_measurements)
+        worker_stages = {}
+        if self.metrics is not None:
+            worker_stages = {stage: self._stage_histogram(stage) for stage in ("capture", "detect")}
+
+        while self.running and self.source.is_running():
+            try:
+                result = self.source.get_result(timeout=0.5)
+                if result is None:
+                    continue
+                if self.fps_meter is not None:
+                    self.fps_meter.tick()
+                for stage, seconds in result.get("timings", {}).items():
+                    if stage in worker_stages:
+                        worker_stages[stage].observe(seconds)
+
+                detection_result = result["detection"]
+                if self.recorder is not None:
+                    self.recorder.record(detection_result, result["frame_number"], result["camera_id"])
                 if detection_result["hand_count"] == 0:
-                    # 手が検出されなければスキップ
                     continue
 
-                self.logger.debug(
-                    f"Detected {detection_result['hand_count']} hand(s)"
-                )
+                item = measure_joints({
+                    "camera_id": result["camera_id"],
+                    "frame_number": result["frame_number"],
+                    "capture_time": result.get("capture_time", time.monotonic()),
+                    "detection": detection_result
+                })
+                send_measurements(item)
 
-                # 3. 各手について距離計測
-                all_measurements = []
-                for hand in detection_result["hands"]:
-                    landmarks = hand["landmarks"]
+            except KeyboardInterrupt:
+                self.logger.info("Keyboard interrupt received")
+                break
+            except Exception as e:
+                self.logger.error(f"Error in main loop: {e}", exc_info=True)
+                continue
+
+        self.logger.info("Main loop ended")
 
-                    # 距離計算
-                    measurements = self.measurement.calculate_distances(landmarks)
+    def run_detector_pool(self):
+        """
+        検出プールモードでメインループを実行
 
-                    all_measurements.append({
-                        "hand_id": len(all_measurements),
-                        "label": hand["label"],
-                        "joints": measurements["measurements"]
-                    })
+        取得スレッドがフレームをプールに渡し続け、メインスレッドはワーカーの結果を
+        フレームの順番どおりに受け取って計測・送信します。検出ケイデンスと
+        トラッキングはこのモードでは使いません。
+        ワーカー側の検出の処理時間は結果と一緒に受け取って記録します。
+        """
+        self.logger.info("Starting detector pool main loop...")
+        self.running = True
 
-                # 4. データ送信
-                data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "frame_number": frame_count,
-                    "hand_data": {
-                        "hand_count": detection_result["hand_count"],
-                        "measurements": all_measurements
-                    }
-                }
-
-                if not self.sender.send_data(data):
-                    self.logger.warning("Failed to send data")
-                else:
-                    self.logger.debug("Data sent successfully")
+        measure_joints = self.instrument("measure", self.measure_joints)
+        send_measurements = self.instrument("send", self.send_measurements)
+        detect_histogram = self._stage_histogram("detect") if self.metrics is not None else None
+
+        feeder = threading.Thread(target=self._feed_detector_pool, name="detector-pool-feeder", daemon=True)
+        feeder.start()
+
+        while self.running:
+            try:
+                result = self.detector_pool.get_result(timeout=0.5)
+                if result is None:
+                    continue
+                item, detection_result, detect_seconds = result
+                if detect_histogram is not None and detect_seconds is not None:
+                    detect_histogram.observe(detect_seconds)
+                if detection_result is None:
+                    continue
+                if self.recorder is not None:
+                    self.recorder.record(detection_result, item["frame_number"])
+                if detection_result["hand_count"] == 0:
+                    continue
+
+                item["detection"] = detection_result
+                item = measure_joints(item)
+                send_measurements(item)
 
             except KeyboardInterrupt:
-                # Ctrl+Cでの終了
                 self.logger.info("Keyboard interrupt received")
                 break
             except Exception as e:
                 self.logger.error(f"Error in main loop: {e}", exc_info=True)
-                # エラーが発生しても続行
                 continue
 
+        self.running = False
+        feeder.join(timeout=2.0)
         self.logger.info("Main loop ended")
 
+    def _feed_detector_pool(self):
+        """
+        カメラのフレームを検出プールに渡し続ける（空きスロットがなければ待つ）
+        """
+        capture_frame = self.instrument("capture", self.capture_frame)
+        while self.running:
+            try:
+                item = capture_frame()
+                if item is None:
+                    continue
+                # フレームは共有メモリにコピーされるので、結果と一緒に返すのはメタデータだけ
+                frame = item.pop("frame")
+                if self.detector_pool.submit(frame, item, timeout=0.5) is None:
+                    self.detector_pool_dropped += 1
+                    if self.detector_pool_dropped == 1 or self.detector_pool_dropped % 100 == 0:
+                        self.logger.warning(
+                            f"Detector pool busy, dropped frame {item['frame_number']} "
+                            f"({self.detector_pool_dropped} dropped)"
+                        )
+            except Exception as e:
+                self.logger.error(f"Error feeding detector pool: {e}", exc_info=True)
+                time.sleep(0.01)
+
+    def instrument(self, stage: str, func):
+        """
+        ステージ関数を計測付きでラップ
+
+        メトリクスが無効な場合は関数をそのまま返すため、オーバーヘッドはありません。
+
+        Args:
+            stage (str): ステージ名（メトリクスのstageラベル）
+            func: ステージ関数
+
+        Returns:
+            処理時間をステージのヒストグラムに記録する関数
+        """
+        if self.metrics is None:
+            return func
+
+        histogram = self._stage_histogram(stage)
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                histogram.observe(clock() - start)
+
+        return timed
+
+    def _stage_histogram(self, stage: str):
+        """
+        ステージの処理時間のヒストグラムを返す
+
+        Args:
+            stage (str): ステージ名（メトリクスのstageラベル）
+
+        Returns:
+            Histogram: ステージのヒストグラム
+        """
+        return self.metrics.histogram(
+            STAGE_LATENCY_METRIC, "Processing time per pipeline stage", labels={"stage": stage}
+        )
+
+    def start_metrics_server(self) -> bool:
+        """
+        メトリクスを登録し、Prometheus形式のエンドポイントを起動
+
+        キューの深さ・ドロップ数・送信失敗数などは各モジュールの統計を
+        スクレイプ時に読み出します。
+
+        Returns:
+            bool: 起動成功でTrue
+        """
+        metrics_config = self.config.get("metrics", {})
+        registry = self.metrics
+
+        registry.register_callback(
+            "hand_tracker_fps", "gauge", "Frames processed per second", self.fps_meter.value
+        )
+        registry.register_callback(
+            "hand_tracker_frames_total", "counter", "Frames captured", self._frames_total
+        )
+        registry.register_callback(
+            "hand_tracker_queue_depth", "gauge", "Items waiting in internal queues", self._queue_depths
+        )
+        registry.register_callback(
+            "hand_tracker_dropped_frames_total", "counter", "Frames dropped by queue or buffer",
+            self._dropped_frames
+        )
+        registry.register_callback(
+            "hand_tracker_send_failures_total", "counter", "Requests that failed after all retries",
+            lambda: self.sender.get_stats()["send_failures"]
+        )
+        registry.register_callback(
+            "hand_tracker_send_retries_total", "counter", "Send retries",
+            lambda: self.sender.get_stats()["retries"]
+        )
+        if self.detector_pool is not None:
+            registry.register_callback(
+                "hand_tracker_detector_pool_errors_total", "counter",
+                "Frames the detector pool workers failed to detect",
+                lambda: self.detector_pool.stats["errors"]
+            )
+
+        self.metrics_server = MetricsServer(
+            registry,
+            host=metrics_config.get("host", "127.0.0.1"),
+            port=metrics_config.get("port", 9100)
+        )
+        if not self.metrics_server.start():
+            self.logger.warning("Metrics endpoint not available")
+            self.metrics_server = None
+            return False
+        self.logger.info(
+            f"Metrics endpoint at http://{self.metrics_server.host}:{self.metrics_server.port}/metrics"
+        )
+        return True
+
+    def _frames_total(self) -> int:
+        if self.source is not None:
+            return sum(self.source.frames_received.values())
+        return self.frame_count
+
+    def _queue_depths(self):
+        depths = []
+        if self.pipeline is not None:
+            for name, stats in self.pipeline.get_stats().items():
+                if name != "capture":
+                    depths.append(({"queue": name}, stats["queue_depth"]))
+        if self.sender.async_send:
+            depths.append(({"queue": "send_async"}, self.sender.get_stats()["queue_depth"]))
+        if self.sender.transport is not None:
+            depths.append(({"queue": "websocket"}, self.sender.transport.pending()))
+        if self.sender.spool is not None:
+            depths.append(({"queue": "spool"}, self.sender.get_stats()["spool_depth"]))
+        if self.detector_pool is not None:
+            depths.append(({"queue": "detector_pool"}, self.detector_pool.pending()))
+        return depths
+
+    def _dropped_frames(self):
+        dropped = []
+        if self.camera is not None and getattr(self.camera, "threaded", False) is True:
+            dropped.append(({"where": "camera"}, self.camera.get_stats()["dropped"]))
+        if self.pipeline is not None:
+            for name, stats in self.pipeline.get_stats().items():
+                if name != "capture":
+                    dropped.append(({"where": name}, stats["dropped"]))
+        dropped.append(({"where": "send_async"}, self.sender.get_stats()["dropped"]))
+        if self.sender.transport is not None:
+            dropped.append(({"where": "websocket"}, self.sender.transport.stats["dropped"]))
+        if self.sender.spool is not None:
+            dropped.append(({"where": "spool"}, self.sender.get_stats()["spool_evicted"]))
+        if self.detector_pool is not None:
+            dropped.append(({"where": "detector_pool"}, self.detector_pool_dropped))
+        return dropped
+
+    def capture_frame(self) -> Optional[Dict]:
+        """
+        カメラから1フレーム取得
+
+        スレッドモードのカメラでは、グラバーが付けた連番と取得時刻をそのまま使います
+        （渡した時刻ではなく、カメラから読み出した時刻）。
+
+        Returns:
+            Optional[Dict]: {"frame_number": int, "frame": np.ndarray, "capture_time": float,
+                "captured_at": float, "capture_seq": Optional[int]}、失敗時None
+                （capture_timeは単調時計の秒、captured_atはUNIX秒、
+                capture_seqはスレッドモードでのカメラ側の連番）
+        """
+        if getattr(self.camera, "threaded", False) is True:
+            success, frame, capture_seq, captured_at = self.camera.read_latest()
+            # グラバーの時刻はUNIX秒なので、取得してからの経過分だけ単調時計を戻す
+            capture_time = time.monotonic() - max(0.0, time.time() - captured_at)
+        else:
+            success, frame = self.camera.get_frame()
+            capture_seq = None
+            captured_at = time.time()
+            capture_time = time.monotonic()
+        if not success:
+            self.logger.warning("Failed to get frame")
+            return None
+
+        self.frame_count += 1
+        if self.frame_count == 1:
+            self.logger.info(f"First frame captured {self.startup.elapsed() * 1000:.1f}ms after start")
+        if self.fps_meter is not None:
+            self.fps_meter.tick()
+        return {
+            "frame_number": self.frame_count,
+            "frame": frame,
+            "capture_time": capture_time,
+            "captured_at": captured_at,
+            "capture_seq": capture_seq,
+        }
+
+    def _capture_owned_frame(self) -> Optional[Dict]:
+        """
+        パイプライン用のフレーム取得
+
+        スレッドモードやバッファ再利用モードのカメラは上書きされるバッファを返すため、
+        後段のスレッドに渡す前にコピーしてから返します。
+
+        Returns:
+            Optional[Dict]: capture_frame()と同じ形式
+        """
+        item = self.capture_frame()
+        if item is not None and (getattr(self.camera, "threaded", False) is True
+                                 or getattr(self.camera, "reuse_buffers", False) is True):
+            item["frame"] = item["frame"].copy()
+        return item
+
+    def detect_hands(self, item: Dict) -> Optional[Dict]:
+        """
+        フレームから手を検出
+
+        Args:
+            item (Dict): capture_frame()の出力
+
+        Returns:
+            Optional[Dict]: "detection"を追加したitem、手がない・検出を省略した場合はNone
+        """
+        capture_time = item.get("capture_time", time.monotonic())
+        if (self.tracker is not None and self.tracker.tracks
+                and (item["frame_number"] - 1) % self.detect_every):
+            # 検出を省略するフレームは追跡中の手の位置を予測する
+            detection_result = self.tracker.predict(capture_time)
+        else:
+            if self.cadence is not None and not self.cadence.should_detect(item["frame"]):
+                return None
+
+            if self.autotuner is not None:
+                start = time.perf_counter()
+                detection_result = self.detector.detect(item["frame"])
+                self.autotuner.observe(time.perf_counter() - start)
+            else:
+                detection_result = self.detector.detect(item["frame"])
+            if self.recorder is not None:
+                self.recorder.record(detection_result, item["frame_number"])
+            if self.cadence is not None:
+                self.cadence.update(detection_result["hand_count"])
+            if self.tracker is not None:
+                self.tracker.update(detection_result, capture_time)
+
+        if detection_result["hand_count"] == 0:
+            return None
+
+        self.logger.debug(
+            f"Detected {detection_result['hand_count']} hand(s)"
+        )
+        item["detection"] = detection_result
+        return item
+
+    def measure_joints(self, item: Dict) -> Dict:
+        """
+        検出された各手の関節距離を計測し、送信データを組み立てる
+
+        Args:
+            item (Dict): detect_hands()の出力
+
+        Returns:
+            Dict: "data"（送信ペイロード）を追加したitem
+        """
+        detection_result = item["detection"]
+
+        hands = detection_result["hands"]
+        hand_ids = self.assign_hand_ids(item)
+        if self.smoothing_config is not None:
+            self.smooth_landmarks(item)
+
+        # 全ての手の距離を一括計算
+        hand_measurements = self.measurement.calculate_distances_for_hands(
+            [hand["landmarks"] for hand in hands]
+        )
+
+        all_measurements = []
+        for hand, hand_id, measurements in zip(hands, hand_ids, hand_measurements):
+            landmarks = hand["landmarks"]
+            hand_entry = {
+                "hand_id": hand_id,
+                "label": hand["label"],
+                "joints": measurements["measurements"]
+            }
+            if hand.get("predicted"):
+                hand_entry["predicted"] = True
+            if self.include_landmarks:
+                hand_entry["landmarks"] = landmarks
+            all_measurements.append(hand_entry)
+
+        item["data"] = {
+            "timestamp": datetime.now().isoformat(),
+            "frame_number": item["frame_number"],
+            "hand_data": {
+                "hand_count": detection_result["hand_count"],
+                "measurements": all_measurements
+            }
+        }
+        if "camera_id" in item:
+            item["data"]["camera_id"] = item["camera_id"]
+        return item
+
+    def assign_hand_ids(self, item: Dict) -> List[int]:
+        """
+        検出された手にフレームをまたいで安定したhand_idを割り当てる
+
+        Args:
+            item (Dict): detect_hands()の出力（各手に "hand_id" と "track_age" を書き込む）
+
+        Returns:
+            List[int]: 手ごとのhand_id
+        """
+        hands = item["detection"]["hands"]
+        if HandIdentityTracker is None:
+            return list(range(len(hands)))
+
+        camera_id = item.get("camera_id")
+        identities = self.hand_ids.get(camera_id)
+        if identities is None:
+            identities = HandIdentityTracker(self.config.get("hand_ids", {}))
+            self.hand_ids[camera_id] = identities
+        return identities.assign(hands, item.get("capture_time", time.monotonic()))
+
+    def smooth_landmarks(self, item: Dict):
+        """
+        検出された手のランドマークをその場で平滑化
+
+        フィルタの状態はhand_idごとに持つため、assign_hand_ids()の後に呼びます。
+
+        Args:
+            item (Dict): detect_hands()の出力（"detection"の各手のランドマークを書き換える）
+        """
+        camera_id = item.get("camera_id")
+        smoother = self.smoothers.get(camera_id)
+        if smoother is None:
+            smoother = LandmarkSmoother(self.smoothing_config)
+            self.smoothers[camera_id] = smoother
+
+        hands = item["detection"]["hands"]
+        arrays = []
+        slots = []
+        for hand in hands:
+            slot = hand.get("hand_id", -1)
+            if not 0 <= slot < smoother.max_hands:
+                continue
+            if not isinstance(hand["landmarks"], HandLandmarks):
+                hand["landmarks"] = HandLandmarks.from_list(hand["landmarks"])
+            arrays.append(hand["landmarks"].array)
+            slots.append(slot)
+
+        timestamp = item.get("capture_time", time.monotonic())
+        smoother.smooth(arrays, slots, timestamp)
+
+    def send_measurements(self, item: Dict) -> Dict:
+        """
+        計測データを送信
+
+        Args:
+            item (Dict): measure_joints()の出力
+
+        Returns:
+            Dict: 入力のitem
+        """
+        if not self.sender.send_data(item["data"]):
+            self.logger.warning("Failed to send data")
+        else:
+            self.logger.debug("Data sent successfully")
+        return item
+
     def run(self):
         """
         アプリケーションを実行
@@ -287,6 +1048,8 @@ class HandTrackingApp:
 
         if not self.initialize():
             self.logger.error("Initialization failed, exiting")
+            # 起動済みのカメラやワーカーを止め、読み込み中のモデルを待ってから終了する
+            self.cleanup()
             sys.exit(1)
 
         try:
@@ -319,6 +1082,28 @@ class HandTrackingApp:
         """
         self.logger.info("Cleaning up resources...")
 
+        # 起動に失敗したときはモデルの読み込みがまだ動いていることがある
+        self._startup_cancelled.set()
+        if self._model_load_thread is not None and self._model_load_thread.is_alive():
+            self._model_load_thread.join(timeout=2.0)
+
+        if self.metrics_server:
+            self.metrics_server.stop()
+
+        if self.source:
+            try:
+                self.source.stop()
+                self.logger.info("Camera workers stopped")
+            except Exception as e:
+                self.logger.error(f"Error stopping camera workers: {e}")
+
+        if self.detector_pool:
+            try:
+                self.detector_pool.stop()
+                self.logger.info("Detector workers stopped")
+            except Exception as e:
+                self.logger.error(f"Error stopping detector workers: {e}")
+
         if self.camera:
             try:
                 self.camera.stop()
@@ -333,6 +1118,13 @@ class HandTrackingApp:
             except Exception as e:
                 self.logger.error(f"Error disconnecting sender: {e}")
 
+        if self.recorder:
+            try:
+                self.recorder.close()
+                self.logger.info(f"Recording saved: {self.recorder.path}")
+            except Exception as e:
+                self.logger.error(f"Error closing recording: {e}")
+
         self.logger.info("Cleanup complete")
 
 
@@ -353,6 +1145,11 @@ def main():
         default="config.yaml",
         help="Path to configuration file (default: config.yaml)"
     )
+    parser.add_argument(
+        "--warmup",
+        action="store_true",
+        help="Run dummy inference before the first frame (overrides startup.warmup)"
+    )
     args = parser.parse_args()
 
     # 設定ファイルの存在確認
@@ -361,7 +1158,7 @@ def main():
         sys.exit(1)
 
     # アプリケーション起動
-    app = HandTrackingApp(config_path=args.config)
+    app = HandTrackingApp(config_path=args.config, warmup=True if args.warmup else None)
     app.run()
 
 
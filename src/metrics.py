@@ -0,0 +1,395 @@
+"""
+Metrics Module
+低オーバーヘッドの計測と、Prometheusテキスト形式のメトリクスエンドポイント
+
+ホットパスでは単調時計（time.perf_counter）で測った秒数を事前確保した
+ヒストグラムのバケットに数えるだけにし、文字列の組み立てはスクレイプ時にだけ
+行います。キューの深さや送信失敗数のように他のモジュールが既に持っている値は、
+スクレイプ時に呼ばれるコールバックとして登録します。
+
+    registry = MetricsRegistry()
+    detect = registry.histogram("hand_tracker_stage_latency_seconds",
+                                "Stage latency", labels={"stage": "detect"})
+    start = time.perf_counter()
+    ...
+    detect.observe(time.perf_counter() - start)
+
+    server = MetricsServer(registry, port=9100)
+    server.start()  # GET http://localhost:9100/metrics
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# 1ms〜1sのレイテンシ向けバケット上限（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    """
+    単調増加するカウンタ
+    """
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """
+    任意に上下する値
+    """
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram:
+    """
+    固定バケットのヒストグラム
+
+    バケットのカウント配列は生成時に確保し、observe()では
+    二分探索と加算しか行いません。
+
+    Attributes:
+        buckets (Tuple[float, ...]): バケット上限（昇順、+Infは暗黙）
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        ヒストグラムの初期化
+
+        Args:
+            buckets (Iterable[float]): バケット上限
+
+        Raises:
+            ValueError: バケットが空、または昇順でない場合
+        """
+        self.buckets = tuple(float(b) for b in buckets)
+        if not self.buckets or list(self.buckets) != sorted(set(self.buckets)):
+            raise ValueError("Histogram buckets must be non-empty and strictly increasing")
+        # 最後の要素は+Infバケット
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        値を1件記録
+
+        Args:
+            value (float): 観測値（レイテンシなら秒）
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """
+        現在の値を取得
+
+        Returns:
+            Tuple[List[int], float, int]: (累積バケットカウント（+Inf含む）, 合計, 件数)
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return cumulative, total, running
+
+
+class RateMeter:
+    """
+    直近の区間のイベントレート（FPSなど）を測るクラス
+
+    tick()の回数を数え、window秒ごとにレートを更新します。
+
+    Attributes:
+        window (float): レートを更新する間隔（秒）
+        rate (float): 直近の区間のレート（回/秒）
+    """
+
+    def __init__(self, window: float = 1.0):
+        self.window = window
+        self.rate = 0.0
+        self._count = 0
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tick(self, count: int = 1):
+        with self._lock:
+            self._count += count
+            now = time.monotonic()
+            elapsed = now - self._start
+            if elapsed >= self.window:
+                self.rate = self._count / elapsed
+                self._count = 0
+                self._start = now
+
+    def value(self) -> float:
+        """
+        スクレイプ時のレート（区間が止まっていれば0に落ちる）
+
+        Returns:
+            float: 回/秒
+        """
+        with self._lock:
+            if time.monotonic() - self._start >= 2 * self.window:
+                return 0.0
+            return self.rate
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels)
+    if extra is not None:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Family:
+    """
+    同じ名前・型のメトリクスをラベルごとにまとめたもの
+    """
+
+    def __init__(self, name: str, kind: str, help_text: str, factory: Optional[Callable] = None,
+                 callback: Optional[Callable] = None):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.factory = factory
+        self.callback = callback
+        self.children: Dict[Tuple[Tuple[str, str], ...], object] = {}
+
+
+class MetricsRegistry:
+    """
+    メトリクスの登録とPrometheusテキスト形式への書き出し
+
+    同じ名前・ラベルで再度取得すると同じインスタンスを返します。
+    """
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _child(self, name: str, kind: str, help_text: str, labels: Optional[Dict[str, str]],
+               factory: Callable):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = _Family(name, kind, help_text, factory=factory)
+                self._families[name] = family
+            elif family.kind != kind or family.callback is not None:
+                raise ValueError(f"Metric {name} is already registered as {family.kind}")
+            child = family.children.get(key)
+            if child is None:
+                child = family.factory()
+                family.children[key] = child
+            return child
+
+    def counter(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> Counter:
+        """
+        カウンタを取得（なければ作成）
+
+        Args:
+            name (str): メトリクス名
+            help_text (str): HELP行の説明
+            labels (Optional[Dict[str, str]]): ラベル
+
+        Returns:
+            Counter: カウンタ
+        """
+        return self._child(name, "counter", help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> Gauge:
+        """
+        ゲージを取得（なければ作成）
+
+        Args:
+            name (str): メトリクス名
+            help_text (str): HELP行の説明
+            labels (Optional[Dict[str, str]]): ラベル
+
+        Returns:
+            Gauge: ゲージ
+        """
+        return self._child(name, "gauge", help_text, labels, Gauge)
+
+    def histogram(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None,
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        ヒストグラムを取得（なければ作成）
+
+        Args:
+            name (str): メトリクス名
+            help_text (str): HELP行の説明
+            labels (Optional[Dict[str, str]]): ラベル
+            buckets (Iterable[float]): バケット上限（同じ名前では最初の指定が使われる）
+
+        Returns:
+            Histogram: ヒストグラム
+        """
+        buckets = tuple(buckets)
+        return self._child(name, "histogram", help_text, labels, lambda: Histogram(buckets))
+
+    def register_callback(self, name: str, kind: str, help_text: str, callback: Callable):
+        """
+        スクレイプ時に値を取得するメトリクスを登録
+
+        Args:
+            name (str): メトリクス名
+            kind (str): "counter" または "gauge"
+            help_text (str): HELP行の説明
+            callback (Callable): 値（float）、または (ラベル辞書, 値) のリストを返す関数
+
+        Raises:
+            ValueError: 型が不正、または名前が登録済みの場合
+        """
+        if kind not in ("counter", "gauge"):
+            raise ValueError(f"Unsupported callback metric type: {kind}")
+        with self._lock:
+            if name in self._families:
+                raise ValueError(f"Metric {name} is already registered")
+            self._families[name] = _Family(name, kind, help_text, callback=callback)
+
+    def render(self) -> str:
+        """
+        全メトリクスをPrometheusテキスト形式で書き出す
+
+        Returns:
+            str: エクスポジション形式のテキスト
+        """
+        with self._lock:
+            families = list(self._families.values())
+
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help_text}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+
+            if family.callback is not None:
+                try:
+                    result = family.callback()
+                except Exception as e:
+                    lines.append(f"# ERROR {family.name}: {e}")
+                    continue
+                if isinstance(result, (int, float)):
+                    samples = [({}, result)]
+                else:
+                    samples = result
+                for labels, value in samples:
+                    label_key = tuple(sorted(labels.items()))
+                    lines.append(f"{family.name}{_format_labels(label_key)} {_format_value(value)}")
+                continue
+
+            for label_key, child in list(family.children.items()):
+                if family.kind == "histogram":
+                    cumulative, total, count = child.snapshot()
+                    for bound, value in zip(child.buckets + (float("inf"),), cumulative):
+                        le = ("le", _format_value(bound))
+                        lines.append(f"{family.name}_bucket{_format_labels(label_key, le)} {value}")
+                    lines.append(f"{family.name}_sum{_format_labels(label_key)} {_format_value(total)}")
+                    lines.append(f"{family.name}_count{_format_labels(label_key)} {count}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(label_key)} {_format_value(child.value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    /metrics をPrometheusテキスト形式で返すローカルHTTPサーバー
+
+    Attributes:
+        registry (MetricsRegistry): 公開するレジストリ
+        host (str): バインドするアドレス
+        port (int): ポート（0なら空きポート）
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """
+        バックグラウンドスレッドでサーバーを起動
+
+        Returns:
+            bool: 起動成功でTrue
+        """
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"Error: Failed to start metrics server on {self.host}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """
+        サーバーを停止
+        """
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
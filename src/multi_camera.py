@@ -0,0 +1,264 @@
+"""
+Multi-Camera Module
+複数カメラの取得と手検出をカメラごとのワーカープロセスで並列実行
+
+各ワーカープロセスが自分のCameraCaptureとHandDetectorを持ち、検出結果
+（ランドマークのみ。フレーム画像はプロセス間で送らない）を共通のキューに
+流します。メインプロセスはcamera_id付きの1本のストリームとして受け取ります。
+device_idには動画ファイルのパスも指定できるため、物理カメラなしでテストできます。
+"""
+
+import multiprocessing as mp
+import queue
+import time
+from typing import Dict, List, Optional
+
+
+def _camera_worker(camera_id, camera_config: dict, detection_config: dict,
+                   result_queue, stop_event, max_failures: int,
+                   cadence_config: Optional[dict] = None,
+                   autotune_config: Optional[dict] = None,
+                   warmup_frames: int = 0):
+    """
+    1台のカメラの取得 → 検出を行うワーカープロセス本体
+
+    Args:
+        camera_id: カメラID
+        camera_config (dict): CameraCaptureの設定
+        detection_config (dict): HandDetectorの設定
+        result_queue: 結果を流すmultiprocessing.Queue
+        stop_event: 停止用のmultiprocessing.Event
+        max_failures (int): 連続でフレーム取得に失敗したら終了する回数
+        cadence_config (Optional[dict]): 検出ケイデンスの設定（Noneなら毎フレーム検出）
+        autotune_config (Optional[dict]): 検出の自動調整の設定（Noneなら調整しない）
+        warmup_frames (int): 最初のフレームの前に行うダミーの検出の回数
+    """
+    # 重いモジュールはワーカープロセス内でだけ読み込む
+    try:
+        from .camera_capture import CameraCapture
+        from .hand_detector import HandDetector
+        from .cadence import CadenceController
+        from .autotune import DetectionAutotuner
+    except ImportError:
+        from camera_capture import CameraCapture
+        from hand_detector import HandDetector
+        from cadence import CadenceController
+        from autotune import DetectionAutotuner
+
+    camera = CameraCapture(camera_config)
+    detector = None
+    error = None
+    frame_number = 0
+    try:
+        if not camera.start():
+            error = f"Failed to start camera {camera_id}"
+            return
+        detector = HandDetector(detection_config)
+        if warmup_frames > 0:
+            detector.warmup(camera_config.get("width", 1280), camera_config.get("height", 720),
+                            warmup_frames)
+        cadence = CadenceController(cadence_config) if cadence_config else None
+        autotuner = DetectionAutotuner(detector, autotune_config) if autotune_config else None
+
+        failures = 0
+        while not stop_event.is_set():
+            capture_start = time.perf_counter()
+            if camera.threaded:
+                # グラバーが読み出した時刻を使う
+                success, frame, _, captured_at = camera.read_latest()
+            else:
+                success, frame = camera.get_frame()
+                captured_at = time.time()
+            capture_seconds = time.perf_counter() - capture_start
+            if not success:
+                failures += 1
+                if failures >= max_failures:
+                    # ファイルの終端、またはデバイスの切断
+                    break
+                continue
+            failures = 0
+            frame_number += 1
+            capture_time = time.monotonic() - max(0.0, time.time() - captured_at)
+
+            if cadence is not None and not cadence.should_detect(frame):
+                continue
+            start = time.perf_counter()
+            detection = detector.detect(frame)
+            detect_seconds = time.perf_counter() - start
+            if autotuner is not None:
+                autotuner.observe(detect_seconds)
+            if cadence is not None:
+                cadence.update(detection["hand_count"])
+            item = {
+                "camera_id": camera_id,
+                "frame_number": frame_number,
+                "captured_at": captured_at,
+                "capture_time": capture_time,
+                "detection": detection,
+                # ステージの処理時間（秒）。メトリクスはメインプロセス側で記録する
+                "timings": {"capture": capture_seconds, "detect": detect_seconds},
+            }
+            # キューが空くまで待つ（停止要求があれば諦める）
+            while not stop_event.is_set():
+                try:
+                    result_queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+    except Exception as e:
+        error = f"Camera worker {camera_id} failed: {e}"
+    finally:
+        camera.stop()
+        if detector is not None:
+            detector.hands.close()
+        # 終了通知（detectionがNone）
+        result_queue.put({
+            "camera_id": camera_id,
+            "frame_number": frame_number,
+            "detection": None,
+            "error": error,
+        })
+
+
+class MultiCameraSource:
+    """
+    複数カメラの検出結果を1本のストリームにまとめるソース
+
+    Attributes:
+        camera_configs (List[dict]): カメラごとの設定（camera_idを含む）
+        detection_config (dict): 全カメラ共通の手検出設定
+        frames_received (Dict): camera_id → 受信した結果数
+    """
+
+    def __init__(self, camera_configs: List[dict], detection_config: dict,
+                 config: Optional[dict] = None):
+        """
+        マルチカメラソースの初期化
+
+        Args:
+            camera_configs (List[dict]): カメラごとの設定
+                - camera_id: ストリームに付けるカメラID（省略時はリストの位置）
+                - その他はCameraCaptureの設定（device_idに動画ファイルのパスも可）
+            detection_config (dict): 手検出設定
+            config (Optional[dict]): マルチカメラ設定
+                - start_method: プロセス起動方式 (default: "spawn")
+                - queue_size: 結果キューの上限 (default: カメラ数 × 4)
+                - max_failures: ワーカーを終了する連続取得失敗回数 (default: 30)
+                - cadence: カメラごとの検出ケイデンス設定（省略時は毎フレーム検出）
+                - autotune: カメラごとの検出の自動調整設定（省略時は調整しない）
+                - warmup_frames: 各ワーカーが最初のフレームの前に行うダミーの検出の回数 (default: 0)
+        """
+        config = config or {}
+        self.camera_configs = [
+            dict(camera_config, camera_id=camera_config.get("camera_id", index))
+            for index, camera_config in enumerate(camera_configs)
+        ]
+        self.detection_config = detection_config
+        self.max_failures = config.get("max_failures", 30)
+        self.cadence_config = config.get("cadence")
+        self.autotune_config = config.get("autotune")
+        self.warmup_frames = config.get("warmup_frames", 0)
+        self._context = mp.get_context(config.get("start_method", "spawn"))
+        self._queue_size = config.get("queue_size", len(self.camera_configs) * 4)
+        self._result_queue = None
+        self._stop_event = None
+        self._processes: Dict = {}
+        self._active = set()
+        self.frames_received: Dict = {}
+        self.errors: Dict = {}
+
+    def start(self) -> bool:
+        """
+        カメラごとのワーカープロセスを起動
+
+        Returns:
+            bool: 1台以上のカメラ設定があり起動できた場合True
+        """
+        if not self.camera_configs:
+            print("Error: No cameras configured")
+            return False
+
+        self._result_queue = self._context.Queue(maxsize=self._queue_size)
+        self._stop_event = self._context.Event()
+        for camera_config in self.camera_configs:
+            camera_id = camera_config["camera_id"]
+            process = self._context.Process(
+                target=_camera_worker,
+                args=(camera_id, camera_config, self.detection_config,
+                      self._result_queue, self._stop_event, self.max_failures,
+                      self.cadence_config, self.autotune_config, self.warmup_frames),
+                name=f"camera-worker-{camera_id}",
+                daemon=True
+            )
+            process.start()
+            self._processes[camera_id] = process
+            self._active.add(camera_id)
+            self.frames_received[camera_id] = 0
+        return True
+
+    def get_result(self, timeout: float = 1.0) -> Optional[Dict]:
+        """
+        いずれかのカメラの検出結果を1件取得
+
+        Args:
+            timeout (float): 結果を待つ最大秒数
+
+        Returns:
+            Optional[Dict]: {"camera_id", "frame_number", "captured_at", "capture_time", "detection"}、
+                タイムアウトまたは全ワーカー終了時はNone
+        """
+        deadline = time.monotonic() + timeout
+        while self._active:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                item = self._result_queue.get(timeout=remaining)
+            except queue.Empty:
+                return None
+
+            camera_id = item["camera_id"]
+            if item["detection"] is None:
+                # ワーカーの終了通知
+                self._active.discard(camera_id)
+                if item.get("error"):
+                    self.errors[camera_id] = item["error"]
+                    print(f"Error: {item['error']}")
+                continue
+
+            self.frames_received[camera_id] += 1
+            return item
+        return None
+
+    def is_running(self) -> bool:
+        """
+        動作中のワーカーがあるか確認
+
+        Returns:
+            bool: 終了通知を受けていないワーカーがあればTrue
+        """
+        return bool(self._active)
+
+    def stop(self, timeout: float = 5.0):
+        """
+        全ワーカープロセスを停止
+
+        Args:
+            timeout (float): プロセスごとの待機秒数
+        """
+        if self._stop_event is None:
+            return
+        self._stop_event.set()
+
+        # ワーカーがキューへのputで止まらないよう、終了通知まで読み捨てる
+        deadline = time.monotonic() + timeout
+        while self._active and time.monotonic() < deadline:
+            self.get_result(timeout=0.1)
+
+        for process in self._processes.values():
+            process.join(timeout=max(0.1, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+        self._processes = {}
+        self._active = set()
+        self._stop_event = None
@@ -0,0 +1,282 @@
+"""
+Pipeline Executor Module
+ステージごとにワーカースレッドを持つパイプライン実行エンジン
+
+各ステージは有界キューでつながり、スループットは全ステージの合計ではなく
+最も遅いステージで決まります。キューが満杯のときの挙動（バックプレッシャー）は
+"drop_oldest"（古い要素を捨てる）と "block"（空くまで待つ）から選択できます。
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+BACKPRESSURE_POLICIES = ("drop_oldest", "block")
+
+
+class BoundedQueue:
+    """
+    バックプレッシャーポリシー付きの有界キュー
+
+    Attributes:
+        maxsize (int): 最大要素数
+        policy (str): 満杯時のポリシー ("drop_oldest" or "block")
+        dropped (int): drop_oldestで捨てられた要素数
+    """
+
+    def __init__(self, maxsize: int, policy: str = "drop_oldest"):
+        """
+        キューの初期化
+
+        Args:
+            maxsize (int): 最大要素数（1以上）
+            policy (str): 満杯時のポリシー
+
+        Raises:
+            ValueError: 未知のポリシーが指定された場合
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+
+    def put(self, item: Any, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        要素を追加
+
+        Args:
+            item: 追加する要素
+            stop_event: blockポリシーで待機中に停止を検知するためのイベント
+
+        Returns:
+            bool: 追加できた場合True（停止により追加できなかった場合False）
+        """
+        with self._cond:
+            if self.policy == "drop_oldest":
+                if len(self._items) >= self.maxsize:
+                    self._items.popleft()
+                    self.dropped += 1
+            else:
+                while len(self._items) >= self.maxsize:
+                    if stop_event is not None and stop_event.is_set():
+                        return False
+                    self._cond.wait(timeout=0.1)
+            self._items.append(item)
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float = 0.1) -> Tuple[bool, Any]:
+        """
+        要素を取り出す
+
+        Args:
+            timeout (float): 要素を待つ最大秒数
+
+        Returns:
+            Tuple[bool, Any]: (取得成功フラグ, 要素)
+        """
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout=timeout)
+                if not self._items:
+                    return False, None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return True, item
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+class PipelineStage:
+    """
+    パイプラインの1ステージ
+
+    funcは前段の出力を受け取り、次段への出力を返します。
+    Noneを返した場合、その要素は次段に渡されません（フィルタ）。
+    先頭ステージ（ソース）のfuncは引数なしで呼ばれます。
+
+    Attributes:
+        name (str): ステージ名
+        func (Callable): 処理関数
+        input_queue (Optional[BoundedQueue]): 入力キュー（ソースはNone）
+    """
+
+    def __init__(self, name: str, func: Callable,
+                 input_queue: Optional[BoundedQueue] = None):
+        """
+        ステージの初期化
+
+        Args:
+            name (str): ステージ名
+            func (Callable): 処理関数
+            input_queue (Optional[BoundedQueue]): 入力キュー
+        """
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.processed = 0
+        self.filtered = 0
+        self.errors = 0
+        self.total_service_time = 0.0
+        self.max_service_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, service_time: float, output: Any = None, error: bool = False):
+        """
+        1要素分の処理結果を記録
+
+        Args:
+            service_time (float): 処理時間（秒）
+            output: 処理結果
+            error (bool): 例外が発生したか
+        """
+        with self._lock:
+            self.processed += 1
+            self.total_service_time += service_time
+            if service_time > self.max_service_time:
+                self.max_service_time = service_time
+            if error:
+                self.errors += 1
+            elif output is None:
+                self.filtered += 1
+
+    def get_stats(self) -> Dict:
+        """
+        ステージの統計を返す
+
+        Returns:
+            Dict: queue_depth, dropped, processed, filtered, errors,
+                avg_service_ms, max_service_ms
+        """
+        with self._lock:
+            avg = self.total_service_time / self.processed if self.processed else 0.0
+            return {
+                "queue_depth": len(self.input_queue) if self.input_queue else 0,
+                "dropped": self.input_queue.dropped if self.input_queue else 0,
+                "processed": self.processed,
+                "filtered": self.filtered,
+                "errors": self.errors,
+                "avg_service_ms": round(avg * 1000, 3),
+                "max_service_ms": round(self.max_service_time * 1000, 3),
+            }
+
+
+class Pipeline:
+    """
+    ステージごとにワーカースレッドを持つパイプライン
+
+    Attributes:
+        stages (List[PipelineStage]): ステージのリスト（先頭がソース）
+        queue_size (int): ステージ間キューの最大要素数
+        backpressure (str): バックプレッシャーポリシー
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable]], queue_size: int = 2,
+                 backpressure: str = "drop_oldest"):
+        """
+        パイプラインの初期化
+
+        Args:
+            stages (List[Tuple[str, Callable]]): (ステージ名, 処理関数) のリスト
+            queue_size (int): ステージ間キューの最大要素数
+            backpressure (str): "drop_oldest" または "block"
+
+        Raises:
+            ValueError: ステージが空、または未知のポリシーの場合
+        """
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.stages: List[PipelineStage] = []
+        for index, (name, func) in enumerate(stages):
+            queue = None if index == 0 else BoundedQueue(queue_size, backpressure)
+            self.stages.append(PipelineStage(name, func, queue))
+
+        self.logger = logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """
+        全ステージのワーカースレッドを起動
+        """
+        self._stop_event.clear()
+        self._threads = []
+        for index, stage in enumerate(self.stages):
+            next_queue = self.stages[index + 1].input_queue if index + 1 < len(self.stages) else None
+            thread = threading.Thread(
+                target=self._run_stage,
+                args=(stage, next_queue),
+                name=f"pipeline-{stage.name}",
+                daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """
+        全ワーカースレッドを停止
+
+        Args:
+            timeout (float): スレッドごとの待機秒数
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def is_running(self) -> bool:
+        """
+        パイプラインが実行中か確認
+
+        Returns:
+            bool: いずれかのワーカーが動作中ならTrue
+        """
+        return any(thread.is_alive() for thread in self._threads)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        ステージごとの統計を返す
+
+        Returns:
+            Dict[str, Dict]: ステージ名 → 統計辞書
+        """
+        return {stage.name: stage.get_stats() for stage in self.stages}
+
+    def _run_stage(self, stage: PipelineStage, next_queue: Optional[BoundedQueue]):
+        """
+        1ステージのワーカーループ
+
+        Args:
+            stage (PipelineStage): 実行するステージ
+            next_queue (Optional[BoundedQueue]): 出力先キュー
+        """
+        while not self._stop_event.is_set():
+            if stage.input_queue is None:
+                args = ()
+            else:
+                ok, item = stage.input_queue.get(timeout=0.1)
+                if not ok:
+                    continue
+                args = (item,)
+
+            start = time.perf_counter()
+            try:
+                output = stage.func(*args)
+            except Exception as e:
+                stage.record(time.perf_counter() - start, error=True)
+                self.logger.error(f"Error in pipeline stage '{stage.name}': {e}", exc_info=True)
+                continue
+            stage.record(time.perf_counter() - start, output)
+
+            if output is not None and next_queue is not None:
+                next_queue.put(output, self._stop_event)
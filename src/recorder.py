@@ -0,0 +1,283 @@
+"""
+Session Recorder Module
+検出した生のランドマークを記録するレコーダーと、記録を再計測するオフラインツール
+
+記録ファイルは16バイトのヘッダと固定長レコード（手1つにつき1レコード）の並びで、
+np.memmapでそのまま構造化配列として読めます。ランドマークの列を
+(N, 21, 3) の配列として取り出し、JointMeasurementの計測をバッチ単位で
+まとめて計算するため、動画をMediaPipeで処理し直さずに新しい関節ペアや
+スケールで過去のデータを計測し直せます。
+
+使い方:
+    python src/recorder.py recordings/session.htr --pairs 0-4 0-8 --scale-factor 25 --output out.npy
+"""
+
+import os
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .joint_measurement import JointMeasurement
+    from .landmarks import NUM_LANDMARKS
+except ImportError:
+    from joint_measurement import JointMeasurement
+    from landmarks import NUM_LANDMARKS
+
+
+MAGIC = b"HTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHH8x")
+
+LABELS = ("Left", "Right")
+UNKNOWN_LABEL = 255
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),          # UNIX時刻（秒）
+    ("frame_number", "<u4"),
+    ("camera_id", "<u2"),
+    ("hand_index", "u1"),          # フレーム内での手の順番
+    ("label", "u1"),               # LABELSのインデックス（不明は255）
+    ("confidence", "<f4"),
+    ("landmarks", "<f4", (NUM_LANDMARKS, 3)),
+])
+
+
+class SessionRecorder:
+    """
+    HandDetector.detect()の結果を記録ファイルに追記するクラス
+
+    レコードは事前確保したバッファに溜め、buffer_size件ごとに1回のwriteで書き込みます。
+
+    Attributes:
+        path (str): 記録ファイルのパス
+        buffer_size (int): まとめて書き込むレコード数
+        records_written (int): 書き込んだレコード数
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1024):
+        """
+        記録ファイルを開く（既存の記録があれば末尾に追記する）
+
+        Args:
+            path (str): 記録ファイルのパス
+            buffer_size (int): まとめて書き込むレコード数
+
+        Raises:
+            ValueError: 既存のファイルが記録ファイルでない場合
+        """
+        self.path = path
+        self.buffer_size = max(1, buffer_size)
+        self.records_written = 0
+        self._buffer = np.zeros(self.buffer_size, dtype=RECORD_DTYPE)
+        self._count = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            _read_header(path)
+            records = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+            self._file = open(path, "r+b")
+            # 書きかけのレコードは捨てる
+            self._file.truncate(HEADER.size + records * RECORD_DTYPE.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+
+    def record(self, detection: Dict, frame_number: int, camera_id: int = 0,
+               timestamp: Optional[float] = None):
+        """
+        1フレームの検出結果を記録
+
+        Args:
+            detection (Dict): HandDetector.detect()の出力
+            frame_number (int): フレーム番号
+            camera_id (int): カメラID
+            timestamp (Optional[float]): UNIX時刻（省略時は現在時刻）
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        for index, hand in enumerate(detection["hands"]):
+            row = self._buffer[self._count]
+            row["timestamp"] = timestamp
+            row["frame_number"] = frame_number
+            row["camera_id"] = camera_id
+            row["hand_index"] = index
+            label = hand.get("label")
+            row["label"] = LABELS.index(label) if label in LABELS else UNKNOWN_LABEL
+            row["confidence"] = hand.get("confidence", 1.0)
+            row["landmarks"] = np.asarray(hand["landmarks"], dtype=np.float32)
+            self._count += 1
+            if self._count == self.buffer_size:
+                self.flush()
+
+    def flush(self):
+        """
+        バッファのレコードをファイルに書き込む
+        """
+        if self._count == 0:
+            return
+        self._file.write(self._buffer[:self._count].tobytes())
+        self._file.flush()
+        self.records_written += self._count
+        self._count = 0
+
+    def close(self):
+        """
+        残りを書き込んでファイルを閉じる
+        """
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+def _read_header(path: str):
+    """
+    ヘッダを検証
+
+    Raises:
+        ValueError: 記録ファイルでない、またはレコード形式が異なる場合
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"Not a recording file: {path}")
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"Not a recording file: {path}")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported recording version {version} (record size {record_size})")
+
+
+def load_recording(path: str) -> np.ndarray:
+    """
+    記録ファイルをメモリマップした構造化配列として開く
+
+    Args:
+        path (str): 記録ファイルのパス
+
+    Returns:
+        np.ndarray: RECORD_DTYPEのレコード配列（読み取り専用）
+
+    Raises:
+        ValueError: 記録ファイルでない場合
+    """
+    _read_header(path)
+    records = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+    if records == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(records,))
+
+
+def reprocess(records: np.ndarray, measurement: JointMeasurement,
+              batch_size: int = 1 << 18) -> np.ndarray:
+    """
+    記録したランドマークから全レコードの関節距離を計算
+
+    Args:
+        records (np.ndarray): load_recording()の出力
+        measurement (JointMeasurement): 計測する関節ペアとスケールを設定したインスタンス
+        batch_size (int): 1回に計算するレコード数（メモリ使用量の上限）
+
+    Returns:
+        np.ndarray: 形状 (レコード数, ペア数) のfloat32距離配列
+    """
+    distances = np.empty((len(records), len(measurement.joint_names)), dtype=np.float32)
+    for start in range(0, len(records), batch_size):
+        stop = min(start + batch_size, len(records))
+        distances[start:stop] = measurement.compute_distance_array(records["landmarks"][start:stop])
+    return distances
+
+
+def write_output(path: str, records: np.ndarray, distances: np.ndarray, joint_names: List[str]):
+    """
+    再計測の結果を保存（拡張子が.npyなら構造化配列、それ以外はCSV）
+
+    Args:
+        path (str): 出力ファイルのパス
+        records (np.ndarray): load_recording()の出力
+        distances (np.ndarray): reprocess()の出力
+        joint_names (List[str]): 距離の列名
+    """
+    if path.endswith(".npy"):
+        output = np.empty(len(records), dtype=[
+            ("timestamp", "<f8"), ("frame_number", "<u4"), ("camera_id", "<u2"),
+            ("hand_index", "u1"), ("label", "u1"),
+            ("distances", "<f4", (len(joint_names),)),
+        ])
+        for name in ("timestamp", "frame_number", "camera_id", "hand_index", "label"):
+            output[name] = records[name]
+        output["distances"] = distances
+        np.save(path, output)
+        return
+
+    columns = np.column_stack([
+        records["timestamp"], records["frame_number"], records["camera_id"],
+        records["hand_index"], records["label"], distances
+    ])
+    header = ",".join(["timestamp", "frame_number", "camera_id", "hand_index", "label"] + joint_names)
+    fmt = ["%.6f", "%d", "%d", "%d", "%d"] + ["%.4f"] * len(joint_names)
+    np.savetxt(path, columns, delimiter=",", header=header, comments="", fmt=fmt)
+
+
+def _parse_pair(text: str) -> Tuple[int, int]:
+    first, second = text.split("-")
+    return int(first), int(second)
+
+
+def main():
+    """
+    エントリーポイント（記録の再計測）
+    """
+    import argparse
+
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Hand Tracking System - Recording Reprocessor")
+    parser.add_argument("recording", help="Recording file written by SessionRecorder")
+    parser.add_argument("--config", default="config.yaml",
+                        help="Configuration file for default measurement settings")
+    parser.add_argument("--pairs", nargs="+", type=_parse_pair,
+                        help="Landmark pairs to measure, e.g. 0-4 0-8 (default: from config)")
+    parser.add_argument("--scale-factor", type=float, help="Override measurement.scale_factor")
+    parser.add_argument("--unit", help="Override measurement.unit")
+    parser.add_argument("--batch-size", type=int, default=1 << 18, help="Records per batch")
+    parser.add_argument("--output", help="Write results to .npy or .csv")
+    args = parser.parse_args()
+
+    measurement_config = {}
+    if os.path.exists(args.config):
+        with open(args.config, "r", encoding="utf-8") as f:
+            measurement_config = dict((yaml.safe_load(f) or {}).get("measurement", {}))
+    if args.pairs:
+        measurement_config["landmarks_to_measure"] = [list(pair) for pair in args.pairs]
+    if args.scale_factor is not None:
+        measurement_config["scale_factor"] = args.scale_factor
+    if args.unit:
+        measurement_config["unit"] = args.unit
+
+    records = load_recording(args.recording)
+    measurement = JointMeasurement(measurement_config)
+
+    start = time.perf_counter()
+    distances = reprocess(records, measurement, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    rate = len(records) / elapsed if elapsed > 0 else float("inf")
+    print(f"Reprocessed {len(records)} hands ({len(measurement.joint_names)} pairs) "
+          f"in {elapsed:.3f}s ({rate:,.0f} hands/s)", file=sys.stderr)
+
+    if args.output:
+        write_output(args.output, records, distances, measurement.joint_names)
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+Serializer Module
+送信ペイロードのシリアライザ（JSON / コンパクトバイナリ）
+
+DataSenderはここで定義したシリアライザを通してペイロードをバイト列に変換します。
+JSONがデフォルトで、バイナリ形式はランドマークと距離を固定レイアウトの
+float32配列、タイムスタンプを整数のエポックナノ秒で表現します。
+
+バイナリフレームのレイアウト（リトルエンディアン）:
+    ヘッダ: magic "HT" | version u8 | flags u8 | frame_number u32 |
+            timestamp_ns i64 | hand_count u8 | encoded_hands u8 | schema_id u32
+    カメラID（flags & FLAG_CAMERA の場合のみ）: camera_id u16
+    UTCオフセット（flags & FLAG_OFFSET の場合のみ）: offset_minutes i16
+    スキーマ（flags & FLAG_SCHEMA の場合のみ）:
+            unit (u8長 + UTF-8) | joint数 u8 | 関節名 (u8長 + UTF-8) × joint数
+    手ごと: hand_id u8 | label u8 | hand_flags u8 | distances f32[joint数] |
+            landmarks f32[21*3]（hand_flags & HAND_FLAG_LANDMARKS の場合のみ）
+    hand_flags & HAND_FLAG_PREDICTED は検出ではなくトラッカーの予測による手を表します。
+
+バッチ（{"frames": [...]}）は magic "HB" | version u8 | count u16 に続けて
+フレーム長 u32 + フレーム本体 を並べます。
+
+タイムスタンプはタイムゾーンなし（ローカル時刻）・UTC・任意のUTCオフセット（分単位）の
+いずれも元の表記に復元されます。秒単位のオフセットには対応しません。
+"""
+
+import json
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .landmarks import HandLandmarks, NUM_LANDMARKS
+except ImportError:
+    from landmarks import HandLandmarks, NUM_LANDMARKS
+
+
+FRAME_MAGIC = b"HT"
+BATCH_MAGIC = b"HB"
+WIRE_VERSION = 1
+
+FLAG_SCHEMA = 0x01
+FLAG_UTC = 0x02
+FLAG_CAMERA = 0x04
+FLAG_OFFSET = 0x08
+HAND_FLAG_LANDMARKS = 0x01
+HAND_FLAG_PREDICTED = 0x02
+
+LABELS = ("Left", "Right")
+
+_FRAME_HEADER = struct.Struct("<2sBBIqBBI")
+_BATCH_HEADER = struct.Struct("<2sBH")
+_HAND_HEADER = struct.Struct("<BBB")
+_U16 = struct.Struct("<H")
+_I16 = struct.Struct("<h")
+_U32 = struct.Struct("<I")
+
+
+class JsonSerializer:
+    """
+    JSONシリアライザ（デフォルト）
+
+    Attributes:
+        name (str): シリアライザ名
+        content_type (str): HTTPのContent-Type
+        binary (bool): バイナリ形式か
+    """
+
+    name = "json"
+    content_type = "application/json"
+    binary = False
+
+    def encode(self, data: Dict) -> bytes:
+        """
+        ペイロードをJSONバイト列に変換
+
+        Args:
+            data (Dict): 送信ペイロード
+
+        Returns:
+            bytes: UTF-8のJSON
+        """
+        return json.dumps(data, separators=(",", ":"), default=_to_list).encode("utf-8")
+
+    def to_jsonable(self, data):
+        """
+        HandLandmarksやNumPy配列をリストに変換したペイロードを返す
+
+        requestsのjson=引数など、json.dumpsのdefaultを指定できない
+        出力先に渡す前に使います。
+
+        Args:
+            data: 送信ペイロード
+
+        Returns:
+            JSONに変換可能なペイロード
+        """
+        if isinstance(data, dict):
+            return {key: self.to_jsonable(value) for key, value in data.items()}
+        if isinstance(data, (list, tuple)):
+            return [self.to_jsonable(value) for value in data]
+        if isinstance(data, (HandLandmarks, np.ndarray, np.generic)):
+            return data.tolist()
+        return data
+
+    def decode(self, payload: bytes) -> Dict:
+        """
+        JSONバイト列をペイロードに戻す
+
+        Args:
+            payload (bytes): encode()の出力
+
+        Returns:
+            Dict: ペイロード
+        """
+        return json.loads(payload)
+
+
+class BinarySerializer:
+    """
+    コンパクトなバイナリシリアライザ
+
+    関節名と単位はスキーマとしてまとめ、スキーマが変わったときと
+    schema_intervalフレームごとにだけ送ります。それ以外のフレームは
+    スキーマIDのみを持ち、デコーダは受信済みのスキーマを参照します。
+
+    届く保証のないHTTPのリクエストでは、self_containedにしてencode()の出力
+    （1フレームまたは1バッチ）ごとにスキーマを含め、単独でデコードできるようにします。
+    スキーマを省略するのは接続が続くWebSocketだけで、再接続時はreset()で送り直します。
+
+    Attributes:
+        schema_interval (int): スキーマを再送するフレーム間隔
+        self_contained (bool): encode()の出力ごとにスキーマを含めるか
+    """
+
+    name = "binary"
+    content_type = "application/x-hand-frame"
+    binary = True
+
+    def __init__(self, schema_interval: int = 30, self_contained: bool = False):
+        """
+        バイナリシリアライザの初期化
+
+        Args:
+            schema_interval (int): スキーマを再送するフレーム間隔（1以上）
+            self_contained (bool): encode()の出力ごとにスキーマを含めるか
+                （バッチでは使うスキーマごとに最初のフレームにだけ含める）
+        """
+        self.schema_interval = max(1, schema_interval)
+        self.self_contained = self_contained
+        self._sent_schema_id: Optional[int] = None
+        self._frames_since_schema = 0
+        # デコード側で受信したスキーマ: schema_id → (unit, 関節名のリスト)
+        self._schemas: Dict[int, Tuple[str, List[str]]] = {}
+
+    def encode(self, data: Dict) -> bytes:
+        """
+        ペイロード（1フレームまたは {"frames": [...]} のバッチ）をエンコード
+
+        Args:
+            data (Dict): 送信ペイロード
+
+        Returns:
+            bytes: バイナリフレーム
+
+        Raises:
+            ValueError: 表現できないペイロードの場合
+        """
+        if self.self_contained:
+            self.reset()
+        if "frames" in data:
+            frames = data["frames"]
+            parts = [_BATCH_HEADER.pack(BATCH_MAGIC, WIRE_VERSION, len(frames))]
+            for frame in frames:
+                encoded = self._encode_frame(frame)
+                parts.append(_U32.pack(len(encoded)))
+                parts.append(encoded)
+            return b"".join(parts)
+        return self._encode_frame(data)
+
+    def reset(self):
+        """
+        送信済みのスキーマを忘れ、次のフレームにスキーマを含める
+
+        受信側がスキーマを持っていない可能性があるとき（再接続後など）に呼びます。
+        """
+        self._sent_schema_id = None
+        self._frames_since_schema = 0
+
+    def decode(self, payload: bytes) -> Dict:
+        """
+        バイナリフレーム（またはバッチ）をペイロードに戻す
+
+        距離は元の値（小数2桁に丸めた値）に、ランドマークはfloat32の値に
+        そのまま復元されます（ランドマークはHandLandmarksとして返します）。
+
+        Args:
+            payload (bytes): encode()の出力
+
+        Returns:
+            Dict: ペイロード
+
+        Raises:
+            ValueError: 不正なデータ、または未受信のスキーマを参照している場合
+        """
+        view = memoryview(payload)
+        if bytes(view[:2]) == BATCH_MAGIC:
+            magic, version, count = _BATCH_HEADER.unpack_from(view, 0)
+            self._check_version(version)
+            offset = _BATCH_HEADER.size
+            frames = []
+            for _ in range(count):
+                (length,) = _U32.unpack_from(view, offset)
+                offset += _U32.size
+                frames.append(self._decode_frame(view[offset:offset + length]))
+                offset += length
+            return {"frames": frames}
+        return self._decode_frame(view)
+
+    def _encode_frame(self, data: Dict) -> bytes:
+        """
+        1フレームをエンコード
+
+        Args:
+            data (Dict): フレームのペイロード
+
+        Returns:
+            bytes: バイナリフレーム
+        """
+        hand_data = data.get("hand_data", {})
+        hands = hand_data.get("measurements", [])
+
+        joint_names, unit = self._collect_schema(hands)
+        schema_id = self._schema_id(unit, joint_names)
+
+        flags = 0
+        if schema_id != self._sent_schema_id or self._frames_since_schema >= self.schema_interval:
+            flags |= FLAG_SCHEMA
+            self._sent_schema_id = schema_id
+            self._frames_since_schema = 0
+        self._frames_since_schema += 1
+
+        timestamp_ns, offset_minutes = _iso_to_epoch_ns(data["timestamp"])
+        if offset_minutes == 0:
+            flags |= FLAG_UTC
+        elif offset_minutes is not None:
+            flags |= FLAG_OFFSET
+        camera_id = data.get("camera_id")
+        if camera_id is not None:
+            flags |= FLAG_CAMERA
+
+        parts = [_FRAME_HEADER.pack(
+            FRAME_MAGIC, WIRE_VERSION, flags,
+            data.get("frame_number", 0), timestamp_ns,
+            hand_data.get("hand_count", len(hands)), len(hands), schema_id
+        )]
+        if camera_id is not None:
+            parts.append(_U16.pack(camera_id))
+        if flags & FLAG_OFFSET:
+            parts.append(_I16.pack(offset_minutes))
+
+        if flags & FLAG_SCHEMA:
+            parts.append(_pack_str(unit))
+            parts.append(bytes([len(joint_names)]))
+            parts.extend(_pack_str(name) for name in joint_names)
+
+        distances = np.full(len(joint_names), np.nan, dtype=np.float32)
+        for hand in hands:
+            label = hand.get("label")
+            if label not in LABELS:
+                raise ValueError(f"Unsupported hand label for binary format: {label}")
+
+            landmarks = hand.get("landmarks")
+            hand_flags = HAND_FLAG_LANDMARKS if landmarks is not None else 0
+            if hand.get("predicted"):
+                hand_flags |= HAND_FLAG_PREDICTED
+            parts.append(_HAND_HEADER.pack(hand["hand_id"], LABELS.index(label), hand_flags))
+
+            joints = hand.get("joints", {})
+            for index, name in enumerate(joint_names):
+                joint = joints.get(name)
+                distances[index] = np.nan if joint is None else joint["distance"]
+            parts.append(distances.tobytes())
+
+            if landmarks is not None:
+                parts.append(
+                    np.asarray(landmarks, dtype=np.float32).reshape(NUM_LANDMARKS * 3).tobytes()
+                )
+
+        return b"".join(parts)
+
+    def _decode_frame(self, view: memoryview) -> Dict:
+        """
+        1フレームをデコード
+
+        Args:
+            view (memoryview): バイナリフレーム
+
+        Returns:
+            Dict: フレームのペイロード
+        """
+        (magic, version, flags, frame_number, timestamp_ns,
+         hand_count, encoded_hands, schema_id) = _FRAME_HEADER.unpack_from(view, 0)
+        if magic != FRAME_MAGIC:
+            raise ValueError("Invalid binary frame magic")
+        self._check_version(version)
+        offset = _FRAME_HEADER.size
+
+        camera_id = None
+        if flags & FLAG_CAMERA:
+            (camera_id,) = _U16.unpack_from(view, offset)
+            offset += _U16.size
+
+        offset_minutes = None
+        if flags & FLAG_UTC:
+            offset_minutes = 0
+        elif flags & FLAG_OFFSET:
+            (offset_minutes,) = _I16.unpack_from(view, offset)
+            offset += _I16.size
+
+        if flags & FLAG_SCHEMA:
+            unit, offset = _unpack_str(view, offset)
+            joint_count = view[offset]
+            offset += 1
+            joint_names = []
+            for _ in range(joint_count):
+                name, offset = _unpack_str(view, offset)
+                joint_names.append(name)
+            self._schemas[schema_id] = (unit, joint_names)
+        elif schema_id not in self._schemas:
+            raise ValueError(f"Unknown schema id: {schema_id:#010x}")
+
+        unit, joint_names = self._schemas[schema_id]
+        joint_count = len(joint_names)
+
+        measurements = []
+        for _ in range(encoded_hands):
+            hand_id, label, hand_flags = _HAND_HEADER.unpack_from(view, offset)
+            offset += _HAND_HEADER.size
+
+            distances = np.frombuffer(view, dtype=np.float32, count=joint_count, offset=offset)
+            offset += distances.nbytes
+            joints = {}
+            for name, value in zip(joint_names, distances):
+                if not np.isnan(value):
+                    # float32の最短表現から元の10進値を復元
+                    joints[name] = {"distance": float(str(value)), "unit": unit}
+
+            hand = {"hand_id": hand_id, "label": LABELS[label], "joints": joints}
+            if hand_flags & HAND_FLAG_PREDICTED:
+                hand["predicted"] = True
+            if hand_flags & HAND_FLAG_LANDMARKS:
+                landmarks = np.frombuffer(
+                    view, dtype=np.float32, count=NUM_LANDMARKS * 3, offset=offset
+                )
+                offset += landmarks.nbytes
+                hand["landmarks"] = HandLandmarks(landmarks.reshape(NUM_LANDMARKS, 3))
+            measurements.append(hand)
+
+        frame = {
+            "timestamp": _epoch_ns_to_iso(timestamp_ns, offset_minutes),
+            "frame_number": frame_number,
+            "hand_data": {
+                "hand_count": hand_count,
+                "measurements": measurements
+            }
+        }
+        if camera_id is not None:
+            frame["camera_id"] = camera_id
+        return frame
+
+    def _collect_schema(self, hands: List[Dict]) -> Tuple[List[str], str]:
+        """
+        フレーム内の関節名と単位を収集
+
+        Args:
+            hands (List[Dict]): 手ごとの計測データ
+
+        Returns:
+            Tuple[List[str], str]: (関節名のリスト, 単位)
+
+        Raises:
+            ValueError: 単位が混在している場合
+        """
+        joint_names: List[str] = []
+        units = set()
+        for hand in hands:
+            for name, joint in hand.get("joints", {}).items():
+                if name not in joint_names:
+                    joint_names.append(name)
+                units.add(joint.get("unit", ""))
+        if len(units) > 1:
+            raise ValueError(f"Mixed units are not supported by binary format: {units}")
+        if len(joint_names) > 255:
+            raise ValueError("Too many joints for binary format")
+        return joint_names, units.pop() if units else ""
+
+    def _schema_id(self, unit: str, joint_names: List[str]) -> int:
+        """
+        スキーマIDを計算
+
+        Args:
+            unit (str): 単位
+            joint_names (List[str]): 関節名のリスト
+
+        Returns:
+            int: CRC32によるスキーマID
+        """
+        return zlib.crc32("\0".join([unit] + joint_names).encode("utf-8"))
+
+    def _check_version(self, version: int):
+        if version != WIRE_VERSION:
+            raise ValueError(f"Unsupported wire format version: {version}")
+
+
+def _to_list(value):
+    """
+    json.dumpsのdefault: HandLandmarksやNumPy配列をリストに変換
+    """
+    if isinstance(value, (HandLandmarks, np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _pack_str(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    if len(encoded) > 255:
+        raise ValueError(f"String too long for binary format: {value}")
+    return bytes([len(encoded)]) + encoded
+
+
+def _unpack_str(view: memoryview, offset: int) -> Tuple[str, int]:
+    length = view[offset]
+    start = offset + 1
+    return bytes(view[start:start + length]).decode("utf-8"), start + length
+
+
+def _iso_to_epoch_ns(timestamp: str) -> Tuple[int, Optional[int]]:
+    """
+    ISO-8601文字列を整数のエポックナノ秒に変換
+
+    タイムゾーンなしの時刻はローカル時刻として扱います。
+
+    Args:
+        timestamp (str): ISO-8601文字列
+
+    Returns:
+        Tuple[int, Optional[int]]: (エポックナノ秒, UTCオフセット（分）、タイムゾーンなしならNone)
+
+    Raises:
+        ValueError: UTCオフセットが分単位でない場合
+    """
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        seconds = int(time.mktime(dt.replace(microsecond=0).timetuple()))
+        return seconds * 1_000_000_000 + dt.microsecond * 1000, None
+    offset = dt.utcoffset()
+    offset_minutes, remainder = divmod(offset.days * 86400 + offset.seconds, 60)
+    if remainder or offset.microseconds:
+        raise ValueError(f"UTC offset must be whole minutes for binary format: {timestamp}")
+    delta = dt - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    timestamp_ns = (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+    return timestamp_ns, offset_minutes
+
+
+def _epoch_ns_to_iso(timestamp_ns: int, offset_minutes: Optional[int]) -> str:
+    """
+    エポックナノ秒をISO-8601文字列に戻す
+
+    Args:
+        timestamp_ns (int): エポックナノ秒
+        offset_minutes (Optional[int]): UTCオフセット（分）、Noneならローカル時刻
+
+    Returns:
+        str: ISO-8601文字列
+    """
+    seconds, remainder = divmod(timestamp_ns, 1_000_000_000)
+    if offset_minutes is None:
+        dt = datetime.fromtimestamp(seconds)
+    else:
+        tz = timezone.utc if offset_minutes == 0 else timezone(timedelta(minutes=offset_minutes))
+        dt = (datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seconds)).astimezone(tz)
+    return dt.replace(microsecond=remainder // 1000).isoformat()
+
+
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    BinarySerializer.name: BinarySerializer,
+}
+
+
+def get_serializer(name: str = "json", **options):
+    """
+    名前からシリアライザを生成
+
+    Args:
+        name (str): "json" または "binary"
+        **options: シリアライザのコンストラクタ引数
+
+    Returns:
+        シリアライザインスタンス
+
+    Raises:
+        ValueError: 未知のシリアライザ名の場合
+    """
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {name}")
+    return SERIALIZERS[name](**options)
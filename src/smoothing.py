@@ -0,0 +1,177 @@
+"""
+Smoothing Module
+ランドマークの時系列平滑化フィルタ（One Euro / 指数移動平均）
+
+全ての手の21点 × 3座標を (スロット数, 21, 3) の事前確保した状態配列で保持し、
+1フレーム分をまとめてNumPyの演算で平滑化します。距離はJointMeasurementで
+平滑化後のランドマークから計算するため、距離のジッタも同時に抑えられます。
+
+手とスロットの対応は呼び出し側が決めます（hand_idなど）。
+そのフレームに現れなかったスロットは状態をリセットするため、
+再び現れた手が古い状態に引きずられることはありません（手のないフレームが
+呼ばれない場合も、reset_after秒以上空いたスロットは初期化し直します）。
+"""
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from .landmarks import NUM_LANDMARKS
+except ImportError:
+    from landmarks import NUM_LANDMARKS
+
+
+SMOOTHING_METHODS = ("one_euro", "ema")
+
+
+class LandmarkSmoother:
+    """
+    複数の手のランドマークをまとめて平滑化するフィルタバンク
+
+    One Euroフィルタは速度に応じてカットオフ周波数を上げるため、
+    静止時のジッタを強く抑えつつ、速い動きへの遅れを小さくできます。
+
+    Attributes:
+        method (str): "one_euro" または "ema"
+        max_hands (int): 状態を持てる手の数（スロット数）
+        min_cutoff (float): One Euroの最小カットオフ周波数（Hz）
+        beta (float): One Euroの速度係数
+        d_cutoff (float): One Euroの速度推定のカットオフ周波数（Hz）
+        alpha (float): EMAの平滑化係数（1で平滑化なし）
+    """
+
+    def __init__(self, config: dict):
+        """
+        フィルタバンクの初期化
+
+        Args:
+            config (dict): 平滑化設定
+                - method: "one_euro" または "ema" (default: "one_euro")
+                - max_hands: スロット数 (default: 4)
+                - min_cutoff: 最小カットオフ周波数 (default: 1.0)
+                - beta: 速度係数 (default: 10.0)
+                - d_cutoff: 速度推定のカットオフ周波数 (default: 1.0)
+                - alpha: EMAの平滑化係数 (default: 0.5)
+                - reset_after: この秒数以上更新がなかったスロットを初期化し直す (default: 0.5)
+
+        Raises:
+            ValueError: 未知の方式の場合
+        """
+        self.method = config.get("method", "one_euro")
+        if self.method not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown smoothing method: {self.method}")
+        self.max_hands = max(1, config.get("max_hands", 4))
+        self.min_cutoff = config.get("min_cutoff", 1.0)
+        self.beta = config.get("beta", 10.0)
+        self.d_cutoff = config.get("d_cutoff", 1.0)
+        self.alpha = config.get("alpha", 0.5)
+        self.reset_after = config.get("reset_after", 0.5)
+
+        shape = (self.max_hands, NUM_LANDMARKS, 3)
+        self._value = np.zeros(shape, dtype=np.float32)      # 平滑化後の位置
+        self._derivative = np.zeros(shape, dtype=np.float32)  # 平滑化後の速度
+        self._input = np.zeros(shape, dtype=np.float32)
+        self._scratch = np.zeros(shape, dtype=np.float32)
+        self._gain = np.zeros(shape, dtype=np.float32)
+        self._timestamp = np.zeros(self.max_hands, dtype=np.float64)
+        self._ready = np.zeros(self.max_hands, dtype=bool)
+        self._active = np.zeros(self.max_hands, dtype=bool)
+
+    def reset(self):
+        """
+        全スロットの状態をリセット
+        """
+        self._ready[:] = False
+
+    def smooth(self, landmarks: Sequence[np.ndarray], slots: Sequence[int], timestamp: float):
+        """
+        1フレーム分のランドマークをその場で平滑化
+
+        Args:
+            landmarks (Sequence[np.ndarray]): 手ごとの (21, 3) float32配列（書き換える）
+            slots (Sequence[int]): 手ごとのスロット番号（0 <= slot < max_hands）
+            timestamp (float): フレームの時刻（秒）
+        """
+        active = self._active
+        active[:] = False
+        for points, slot in zip(landmarks, slots):
+            self._input[slot] = points
+            active[slot] = True
+
+        # 新しく現れた手は観測値で初期化する
+        new = active & (~self._ready | (timestamp - self._timestamp > self.reset_after))
+        self._value[new] = self._input[new]
+        self._derivative[new] = 0.0
+        self._timestamp[new] = timestamp
+
+        update = active & ~new
+        if update.any():
+            dt = np.maximum(timestamp - self._timestamp, 1e-6)[:, np.newaxis, np.newaxis]
+            if self.method == "ema":
+                self._ema(update)
+            else:
+                self._one_euro(update, dt.astype(np.float32))
+            self._timestamp[update] = timestamp
+
+        # このフレームに現れなかったスロットは次に現れたとき初期化し直す
+        self._ready[:] = active
+
+        for points, slot in zip(landmarks, slots):
+            points[...] = self._value[slot]
+
+    def _ema(self, update: np.ndarray):
+        """
+        指数移動平均で更新（updateのスロットのみ）
+        """
+        scratch = self._scratch
+        np.subtract(self._input, self._value, out=scratch)
+        scratch *= self.alpha
+        scratch += self._value
+        np.copyto(self._value, scratch, where=update[:, np.newaxis, np.newaxis])
+
+    def _one_euro(self, update: np.ndarray, dt: np.ndarray):
+        """
+        One Euroフィルタで更新（updateのスロットのみ）
+
+        Args:
+            update (np.ndarray): 更新するスロットのマスク
+            dt (np.ndarray): スロットごとの経過秒 (max_hands, 1, 1)
+        """
+        mask = update[:, np.newaxis, np.newaxis]
+        scratch = self._scratch
+        gain = self._gain
+
+        # 速度: dx = (x - x_prev) / dt をカットオフd_cutoffで平滑化
+        np.subtract(self._input, self._value, out=scratch)
+        scratch /= dt
+        scratch -= self._derivative
+        scratch *= _smoothing_factor(dt, self.d_cutoff)
+        scratch += self._derivative
+        np.copyto(self._derivative, scratch, where=mask)
+
+        # カットオフ = min_cutoff + beta * |dx|
+        np.abs(self._derivative, out=gain)
+        gain *= self.beta
+        gain += self.min_cutoff
+        # alpha = 1 / (1 + 1 / (2π * cutoff * dt))
+        gain *= 2 * math.pi
+        gain *= dt
+        np.reciprocal(gain, out=gain)
+        gain += 1.0
+        np.reciprocal(gain, out=gain)
+
+        np.subtract(self._input, self._value, out=scratch)
+        scratch *= gain
+        scratch += self._value
+        np.copyto(self._value, scratch, where=mask)
+
+
+def _smoothing_factor(dt: np.ndarray, cutoff: float) -> np.ndarray:
+    """
+    一次ローパスフィルタの係数 alpha = 1 / (1 + τ / dt)、τ = 1 / (2π * cutoff)
+    """
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
@@ -0,0 +1,323 @@
+"""
+Spool Module
+送信できなかったペイロードを保存するディスク上の追記専用スプール
+
+ペイロードはセグメントファイル（{番号}.seg）に追記し、セグメントがsegment_sizeを
+超えたら次のファイルに切り替えます。読み出し位置（セグメント番号とオフセット）は
+cursorファイルに保存するため、プロセスを再起動しても未送信分から再送できます。
+合計サイズがmax_bytesを超えたら、最も古いセグメントから削除します。
+
+レコード形式（リトルエンディアン）:
+    length (u32) | crc32 (u32) | payload (length bytes)
+"""
+
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+
+RECORD_HEADER = struct.Struct("<II")
+SEGMENT_SUFFIX = ".seg"
+CURSOR_FILE = "cursor"
+
+
+class DiskSpool:
+    """
+    セグメント単位の追記専用キュー（FIFO）
+
+    使い方:
+        spool.append(payload)
+        payload = spool.peek()
+        if payload is not None and send(payload):
+            spool.ack()
+
+    Attributes:
+        directory (str): セグメントを置くディレクトリ
+        segment_size (int): 1セグメントの目安サイズ（バイト）
+        max_bytes (int): スプール全体の上限サイズ（バイト）
+        stats (Dict): appended, acked, evicted（上限超過で捨てたレコード数）, corrupted
+    """
+
+    def __init__(self, directory: str, segment_size: int = 4 * 1024 * 1024,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        スプールを開く（既存のセグメントがあれば続きから使う）
+
+        Args:
+            directory (str): セグメントを置くディレクトリ（なければ作成）
+            segment_size (int): 1セグメントの目安サイズ（バイト）
+            max_bytes (int): スプール全体の上限サイズ（バイト）
+        """
+        self.directory = directory
+        self.segment_size = max(RECORD_HEADER.size, segment_size)
+        self.max_bytes = max(self.segment_size, max_bytes)
+        self.stats = {"appended": 0, "acked": 0, "evicted": 0, "corrupted": 0}
+
+        self._lock = threading.Lock()
+        # セグメント番号 → [サイズ, レコード数]（番号順）
+        self._segments: Dict[int, List[int]] = {}
+        self._writer = None
+        self._reader = None
+        self._reader_segment: Optional[int] = None
+        self._read_segment = 0
+        self._read_offset = 0
+        self._read_records = 0  # 読み出し中のセグメントで送信済みのレコード数
+        self._pending = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def append(self, payload: bytes):
+        """
+        ペイロードを末尾に追記
+
+        ヘッダとペイロードを1回のwriteで書き込み、すぐにOSへフラッシュします。
+
+        Args:
+            payload (bytes): 保存するペイロード
+        """
+        record = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            segment = self._write_segment()
+            self._writer.write(record)
+            self._writer.flush()
+            self._segments[segment][0] += len(record)
+            self._segments[segment][1] += 1
+            self._pending += 1
+            self.stats["appended"] += 1
+
+            if self._segments[segment][0] >= self.segment_size:
+                self._roll()
+            self._evict()
+
+    def peek(self) -> Optional[bytes]:
+        """
+        最も古い未送信のペイロードを返す（取り出さない）
+
+        Returns:
+            Optional[bytes]: ペイロード、空ならNone
+        """
+        with self._lock:
+            while self._pending > 0:
+                payload = self._read_record()
+                if payload is not None:
+                    return payload
+                if not self._advance_segment():
+                    break
+            return None
+
+    def ack(self):
+        """
+        peek()で返したペイロードを送信済みにする
+        """
+        with self._lock:
+            if self._pending == 0 or self._reader is None:
+                return
+            header = self._reader.read(RECORD_HEADER.size)
+            length, _ = RECORD_HEADER.unpack(header)
+            self._read_offset += RECORD_HEADER.size + length
+            self._read_records += 1
+            self._pending -= 1
+            self.stats["acked"] += 1
+            self._save_cursor()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def size_bytes(self) -> int:
+        """
+        ディスク上のセグメントの合計サイズを返す
+
+        Returns:
+            int: バイト数
+        """
+        with self._lock:
+            return sum(size for size, _ in self._segments.values())
+
+    def close(self):
+        """
+        ファイルを閉じる（未送信のレコードはディスクに残る）
+        """
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._close_reader()
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:010d}{SEGMENT_SUFFIX}")
+
+    def _recover(self):
+        """
+        既存のセグメントとcursorを読み込み、末尾の書きかけレコードを切り詰める
+        """
+        names = sorted(name for name in os.listdir(self.directory) if name.endswith(SEGMENT_SUFFIX))
+        for name in names:
+            segment = int(name[:-len(SEGMENT_SUFFIX)])
+            valid, records = self._scan(self._path(segment))
+            if valid < os.path.getsize(self._path(segment)):
+                # クラッシュで途中まで書かれたレコード
+                with open(self._path(segment), "r+b") as f:
+                    f.truncate(valid)
+            self._segments[segment] = [valid, records]
+
+        if self._segments:
+            self._read_segment = min(self._segments)
+        cursor_path = os.path.join(self.directory, CURSOR_FILE)
+        if os.path.exists(cursor_path):
+            try:
+                with open(cursor_path, "r") as f:
+                    segment, offset = (int(value) for value in f.read().split())
+            except ValueError:
+                segment, offset = self._read_segment, 0
+            if segment in self._segments:
+                self._read_segment = segment
+                self._read_offset = min(offset, self._segments[segment][0])
+                _, self._read_records = self._scan(self._path(segment), limit=self._read_offset)
+
+        # cursorより前のセグメントは送信済み
+        for segment in [s for s in self._segments if s < self._read_segment]:
+            self._remove_segment(segment)
+        self._pending = sum(records for _, records in self._segments.values()) - self._read_records
+
+    @staticmethod
+    def _scan(path: str, limit: Optional[int] = None):
+        """
+        セグメントを先頭から検証し、有効な範囲のサイズとレコード数を返す
+        """
+        offset = 0
+        records = 0
+        with open(path, "rb") as f:
+            while limit is None or offset < limit:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                length, crc = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                offset += RECORD_HEADER.size + length
+                records += 1
+        return offset, records
+
+    def _write_segment(self) -> int:
+        """
+        追記先のセグメントを開いて番号を返す
+        """
+        if self._writer is None:
+            segment = max(self._segments) + 1 if self._segments else 0
+            self._segments[segment] = [0, 0]
+            self._writer = open(self._path(segment), "ab")
+            if len(self._segments) == 1:
+                self._read_segment = segment
+                self._read_offset = 0
+                self._read_records = 0
+        return max(self._segments)
+
+    def _roll(self):
+        """
+        現在のセグメントを閉じ、次の追記で新しいセグメントを作らせる
+        """
+        self._writer.close()
+        self._writer = None
+
+    def _evict(self):
+        """
+        上限サイズを超えた分を最も古いセグメントから削除
+        """
+        while sum(size for size, _ in self._segments.values()) > self.max_bytes:
+            oldest = min(self._segments)
+            if self._writer is not None and oldest == max(self._segments):
+                break
+            records = self._segments[oldest][1]
+            if oldest == self._read_segment:
+                records -= self._read_records
+            self._pending -= records
+            self.stats["evicted"] += records
+            self._remove_segment(oldest)
+            if oldest == self._read_segment:
+                self._move_cursor(min(self._segments) if self._segments else oldest + 1)
+
+    def _read_record(self) -> Optional[bytes]:
+        """
+        読み出し位置のレコードを読む（ファイル位置は進めない）
+
+        Returns:
+            Optional[bytes]: ペイロード、セグメント末尾または破損していればNone
+        """
+        if self._read_segment not in self._segments:
+            return None
+        if self._reader is None or self._reader_segment != self._read_segment:
+            self._close_reader()
+            self._reader = open(self._path(self._read_segment), "rb")
+            self._reader_segment = self._read_segment
+
+        self._reader.seek(self._read_offset)
+        header = self._reader.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return None
+        length, crc = RECORD_HEADER.unpack(header)
+        payload = self._reader.read(length)
+        self._reader.seek(self._read_offset)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            print(f"Corrupted spool record in segment {self._read_segment}, skipping segment")
+            self.stats["corrupted"] += 1
+            return None
+        return payload
+
+    def _advance_segment(self) -> bool:
+        """
+        読み終えた（または破損した）セグメントを削除して次のセグメントに進む
+
+        Returns:
+            bool: 次のセグメントに進めた場合True
+        """
+        later = [segment for segment in self._segments if segment > self._read_segment]
+        if not later:
+            # 残りは破損したレコードより後ろにあり読めない
+            self.stats["corrupted"] += self._pending
+            self._pending = 0
+            if self._writer is not None:
+                self._roll()
+            return False
+        finished = self._read_segment
+        _, records = self._segments[finished]
+        self._pending -= records - self._read_records
+        self._remove_segment(finished)
+        self._move_cursor(min(later))
+        return True
+
+    def _move_cursor(self, segment: int):
+        self._close_reader()
+        self._read_segment = segment
+        self._read_offset = 0
+        self._read_records = 0
+        self._save_cursor()
+
+    def _remove_segment(self, segment: int):
+        if segment == self._reader_segment:
+            self._close_reader()
+        del self._segments[segment]
+        try:
+            os.remove(self._path(segment))
+        except OSError as e:
+            print(f"Failed to remove spool segment: {e}")
+
+    def _close_reader(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+            self._reader_segment = None
+
+    def _save_cursor(self):
+        """
+        読み出し位置をアトミックに保存
+        """
+        path = os.path.join(self.directory, CURSOR_FILE)
+        temp = path + ".tmp"
+        with open(temp, "w") as f:
+            f.write(f"{self._read_segment} {self._read_offset}")
+        os.replace(temp, path)
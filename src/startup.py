@@ -0,0 +1,91 @@
+"""
+Startup Timer Module
+起動処理のフェーズごとの所要時間を記録し、起動時間レポートを作る
+
+フェーズは並行して走ってもよく（カメラの起動・送信先のhealth check・モデルの読み込みなど）、
+それぞれの開始時刻と所要時間を基準時刻（プロセスの起動直後）からの経過として記録します。
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class StartupTimer:
+    """
+    起動フェーズの所要時間を記録するクラス（スレッドセーフ）
+
+    使い方:
+        with timer.phase("camera_open"):
+            camera.start()
+        for line in timer.report():
+            logger.info(line)
+
+    Attributes:
+        origin (float): 基準時刻（time.perf_counter()の値）
+        phases (List[Dict]): name, start（基準時刻からの秒数）, duration（秒）
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        タイマーの初期化
+
+        Args:
+            origin (Optional[float]): 基準時刻（省略時は現在時刻）
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[Dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        withブロックの実行時間をフェーズとして記録する（例外が出ても記録する）
+
+        Args:
+            name (str): フェーズ名
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float):
+        """
+        計測済みのフェーズを記録
+
+        Args:
+            name (str): フェーズ名
+            start (float): 開始時刻（time.perf_counter()の値）
+            end (float): 終了時刻（time.perf_counter()の値）
+        """
+        with self._lock:
+            self.phases.append({"name": name, "start": start - self.origin, "duration": end - start})
+
+    def elapsed(self) -> float:
+        """
+        基準時刻からの経過秒数を返す
+
+        Returns:
+            float: 経過秒数
+        """
+        return time.perf_counter() - self.origin
+
+    def report(self) -> List[str]:
+        """
+        フェーズを開始順に並べたレポートを作成
+
+        Returns:
+            List[str]: 1フェーズ1行のレポート（最後の行は全体の所要時間）
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase["start"])
+        lines = [
+            f"{phase['name']:<14} start {phase['start'] * 1000:8.1f}ms  took {phase['duration'] * 1000:8.1f}ms"
+            for phase in phases
+        ]
+        total = max((phase["start"] + phase["duration"] for phase in phases), default=0.0)
+        lines.append(f"{'total':<14} {total * 1000:.1f}ms")
+        return lines
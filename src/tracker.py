@@ -0,0 +1,211 @@
+"""
+Landmark Tracker Module
+検出の合間のフレームでランドマークを予測する時系列トラッカー
+
+HandDetectorとJointMeasurementの間に置き、手ごとに等速度モデルの
+カルマンフィルタ状態（21点 × 3座標の位置と速度）を保持します。
+検出を実行したフレームでは観測で状態を更新し、検出を省略したフレームでは
+前回の状態から位置を予測して返します。予測した手には "predicted": True が付きます。
+
+全座標は同じ時刻・同じノイズで観測されるため、誤差共分散は座標によらず
+共通の2x2行列になります。そのため手ごとに1つの共分散を持ち、
+位置と速度の更新は (21, 3) 配列に対するベクトル演算で行います。
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from .landmarks import HandLandmarks
+except ImportError:
+    from landmarks import HandLandmarks
+
+
+class HandTrack:
+    """
+    1つの手の等速度カルマンフィルタ状態
+
+    Attributes:
+        label (str): 手のラベル（Left/Right）
+        position (np.ndarray): 推定位置 (21, 3)
+        velocity (np.ndarray): 推定速度 (21, 3)、単位は正規化座標/秒
+        covariance (np.ndarray): 位置・速度の誤差共分散 (2, 2)（全座標で共通）
+        timestamp (float): 状態の時刻（単調時計の秒）
+        predicted_frames (int): 最後の観測から連続で予測したフレーム数
+    """
+
+    def __init__(self, label: str, landmarks: np.ndarray, timestamp: float,
+                 confidence: float, measurement_noise: float):
+        self.label = label
+        self.confidence = confidence
+        self.position = np.array(landmarks, dtype=np.float64)
+        self.velocity = np.zeros_like(self.position)
+        # 位置は観測ノイズ程度、速度は未知（大きめの分散）から始める
+        self.covariance = np.diag([measurement_noise, 1.0])
+        self.timestamp = timestamp
+        self.predicted_frames = 0
+
+    def predict(self, timestamp: float, process_noise: float) -> np.ndarray:
+        """
+        時刻timestampまで状態を進める
+
+        Args:
+            timestamp (float): 予測する時刻
+            process_noise (float): 加速度のノイズ密度
+
+        Returns:
+            np.ndarray: 予測位置 (21, 3)
+        """
+        dt = max(0.0, timestamp - self.timestamp)
+        if dt > 0:
+            self.position += self.velocity * dt
+            p = self.covariance
+            p00 = p[0, 0] + dt * (p[1, 0] + p[0, 1]) + dt * dt * p[1, 1]
+            p01 = p[0, 1] + dt * p[1, 1]
+            p11 = p[1, 1]
+            q = process_noise
+            self.covariance = np.array([
+                [p00 + q * dt ** 3 / 3, p01 + q * dt ** 2 / 2],
+                [p01 + q * dt ** 2 / 2, p11 + q * dt],
+            ])
+            self.timestamp = timestamp
+        return self.position
+
+    def correct(self, landmarks: np.ndarray, measurement_noise: float):
+        """
+        観測で状態を更新
+
+        Args:
+            landmarks (np.ndarray): 観測したランドマーク (21, 3)
+            measurement_noise (float): 観測ノイズの分散
+        """
+        p = self.covariance
+        s = p[0, 0] + measurement_noise
+        gain_position = p[0, 0] / s
+        gain_velocity = p[1, 0] / s
+
+        residual = np.asarray(landmarks, dtype=np.float64) - self.position
+        self.position += gain_position * residual
+        self.velocity += gain_velocity * residual
+        self.covariance = np.array([
+            [(1 - gain_position) * p[0, 0], (1 - gain_position) * p[0, 1]],
+            [p[1, 0] - gain_velocity * p[0, 0], p[1, 1] - gain_velocity * p[0, 1]],
+        ])
+        self.predicted_frames = 0
+
+
+class LandmarkTracker:
+    """
+    検出結果を時系列で追跡し、検出のないフレームを予測で補うクラス
+
+    Attributes:
+        process_noise (float): 加速度のノイズ密度（大きいほど観測に素早く追従）
+        measurement_noise (float): 観測ノイズの分散
+        max_predicted_frames (int): 観測なしで予測を続ける最大フレーム数
+        tracks (List[HandTrack]): 追跡中の手
+    """
+
+    def __init__(self, config: dict):
+        """
+        トラッカーの初期化
+
+        Args:
+            config (dict): トラッキング設定
+                - process_noise: 加速度のノイズ密度 (default: 50.0)
+                - measurement_noise: 観測ノイズの分散 (default: 1e-5)
+                - max_predicted_frames: 観測なしで予測を続ける最大フレーム数 (default: 5)
+        """
+        self.process_noise = config.get("process_noise", 50.0)
+        self.measurement_noise = config.get("measurement_noise", 1e-5)
+        self.max_predicted_frames = config.get("max_predicted_frames", 5)
+        self.tracks: List[HandTrack] = []
+
+    def update(self, detection: Dict, timestamp: float) -> Dict:
+        """
+        検出を実行したフレームの結果で追跡状態を更新
+
+        Args:
+            detection (Dict): HandDetector.detect()の出力
+            timestamp (float): フレームの時刻（単調時計の秒）
+
+        Returns:
+            Dict: 各手に "predicted": False を付けた検出結果
+        """
+        hands = detection["hands"]
+        matched = self._match(hands)
+
+        tracks = []
+        for hand, track in zip(hands, matched):
+            landmarks = np.asarray(hand["landmarks"])
+            if track is None:
+                track = HandTrack(hand["label"], landmarks, timestamp,
+                                  hand.get("confidence", 1.0), self.measurement_noise)
+            else:
+                track.predict(timestamp, self.process_noise)
+                track.correct(landmarks, self.measurement_noise)
+                track.confidence = hand.get("confidence", track.confidence)
+            hand["predicted"] = False
+            tracks.append(track)
+
+        # 見えなくなった手は追跡をやめる
+        self.tracks = tracks
+        return detection
+
+    def predict(self, timestamp: float) -> Dict:
+        """
+        検出を省略したフレームの手を予測
+
+        Args:
+            timestamp (float): フレームの時刻（単調時計の秒）
+
+        Returns:
+            Dict: HandDetector.detect()と同じ形式の予測結果（各手に "predicted": True）
+        """
+        self.tracks = [
+            track for track in self.tracks if track.predicted_frames < self.max_predicted_frames
+        ]
+
+        hands = []
+        for track in self.tracks:
+            position = track.predict(timestamp, self.process_noise)
+            track.predicted_frames += 1
+            hands.append({
+                "label": track.label,
+                "landmarks": HandLandmarks(position),
+                "confidence": track.confidence,
+                "predicted": True
+            })
+
+        return {
+            "hand_count": len(hands),
+            "hands": hands,
+            "timestamp": datetime.now().isoformat(),
+            "predicted": True
+        }
+
+    def _match(self, hands: List[Dict]) -> List[Optional[HandTrack]]:
+        """
+        検出した手を既存の追跡に対応付ける
+
+        同じラベルの追跡のうち、手首が最も近いものを選びます。
+
+        Args:
+            hands (List[Dict]): 検出した手
+
+        Returns:
+            List[Optional[HandTrack]]: 手ごとの対応する追跡（新しい手はNone）
+        """
+        available = list(self.tracks)
+        matched: List[Optional[HandTrack]] = []
+        for hand in hands:
+            wrist = np.asarray(hand["landmarks"])[0]
+            candidates = [track for track in available if track.label == hand["label"]]
+            if not candidates:
+                matched.append(None)
+                continue
+            best = min(candidates, key=lambda track: float(np.sum((track.position[0] - wrist) ** 2)))
+            available.remove(best)
+            matched.append(best)
+        return matched
@@ -0,0 +1,123 @@
+"""
+Unit tests for Detection Autotuner Module
+"""
+
+import logging
+
+import pytest
+from src.autotune import DetectionAutotuner
+
+
+class FakeDetector:
+    """model_complexityとinput_scaleだけを持つHandDetectorの代わり"""
+
+    def __init__(self, model_complexity=1, input_scale=1.0):
+        self.model_complexity = model_complexity
+        self.input_scale = input_scale
+        self.rebuilds = 0
+
+    def set_model_complexity(self, model_complexity):
+        if model_complexity == self.model_complexity:
+            return False
+        self.model_complexity = model_complexity
+        self.rebuilds += 1
+        return True
+
+
+LEVELS = [[0, 0.5], [0, 1.0], [1, 1.0]]
+
+
+def make_autotuner(detector, **overrides):
+    config = {"target_fps": 25, "budget_fraction": 1.0, "window": 5, "upgrade_ratio": 0.5,
+              "levels": LEVELS}
+    config.update(overrides)
+    return DetectionAutotuner(detector, config)
+
+
+def feed(autotuner, latency, count):
+    return [decision for decision in
+            (autotuner.observe(latency) for _ in range(count)) if decision is not None]
+
+
+def test_starts_at_detector_settings():
+    """検出器の現在の設定に対応する段階から始まるテスト"""
+    detector = FakeDetector(1, 1.0)
+    autotuner = make_autotuner(detector)
+
+    assert autotuner.level == 2
+    assert autotuner.budget == pytest.approx(0.04)
+    assert detector.rebuilds == 0
+
+
+def test_steps_down_when_over_budget():
+    """予算を超えたら1段ずつ軽くするテスト"""
+    detector = FakeDetector(1, 1.0)
+    autotuner = make_autotuner(detector)
+
+    decisions = feed(autotuner, 0.06, 5)
+    assert [d["action"] for d in decisions] == ["down"]
+    assert (detector.model_complexity, detector.input_scale) == (0, 1.0)
+    assert decisions[0]["rebuilt"] is True
+
+    decisions = feed(autotuner, 0.06, 5)
+    assert decisions[0]["to"] == (0, 0.5)
+    assert decisions[0]["rebuilt"] is False
+    assert detector.rebuilds == 1
+
+    # 最も軽い段階より下には行かない
+    assert feed(autotuner, 0.06, 10) == []
+
+
+def test_waits_for_full_window():
+    """window回の計測がそろうまで判断しないテスト"""
+    autotuner = make_autotuner(FakeDetector(1, 1.0))
+
+    assert feed(autotuner, 0.06, 4) == []
+    assert len(feed(autotuner, 0.06, 1)) == 1
+
+
+def test_median_ignores_single_spike():
+    """1回だけの遅い検出では段階を変えないテスト"""
+    autotuner = make_autotuner(FakeDetector(1, 1.0))
+
+    assert feed(autotuner, 0.01, 4) + feed(autotuner, 0.5, 1) == []
+    assert autotuner.level == 2
+
+
+def test_steps_up_with_headroom():
+    """予算に十分な余裕があれば1段重くするテスト"""
+    detector = FakeDetector(0, 0.5)
+    autotuner = make_autotuner(detector)
+
+    decisions = feed(autotuner, 0.01, 5)
+    assert [d["action"] for d in decisions] == ["up"]
+    assert (detector.model_complexity, detector.input_scale) == (0, 1.0)
+
+    # 余裕が少ない間（予算のupgrade_ratio以上）は据え置く
+    assert feed(autotuner, 0.03, 20) == []
+
+
+def test_hysteresis_after_oscillation():
+    """上げた直後に下げ戻したら、次に上げるまで長く待つテスト"""
+    detector = FakeDetector(0, 0.5)
+    autotuner = make_autotuner(detector)
+
+    feed(autotuner, 0.01, 5)          # up
+    feed(autotuner, 0.06, 5)          # down（上げた直後）
+    assert autotuner.level == 0
+
+    assert feed(autotuner, 0.01, 5) == []
+    assert [d["action"] for d in feed(autotuner, 0.01, 5)] == ["up"]
+
+
+def test_decisions_are_logged(caplog):
+    """段階の変更がログに出力されるテスト"""
+    autotuner = make_autotuner(FakeDetector(1, 1.0))
+
+    with caplog.at_level(logging.INFO, logger="src.autotune"):
+        feed(autotuner, 0.06, 5)
+
+    assert "Autotune: down (1, 1.0) -> (0, 1.0)" in caplog.text
+    assert autotuner.get_stats() == {
+        "level": 1, "model_complexity": 0, "input_scale": 1.0, "changes": 1
+    }
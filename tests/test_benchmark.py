@@ -0,0 +1,114 @@
+"""
+Unit tests for Pipeline Benchmark
+"""
+
+import pytest
+import json
+import os
+import sys
+import numpy as np
+import requests
+
+# benchmarkはmain（srcを直接パスに置く前提のモジュール）を使う
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.benchmark import (
+    STAGES, BenchmarkApp, StubIngestServer, benchmark_config, run_benchmark, summarize_latencies
+)
+
+
+@pytest.fixture
+def bench_config():
+    """合成フレームでの小さなベンチマーク設定"""
+    return {
+        "camera": {
+            "source": "synthetic", "width": 160, "height": 120,
+            "pacing": "fast", "threaded": False
+        },
+        "hand_detection": {"model_complexity": 0, "max_num_hands": 2},
+        "measurement": {
+            "landmarks_to_measure": [[0, 4], [0, 8], [0, 12], [0, 16], [0, 20]],
+            "unit": "cm",
+            "scale_factor": 10.0
+        },
+        "data_sender": {"serializer": "json"}
+    }
+
+
+def test_summarize_latencies():
+    """パーセンタイル統計のテスト"""
+    samples = np.arange(1, 101, dtype=np.float64) / 1000.0  # 1〜100ms
+
+    stats = summarize_latencies(samples)
+
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+    assert stats["max_ms"] == pytest.approx(100.0)
+    assert summarize_latencies(np.array([])) == {"count": 0}
+
+
+def test_stub_ingest_server_counts_requests():
+    """スタブサーバーが受信数とバイト数を数えるテスト"""
+    server = StubIngestServer()
+    server.start()
+    try:
+        response = requests.post(server.url, data=b"12345")
+        assert response.status_code == 200
+    finally:
+        server.stop()
+
+    assert server.requests_received == 1
+    assert server.bytes_received == 5
+
+
+@pytest.mark.parametrize("serializer", ["json", "binary"])
+def test_run_benchmark_reports_all_stages(bench_config, serializer):
+    """ベンチマーク結果に全ステージの統計が含まれ、JSONで保存できるテスト"""
+    bench_config["data_sender"]["serializer"] = serializer
+
+    results = run_benchmark(bench_config, frames=10, warmup=1)
+
+    assert results["frames"] == 10
+    assert results["throughput_fps"] > 0
+    assert results["send_failures"] == 0
+    assert results["bytes_sent"] > 0
+    assert results["settings"]["serializer"] == serializer
+    for stage in STAGES:
+        assert results["stages"][stage]["count"] == 10
+        assert results["stages"][stage]["p99_ms"] >= results["stages"][stage]["p50_ms"]
+    json.dumps(results)
+
+
+def test_run_benchmark_drives_app_stages(bench_config, monkeypatch):
+    """HandTrackingAppのステージメソッドを通して計測するテスト"""
+    calls = []
+    original = BenchmarkApp.measure_joints
+
+    def measure_joints(self, item):
+        calls.append(item["frame_number"])
+        return original(self, item)
+
+    monkeypatch.setattr(BenchmarkApp, "measure_joints", measure_joints)
+
+    results = run_benchmark(bench_config, frames=5, warmup=2)
+
+    assert results["frames"] == 5
+    # ウォームアップの2フレームも同じアプリで取得している
+    assert calls == [3, 4, 5, 6, 7]
+
+
+def test_benchmark_config_uses_sequential_loop(bench_config):
+    """ベンチマーク用設定が送信先と実行モードを書き換え、元の設定を変えないテスト"""
+    bench_config["pipeline"] = {"enabled": True}
+    bench_config["cameras"] = [{"device_id": 1}]
+
+    config = benchmark_config(bench_config, "http://localhost:1/api")
+
+    assert config["data_sender"]["endpoint"] == "http://localhost:1/api"
+    assert config["data_sender"]["async_send"] is False
+    assert config["data_sender"]["serializer"] == "json"
+    assert config["cameras"] == []
+    assert config["pipeline"]["enabled"] is False
+    assert config["detector_pool"]["enabled"] is False
+    assert bench_config["pipeline"]["enabled"] is True
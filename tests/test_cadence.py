@@ -0,0 +1,90 @@
+"""
+Unit tests for Detection Cadence Module
+"""
+
+import pytest
+import numpy as np
+from unittest.mock import patch
+from src.cadence import CadenceController
+
+
+@pytest.fixture
+def controller():
+    """テスト用のケイデンスコントローラー（idle中の定期検出なし）"""
+    return CadenceController({"idle_after": 3, "idle_fps": 0, "motion_threshold": 4.0})
+
+
+@pytest.fixture
+def still_frame():
+    """動きのないフレーム"""
+    return np.full((120, 160, 3), 50, dtype=np.uint8)
+
+
+def test_active_detects_every_frame(controller, still_frame):
+    """手が見えている間は毎フレーム検出するテスト"""
+    for _ in range(10):
+        assert controller.should_detect(still_frame) is True
+        controller.update(1)
+    assert controller.state == "active"
+    assert controller.frames_skipped == 0
+
+
+def test_goes_idle_after_misses(controller, still_frame):
+    """手のない検出が続いたらidleになり、検出を省略するテスト"""
+    for _ in range(3):
+        assert controller.should_detect(still_frame) is True
+        controller.update(0)
+
+    assert controller.state == "idle"
+    results = [controller.should_detect(still_frame) for _ in range(10)]
+    assert results == [False] * 10
+    assert controller.frames_skipped == 10
+
+
+def test_motion_wakes_up(controller, still_frame):
+    """idle中に動きがあればすぐに検出を再開するテスト"""
+    for _ in range(3):
+        controller.update(0)
+    assert controller.should_detect(still_frame) is False
+
+    moved = still_frame.copy()
+    moved[20:100, 40:120] = 255
+    assert controller.should_detect(moved) is True
+    assert controller.state == "active"
+    assert controller.wakeups == 1
+
+
+def test_small_noise_does_not_wake(controller, still_frame):
+    """しきい値以下の小さな変化では起きないテスト"""
+    for _ in range(3):
+        controller.update(0)
+    controller.should_detect(still_frame)
+
+    noisy = still_frame + np.uint8(2)
+    assert controller.should_detect(noisy) is False
+    assert controller.state == "idle"
+
+
+def test_idle_rate(still_frame):
+    """idle中もidle_fpsの頻度では検出するテスト"""
+    controller = CadenceController({"idle_after": 1, "idle_fps": 2.0})
+    with patch("src.cadence.time.monotonic") as monotonic:
+        monotonic.return_value = 100.0
+        controller.update(0)
+        assert controller.state == "idle"
+
+        monotonic.return_value = 100.2
+        assert controller.should_detect(still_frame) is False
+        monotonic.return_value = 100.6
+        assert controller.should_detect(still_frame) is True
+
+
+def test_hand_returns_to_active(controller, still_frame):
+    """idle中の検出で手が見つかればactiveに戻るテスト"""
+    for _ in range(3):
+        controller.update(0)
+    controller.update(1)
+
+    assert controller.state == "active"
+    assert controller.should_detect(still_frame) is True
+    assert controller.get_stats()["state"] == "active"
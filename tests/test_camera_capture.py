@@ -4,6 +4,7 @@ Agent1が実装してください
 """
 
 import pytest
+import time
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from src.camera_capture import CameraCapture
@@ -196,3 +197,113 @@ def test_camera_error_handling(mock_video_capture):
     result = camera.start()
 
     assert result is False
+
+
+def _make_threaded_mock(mock_video_capture, frame_interval=0.002):
+    """スレッドモード用のモックカメラを作成（フレームごとに値が増える）"""
+    mock_cap = Mock()
+    mock_cap.isOpened.return_value = True
+    mock_cap.get.side_effect = [640, 480, 30]
+    counter = [0]
+
+    def read_side_effect(*args):
+        time.sleep(frame_interval)
+        counter[0] += 1
+        return True, np.full((48, 64, 3), counter[0] % 256, dtype=np.uint8)
+
+    mock_cap.read.side_effect = read_side_effect
+    mock_video_capture.return_value = mock_cap
+    return mock_cap
+
+
+@patch('cv2.VideoCapture')
+def test_threaded_capture_returns_latest_frame(mock_video_capture):
+    """スレッドモードで最新フレームがシーケンス番号付きで取得できるテスト"""
+    _make_threaded_mock(mock_video_capture)
+    camera = CameraCapture({"threaded": True, "buffer_size": 3})
+
+    assert camera.start() is True
+    try:
+        ret, frame, seq1, ts1 = camera.read_latest(timeout=1.0)
+        assert ret is True
+        assert frame.shape == (48, 64, 3)
+        assert seq1 >= 1
+        assert ts1 > 0
+
+        ret, frame, seq2, ts2 = camera.read_latest(timeout=1.0)
+        assert ret is True
+        assert seq2 > seq1
+        assert ts2 >= ts1
+
+        ret, frame = camera.get_frame()
+        assert ret is True
+        assert isinstance(frame, np.ndarray)
+    finally:
+        camera.stop()
+
+    assert camera.cap is None
+
+
+@patch('cv2.VideoCapture')
+def test_threaded_capture_counts_dropped_frames(mock_video_capture):
+    """読み出しが遅い場合にドロップ数がカウントされるテスト"""
+    _make_threaded_mock(mock_video_capture)
+    camera = CameraCapture({"threaded": True, "buffer_size": 3})
+    camera.start()
+    try:
+        ret, _, seq1, _ = camera.read_latest(timeout=1.0)
+        time.sleep(0.05)  # 推論中を想定してその間にフレームが溜まる
+        ret, _, seq2, _ = camera.read_latest(timeout=1.0)
+        assert ret is True
+
+        stats = camera.get_stats()
+        assert seq2 - seq1 > 1
+        assert stats["dropped"] >= seq2 - seq1 - 1
+        assert stats["delivered"] == 2
+        assert stats["captured"] >= seq2
+    finally:
+        camera.stop()
+
+
+@patch('cv2.VideoCapture')
+def test_threaded_capture_does_not_overwrite_held_frame(mock_video_capture):
+    """読み出し中のフレームがグラバーに上書きされないテスト"""
+    _make_threaded_mock(mock_video_capture)
+    camera = CameraCapture({"threaded": True, "buffer_size": 3})
+    camera.start()
+    try:
+        ret, frame, _, _ = camera.read_latest(timeout=1.0)
+        snapshot = frame.copy()
+        time.sleep(0.05)
+        assert np.array_equal(frame, snapshot)
+    finally:
+        camera.stop()
+
+
+def test_read_latest_without_start():
+    """スレッド未起動時のread_latestテスト"""
+    camera = CameraCapture({"threaded": True})
+
+    ret, frame, seq, ts = camera.read_latest(timeout=0.01)
+
+    assert ret is False
+    assert frame is None
+    assert seq == -1
+
+
+def test_reuse_buffers_reads_into_same_frame():
+    """reuse_buffersで毎回同じバッファにフレームが読み出されるテスト"""
+    camera = CameraCapture({
+        "source": "synthetic", "width": 64, "height": 48,
+        "pacing": "fast", "reuse_buffers": True
+    })
+
+    assert camera.start() is True
+    try:
+        frames = [camera.get_frame()[1] for _ in range(3)]
+    finally:
+        camera.stop()
+
+    assert frames[0] is not None
+    assert frames[1] is frames[0]
+    assert frames[2] is frames[0]
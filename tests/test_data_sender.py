@@ -4,6 +4,12 @@ Agent4が実装してください
 """
 
 import pytest
+import asyncio
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import socket
+import threading
+import time
 from unittest.mock import Mock, patch, MagicMock
 from src.data_sender import DataSender
 
@@ -56,7 +62,7 @@ def test_initialization(config):
 
 def test_connection_success(config):
     """接続成功テスト"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_get.return_value = mock_response
@@ -71,7 +77,7 @@ def test_connection_success(config):
 
 def test_connection_failure(config):
     """接続失敗テスト"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_get.side_effect = Exception("Connection error")
 
         sender = DataSender(config)
@@ -83,7 +89,7 @@ def test_connection_failure(config):
 
 def test_data_sending_success(config, sample_data):
     """データ送信成功テスト"""
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_response = Mock()
         mock_response.status_code = 200
         mock_post.return_value = mock_response
@@ -94,13 +100,13 @@ def test_data_sending_success(config, sample_data):
         assert result == True
         mock_post.assert_called_once()
         call_args = mock_post.call_args
-        assert call_args.kwargs['json'] == sample_data
+        assert json.loads(call_args.kwargs['data']) == sample_data
         assert call_args.kwargs['headers'] == {"Content-Type": "application/json"}
 
 
 def test_data_sending_failure(config, sample_data):
     """データ送信失敗テスト"""
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_post.side_effect = Exception("Send error")
 
         sender = DataSender(config)
@@ -112,7 +118,7 @@ def test_data_sending_failure(config, sample_data):
 
 def test_retry_logic_success_on_second_attempt(config, sample_data):
     """リトライ処理テスト - 2回目で成功"""
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         # 1回目は失敗、2回目は成功
         mock_response_fail = Mock()
         mock_response_fail.status_code = 500
@@ -129,7 +135,7 @@ def test_retry_logic_success_on_second_attempt(config, sample_data):
 
 def test_retry_logic_all_failures(config, sample_data):
     """リトライ処理テスト - 全て失敗"""
-    with patch('requests.post') as mock_post, patch('time.sleep'):
+    with patch('requests.Session.post') as mock_post, patch('time.sleep'):
         mock_response = Mock()
         mock_response.status_code = 500
         mock_post.return_value = mock_response
@@ -141,6 +147,24 @@ def test_retry_logic_all_failures(config, sample_data):
         assert mock_post.call_count == 3  # retry_attempts回試行される
 
 
+def test_retry_and_failure_counters(config, sample_data):
+    """リトライ回数と送信失敗数の統計テスト"""
+    with patch('requests.Session.post') as mock_post, patch('time.sleep'):
+        mock_response_fail = Mock()
+        mock_response_fail.status_code = 500
+        mock_response_success = Mock()
+        mock_response_success.status_code = 200
+        mock_post.side_effect = [mock_response_fail, mock_response_success] + [mock_response_fail] * 3
+
+        sender = DataSender(config)
+        assert sender.send_data(sample_data) == True
+        assert sender.send_data(sample_data) == False
+
+        stats = sender.get_stats()
+        assert stats["retries"] == 3
+        assert stats["send_failures"] == 1
+
+
 def test_disconnect(config):
     """切断テスト"""
     sender = DataSender(config)
@@ -160,3 +184,484 @@ def test_timeout_configuration(config):
     """タイムアウト設定テスト"""
     sender = DataSender(config)
     assert sender.timeout == 5
+
+
+@pytest.fixture
+def async_config(config):
+    """非同期バッチ送信用の設定"""
+    config.update({
+        "async_send": True,
+        "queue_size": 100,
+        "batch_size": 10,
+        "batch_max_age": 0.05
+    })
+    return config
+
+
+def test_async_send_batches_frames(async_config, sample_data):
+    """非同期モードでフレームがバッチにまとめて送信されるテスト"""
+    with patch('requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200)
+
+        sender = DataSender(async_config)
+        for i in range(25):
+            assert sender.send_data(dict(sample_data, frame_number=i)) is True
+
+        assert sender.flush(timeout=2.0) is True
+        sender.disconnect()
+
+        frames = []
+        for call in mock_post.call_args_list:
+            batch = json.loads(call.kwargs['data'])["frames"]
+            assert len(batch) <= 10
+            frames.extend(batch)
+
+        assert [f["frame_number"] for f in frames] == list(range(25))
+        stats = sender.get_stats()
+        assert stats["sent_frames"] == 25
+        assert stats["dropped"] == 0
+        assert stats["queue_depth"] == 0
+
+
+def test_async_send_does_not_block_on_slow_endpoint(async_config, sample_data):
+    """送信先が遅くてもsend_dataがすぐに戻るテスト"""
+    def slow_post(*args, **kwargs):
+        time.sleep(0.2)
+        return Mock(status_code=200)
+
+    with patch('requests.Session.post', side_effect=slow_post):
+        sender = DataSender(async_config)
+
+        start = time.monotonic()
+        for _ in range(20):
+            sender.send_data(sample_data)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.1
+        sender.disconnect()
+
+
+def test_async_send_flushes_partial_batch_by_age(async_config, sample_data):
+    """batch_sizeに満たなくてもbatch_max_age経過で送信されるテスト"""
+    with patch('requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200)
+
+        sender = DataSender(async_config)
+        sender.send_data(sample_data)
+        time.sleep(0.2)
+
+        mock_post.assert_called_once()
+        assert len(json.loads(mock_post.call_args.kwargs['data'])["frames"]) == 1
+        sender.disconnect()
+
+
+def test_async_send_drops_oldest_when_queue_full(async_config, sample_data):
+    """キューが満杯のとき最も古いデータが捨てられるテスト"""
+    async_config["queue_size"] = 3
+    sender = DataSender(async_config)
+    # ワーカーを起動させずにキューの挙動を確認
+    sender._ensure_worker = Mock()
+
+    for i in range(5):
+        sender.send_data(dict(sample_data, frame_number=i))
+
+    stats = sender.get_stats()
+    assert stats["dropped"] == 2
+    assert stats["queue_depth"] == 3
+    assert [d["frame_number"] for _, d in sender._queue] == [2, 3, 4]
+
+
+def test_async_send_counts_failed_frames(async_config, sample_data):
+    """送信失敗したバッチのフレーム数がカウントされるテスト"""
+    with patch('requests.Session.post') as mock_post, patch('time.sleep'):
+        mock_post.return_value = Mock(status_code=500)
+
+        sender = DataSender(async_config)
+        for _ in range(4):
+            sender.send_data(sample_data)
+        sender.disconnect()
+
+        stats = sender.get_stats()
+        assert stats["failed_frames"] == 4
+        assert stats["sent_frames"] == 0
+
+
+class LocalWebSocketServer:
+    """テスト用のローカルasyncio WebSocketサーバー（受信メッセージを記録）"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.messages = []
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    async def _handler(self, websocket, *args):
+        async for message in websocket:
+            self.messages.append(json.loads(message))
+
+    async def _serve(self):
+        import websockets
+        self._server = await websockets.serve(self._handler, "localhost", self.port)
+        self._ready.set()
+        await self._server.wait_closed()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete, args=(self._serve(),), daemon=True
+        )
+        self._thread.start()
+        assert self._ready.wait(timeout=5.0)
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+        self._thread.join(timeout=5.0)
+        self._ready.clear()
+
+    def wait_for_messages(self, count: int, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while len(self.messages) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(self.messages) >= count
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def ws_config(config):
+    """WebSocket送信用の設定"""
+    port = _free_port()
+    config.update({
+        "method": "WEBSOCKET",
+        "websocket_url": f"ws://localhost:{port}/ws/hand-data",
+        "ws_reconnect_delay": 0.05,
+        "ws_max_reconnect_delay": 0.2
+    })
+    return config, port
+
+
+def test_websocket_send(ws_config, sample_data):
+    """WebSocketで永続接続を使って順番通りに送信されるテスト"""
+    config, port = ws_config
+    server = LocalWebSocketServer(port)
+    server.start()
+    sender = DataSender(config)
+    try:
+        assert sender.connect() is True
+        assert sender.is_connected() is True
+
+        for i in range(10):
+            assert sender.send_data(dict(sample_data, frame_number=i)) is True
+
+        assert server.wait_for_messages(10)
+        assert [m["frame_number"] for m in server.messages] == list(range(10))
+        assert sender.transport.stats["connects"] == 1
+    finally:
+        sender.disconnect()
+        server.stop()
+
+    assert sender.is_connected() is False
+
+
+def test_websocket_buffers_while_disconnected(ws_config, sample_data):
+    """切断中のフレームがバッファされ、再接続後に送信されるテスト"""
+    config, port = ws_config
+    sender = DataSender(config)
+    server = LocalWebSocketServer(port)
+    try:
+        # サーバー未起動のまま送信するとバッファに溜まる
+        for i in range(5):
+            assert sender.send_data(dict(sample_data, frame_number=i)) is True
+        time.sleep(0.1)
+        assert sender.is_connected() is False
+        assert sender.transport.pending() == 5
+
+        # サーバーが起動するとバックオフ後に再接続して送信される
+        server.start()
+        assert server.wait_for_messages(5)
+        assert [m["frame_number"] for m in server.messages] == list(range(5))
+        assert sender.transport.pending() == 0
+    finally:
+        sender.disconnect()
+        server.stop()
+
+
+def test_websocket_buffer_drops_oldest(ws_config, sample_data):
+    """切断中にバッファ上限を超えると古いフレームが捨てられるテスト"""
+    config, _ = ws_config
+    config["ws_buffer_size"] = 3
+    sender = DataSender(config)
+
+    for i in range(5):
+        sender.transport.send(json.dumps(dict(sample_data, frame_number=i)))
+
+    assert sender.transport.pending() == 3
+    assert sender.transport.stats["dropped"] == 2
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """keep-aliveに対応したテスト用HTTPハンドラ"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+    def _reply(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_http_server():
+    """ローカルのkeep-alive HTTPサーバー"""
+    server = ThreadingHTTPServer(("localhost", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}/api/hand-data"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_pool_configuration(config):
+    """コネクションプール設定がアダプタに反映されるテスト"""
+    config.update({"pool_connections": 2, "pool_maxsize": 8})
+    sender = DataSender(config)
+
+    adapter = sender.session.get_adapter("http://localhost:8000")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 8
+
+
+def test_session_reuses_connections(config, sample_data, local_http_server):
+    """keep-aliveで接続が再利用されるテスト"""
+    config["endpoint"] = local_http_server
+    sender = DataSender(config)
+
+    assert sender.connect() is True
+    for _ in range(5):
+        assert sender.send_data(sample_data) is True
+
+    stats = sender.get_connection_stats()
+    assert stats["requests"] == 6
+    assert stats["opened"] == 1
+    assert stats["reused"] == 5
+    sender.disconnect()
+
+
+def test_binary_serializer_post(config, sample_data):
+    """binaryシリアライザ使用時にバイト列で送信されるテスト"""
+    from src.serializers import BinarySerializer
+
+    config["serializer"] = "binary"
+    payload = {
+        "timestamp": "2025-11-05T00:00:00",
+        "frame_number": 1,
+        "hand_data": {
+            "hand_count": 1,
+            "measurements": [{
+                "hand_id": 0,
+                "label": "Right",
+                "joints": {"wrist_to_thumb": {"distance": 12.5, "unit": "cm"}}
+            }]
+        }
+    }
+    with patch('requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200)
+
+        sender = DataSender(config)
+        assert sender.send_data(payload) is True
+
+        kwargs = mock_post.call_args.kwargs
+        assert "json" not in kwargs
+        assert kwargs['headers'] == {"Content-Type": "application/x-hand-frame"}
+        assert BinarySerializer().decode(kwargs['data']) == payload
+
+
+def test_binary_serializer_post_every_request_has_schema(config, sample_data):
+    """binaryのHTTP送信では、どのリクエストも単独でデコードできるテスト"""
+    from src.serializers import BinarySerializer
+
+    config["serializer"] = "binary"
+    payload = {
+        "timestamp": "2025-11-05T00:00:00",
+        "frame_number": 1,
+        "hand_data": {
+            "hand_count": 1,
+            "measurements": [{
+                "hand_id": 0,
+                "label": "Right",
+                "joints": {"wrist_to_thumb": {"distance": 12.5, "unit": "cm"}}
+            }]
+        }
+    }
+    with patch('requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200)
+
+        sender = DataSender(config)
+        for i in range(3):
+            sender.send_data(dict(payload, frame_number=i))
+
+        for i, call in enumerate(mock_post.call_args_list):
+            assert BinarySerializer().decode(call.kwargs['data'])["frame_number"] == i
+
+
+def test_binary_serializer_resets_schema_on_reconnect(ws_config):
+    """WebSocket再接続後の最初のフレームにスキーマが含まれるテスト"""
+    config, _ = ws_config
+    config["serializer"] = "binary"
+    sender = DataSender(config)
+    assert sender.serializer.self_contained is False
+
+    sender.transport = Mock(stats={"connects": 1})
+    sender.serializer.reset = Mock(wraps=sender.serializer.reset)
+    sender.send_data({"timestamp": "2025-11-05T00:00:00", "frame_number": 1,
+                      "hand_data": {"hand_count": 0, "measurements": []}})
+    sender.send_data({"timestamp": "2025-11-05T00:00:00", "frame_number": 2,
+                      "hand_data": {"hand_count": 0, "measurements": []}})
+    assert sender.serializer.reset.call_count == 1
+
+    sender.transport.stats["connects"] = 2
+    sender.send_data({"timestamp": "2025-11-05T00:00:00", "frame_number": 3,
+                      "hand_data": {"hand_count": 0, "measurements": []}})
+    assert sender.serializer.reset.call_count == 2
+
+
+def test_delta_encoding_post(config):
+    """delta_encoding使用時にキーフレームのあと差分が送信されるテスト"""
+    config["delta_encoding"] = True
+    config["keyframe_interval"] = 10
+
+    def payload(distance):
+        return {
+            "timestamp": "2025-11-05T00:00:00",
+            "frame_number": 1,
+            "hand_data": {
+                "hand_count": 1,
+                "measurements": [{
+                    "hand_id": 0,
+                    "label": "Right",
+                    "joints": {"wrist_to_thumb": {"distance": distance, "unit": "cm"}}
+                }]
+            }
+        }
+
+    with patch('requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(status_code=200)
+
+        sender = DataSender(config)
+        sender.send_data(payload(12.5))
+        sender.send_data(payload(12.5))
+
+        key, delta = [json.loads(call.kwargs['data']) for call in mock_post.call_args_list]
+        assert key["type"] == "key" and key["seq"] == 1
+        assert delta["type"] == "delta" and delta["seq"] == 2
+        assert delta["hands"] == [{"hand_id": 0, "joints": {}}]
+
+
+def test_delta_encoding_rejects_binary(config):
+    """delta_encodingとbinaryの組み合わせはエラーになるテスト"""
+    config["delta_encoding"] = True
+    config["serializer"] = "binary"
+    with pytest.raises(ValueError):
+        DataSender(config)
+
+
+class _FlakyEndpoint:
+    """upの間だけ受け付けるsession.postの代わり（受信したボディを記録）"""
+
+    def __init__(self):
+        self.up = False
+        self.received = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, **kwargs):
+        if not self.up:
+            raise ConnectionError("endpoint down")
+        with self.lock:
+            self.received.append(json.loads(kwargs["data"]))
+        return Mock(status_code=200)
+
+
+@pytest.fixture
+def spool_config(config, tmp_path):
+    """スプール有効の設定"""
+    config.update({"spool_dir": str(tmp_path / "spool"), "retry_delay": 0.05, "spool_max_delay": 0.1})
+    return config
+
+
+def _frame(number):
+    return {"timestamp": "2025-11-05T00:00:00", "frame_number": number,
+            "hand_data": {"hand_count": 0, "measurements": []}}
+
+
+def test_spool_does_not_block_while_endpoint_down(spool_config):
+    """エンドポイント停止中はリトライで待たずにスプールへ保存するテスト"""
+    endpoint = _FlakyEndpoint()
+    with patch('requests.Session.post', side_effect=endpoint):
+        sender = DataSender(spool_config)
+        start = time.monotonic()
+        for i in range(5):
+            assert sender.send_data(_frame(i)) is True
+        elapsed = time.monotonic() - start
+
+        stats = sender.get_stats()
+        sender.disconnect()
+
+    assert elapsed < spool_config["retry_delay"] * 2
+    assert stats["spooled"] == 5
+    assert stats["spool_depth"] == 5
+
+
+def test_spool_replays_in_order_after_recovery(spool_config):
+    """復旧後に保存したデータを順に再送し、その後は直接送信するテスト"""
+    endpoint = _FlakyEndpoint()
+    with patch('requests.Session.post', side_effect=endpoint):
+        sender = DataSender(spool_config)
+        for i in range(5):
+            sender.send_data(_frame(i))
+
+        endpoint.up = True
+        deadline = time.monotonic() + 5.0
+        while sender.get_stats()["spool_depth"] > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sender.send_data(_frame(5))
+        stats = sender.get_stats()
+        sender.disconnect()
+
+    assert [frame["frame_number"] for frame in endpoint.received] == list(range(6))
+    assert stats["replayed"] == 5
+    assert stats["spool_depth"] == 0
+
+
+def test_spool_survives_restart(spool_config):
+    """未送信のデータが次回起動時に再送されるテスト"""
+    endpoint = _FlakyEndpoint()
+    with patch('requests.Session.post', side_effect=endpoint):
+        sender = DataSender(spool_config)
+        for i in range(3):
+            sender.send_data(_frame(i))
+        sender.disconnect()
+
+        endpoint.up = True
+        restarted = DataSender(spool_config)
+        deadline = time.monotonic() + 5.0
+        while restarted.get_stats()["spool_depth"] > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        restarted.disconnect()
+
+    assert [frame["frame_number"] for frame in endpoint.received] == [0, 1, 2]
@@ -0,0 +1,192 @@
+"""
+Unit tests for Delta Encoding Module
+"""
+
+import json
+
+import pytest
+from src.delta import DeltaEncoder, DeltaDecoder
+
+
+JOINTS = ("wrist_to_thumb", "wrist_to_index", "wrist_to_middle", "wrist_to_ring", "wrist_to_pinky")
+
+
+def make_frame(frame_number, hands, camera_id=None):
+    """テスト用のペイロード（hands: [(hand_id, label, 距離のリスト)]）"""
+    data = {
+        "timestamp": f"2025-11-05T00:00:{frame_number:02d}",
+        "frame_number": frame_number,
+        "hand_data": {
+            "hand_count": len(hands),
+            "measurements": [
+                {
+                    "hand_id": hand_id,
+                    "label": label,
+                    "joints": {
+                        name: {"distance": distance, "unit": "cm"}
+                        for name, distance in zip(JOINTS, distances)
+                    }
+                }
+                for hand_id, label, distances in hands
+            ]
+        }
+    }
+    if camera_id is not None:
+        data["camera_id"] = camera_id
+    return data
+
+
+STEADY = [(0, "Right", [12.5, 15.3, 16.8, 15.1, 13.2])]
+
+
+def test_keyframe_interval():
+    """keyframe_intervalごとにキーフレームが送られるテスト"""
+    encoder = DeltaEncoder(keyframe_interval=3)
+    types = [encoder.encode(make_frame(i, STEADY))["type"] for i in range(7)]
+
+    assert types == ["key", "delta", "delta", "key", "delta", "delta", "key"]
+
+
+def test_sequence_numbers():
+    """メッセージに連番が付くテスト"""
+    encoder = DeltaEncoder(keyframe_interval=2)
+    assert [encoder.encode(make_frame(i, STEADY))["seq"] for i in range(4)] == [1, 2, 3, 4]
+
+
+def test_only_changed_joints_sent():
+    """epsilonを超えて変化した関節だけが差分に含まれるテスト"""
+    encoder = DeltaEncoder(epsilon=0.05)
+    encoder.encode(make_frame(0, STEADY))
+
+    message = encoder.encode(make_frame(1, [(0, "Right", [12.52, 15.5, 16.8, 15.1, 13.0])]))
+
+    assert message["type"] == "delta"
+    assert message["hands"] == [{"hand_id": 0, "joints": {"wrist_to_index": 15.5, "wrist_to_pinky": 13.0}}]
+    assert message["removed"] == []
+
+
+def test_slow_drift_is_sent_once_accumulated():
+    """少しずつの変化も受信側の値からepsilonを超えた時点で送られるテスト"""
+    encoder = DeltaEncoder(epsilon=0.05)
+    decoder = DeltaDecoder()
+    decoder.decode(encoder.encode(make_frame(0, STEADY)))
+
+    sent = []
+    for i in range(1, 11):
+        distances = [12.5 + 0.01 * i, 15.3, 16.8, 15.1, 13.2]
+        message = encoder.encode(make_frame(i, [(0, "Right", distances)]))
+        sent.append(bool(message["hands"][0]["joints"]))
+        decoded = decoder.decode(message)
+        thumb = decoded["hand_data"]["measurements"][0]["joints"]["wrist_to_thumb"]["distance"]
+        assert thumb == pytest.approx(distances[0], abs=0.05)
+
+    assert sent.count(True) == 1
+
+
+def test_new_and_removed_hands():
+    """差分フレームでの手の出現と消失のテスト"""
+    encoder = DeltaEncoder()
+    decoder = DeltaDecoder()
+    decoder.decode(encoder.encode(make_frame(0, STEADY)))
+
+    both = STEADY + [(1, "Left", [11.0, 14.0, 15.0, 14.0, 12.0])]
+    message = encoder.encode(make_frame(1, both))
+    assert message["hands"][1]["units"]["wrist_to_thumb"] == "cm"
+    assert decoder.decode(message) == make_frame(1, both)
+
+    left_only = [(1, "Left", [11.0, 14.0, 15.0, 14.0, 12.0])]
+    message = encoder.encode(make_frame(2, left_only))
+    assert message["removed"] == [0]
+    assert decoder.decode(message) == make_frame(2, left_only)
+
+
+def test_predicted_flag_change():
+    """predictedフラグの変化が差分で伝わるテスト"""
+    encoder = DeltaEncoder()
+    decoder = DeltaDecoder()
+    decoder.decode(encoder.encode(make_frame(0, STEADY)))
+
+    predicted = make_frame(1, STEADY)
+    predicted["hand_data"]["measurements"][0]["predicted"] = True
+    message = encoder.encode(predicted)
+    assert message["hands"][0]["predicted"] is True
+    assert decoder.decode(message) == predicted
+
+    assert decoder.decode(encoder.encode(make_frame(2, STEADY))) == make_frame(2, STEADY)
+
+
+def test_landmarks_resent_on_change():
+    """ランドマークはlandmark_epsilonを超えて動いたときだけ送られるテスト"""
+    encoder = DeltaEncoder(landmark_epsilon=0.01)
+    frame = make_frame(0, STEADY)
+    frame["hand_data"]["measurements"][0]["landmarks"] = [[0.5, 0.5, 0.0]] * 21
+    encoder.encode(frame)
+
+    frame["hand_data"]["measurements"][0]["landmarks"] = [[0.505, 0.5, 0.0]] * 21
+    assert "landmarks" not in encoder.encode(frame)["hands"][0]
+
+    frame["hand_data"]["measurements"][0]["landmarks"] = [[0.52, 0.5, 0.0]] * 21
+    assert encoder.encode(frame)["hands"][0]["landmarks"][0] == [0.52, 0.5, 0.0]
+
+
+def test_decoder_skips_until_keyframe_after_gap():
+    """連番の抜けを検出し、次のキーフレームまで差分を適用しないテスト"""
+    encoder = DeltaEncoder(keyframe_interval=4)
+    decoder = DeltaDecoder()
+    messages = [encoder.encode(make_frame(i, STEADY)) for i in range(8)]
+
+    results = [decoder.decode(message) for index, message in enumerate(messages) if index != 1]
+
+    assert decoder.gaps == 1
+    assert decoder.skipped == 2
+    assert results[0] == make_frame(0, STEADY)
+    assert results[1:3] == [None, None]
+    assert results[3:] == [make_frame(i, STEADY) for i in range(4, 8)]
+
+
+def test_streams_per_camera():
+    """カメラごとに独立した連番と状態を持つテスト"""
+    encoder = DeltaEncoder()
+    decoder = DeltaDecoder()
+
+    first = [encoder.encode(make_frame(0, STEADY, camera_id=cam)) for cam in (0, 1)]
+    second = [encoder.encode(make_frame(1, STEADY, camera_id=cam)) for cam in (0, 1)]
+
+    assert [m["seq"] for m in first + second] == [1, 1, 2, 2]
+    assert [m["type"] for m in first + second] == ["key", "key", "delta", "delta"]
+    for message in first + second:
+        assert decoder.decode(message) is not None
+    assert decoder.gaps == 0
+
+
+def test_force_keyframe():
+    """force_keyframeで次のフレームがキーフレームになるテスト"""
+    encoder = DeltaEncoder()
+    encoder.encode(make_frame(0, STEADY))
+    encoder.force_keyframe()
+
+    assert encoder.encode(make_frame(1, STEADY))["type"] == "key"
+
+
+def test_round_trip_through_json():
+    """JSONを経由しても復元値がepsilon以内に収まるテスト"""
+    encoder = DeltaEncoder(keyframe_interval=10, epsilon=0.05)
+    decoder = DeltaDecoder()
+
+    for i in range(25):
+        distances = [12.5 + 0.03 * i, 15.3 - 0.02 * i, 16.8, 15.1 + (i % 3) * 0.1, 13.2]
+        frame = make_frame(i, [(0, "Right", distances)])
+        decoded = decoder.decode(json.loads(json.dumps(encoder.encode(frame))))
+        for name, value in zip(JOINTS, distances):
+            joint = decoded["hand_data"]["measurements"][0]["joints"][name]
+            assert joint["distance"] == pytest.approx(value, abs=0.05)
+            assert joint["unit"] == "cm"
+
+
+def test_steady_pose_bandwidth():
+    """静止した手では差分フレームが全体より大幅に小さいテスト"""
+    encoder = DeltaEncoder(keyframe_interval=30)
+    full = sum(len(json.dumps(make_frame(i, STEADY))) for i in range(60))
+    encoded = sum(len(json.dumps(encoder.encode(make_frame(i, STEADY)))) for i in range(60))
+
+    assert encoded < full / 2
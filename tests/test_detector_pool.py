@@ -0,0 +1,137 @@
+"""
+Unit tests for Detector Pool Module
+"""
+
+import queue
+from types import SimpleNamespace
+
+import pytest
+import numpy as np
+from src.detector_pool import DetectorPool
+
+
+class FakeProcess:
+    def __init__(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+
+@pytest.fixture
+def fake_pool():
+    """ワーカープロセスの代わりにスレッド内のキューを使うプール"""
+    pool = DetectorPool({}, {"workers": 2, "slots_per_worker": 2})
+    pool._processes = [FakeProcess(), FakeProcess()]
+    pool._task_queues = [queue.Queue(), queue.Queue()]
+    pool._result_queue = queue.Queue()
+    yield pool
+    if pool._ring is not None:
+        pool._ring.close()
+
+
+def take_tasks(pool, worker):
+    tasks = []
+    while not pool._task_queues[worker].empty():
+        tasks.append(pool._task_queues[worker].get())
+    return tasks
+
+
+def read_slot(pool, task):
+    _, name, ring_seq = task
+    assert name == pool._ring.name
+    return pool._ring.read(ring_seq)
+
+
+def test_frames_are_copied_to_shared_memory(fake_pool):
+    """フレームがFrameRingにコピーされ、ワーカーに均等に振り分けられるテスト"""
+    frames = [np.full((4, 6, 3), i, dtype=np.uint8) for i in range(4)]
+    for i, frame in enumerate(frames):
+        assert fake_pool.submit(frame, meta=i) == i
+        frame[...] = 255  # 呼び出し後にフレームを書き換えても影響しない
+
+    tasks = take_tasks(fake_pool, 0) + take_tasks(fake_pool, 1)
+    assert len(take_tasks(fake_pool, 0)) == 0
+    assert sorted(task[0] for task in tasks) == [0, 1, 2, 3]
+    for task in tasks:
+        assert read_slot(fake_pool, task).max() == task[0]
+    assert fake_pool._load == [2, 2]
+
+
+def test_results_are_reordered(fake_pool):
+    """順不同で届いた結果を連番の順に返すテスト"""
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    for i in range(4):
+        fake_pool.submit(frame, meta=f"frame-{i}")
+
+    for seq in (2, 0, 3, 1):
+        fake_pool._result_queue.put((seq, 0, {"hand_count": seq}, None, seq / 100))
+
+    results = [fake_pool.get_result(timeout=0.1) for _ in range(4)]
+    assert results == [(f"frame-{i}", {"hand_count": i}, i / 100) for i in range(4)]
+    assert fake_pool.get_result(timeout=0.01) is None
+    assert fake_pool.pending() == 0
+
+
+def test_submit_waits_for_free_slot(fake_pool):
+    """スロットが全て使用中ならsubmitが待ち、結果が届くと空くテスト"""
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    for i in range(4):
+        fake_pool.submit(frame)
+
+    assert fake_pool.submit(frame, timeout=0.05) is None
+
+    fake_pool._result_queue.put((0, 0, {"hand_count": 0}, None, 0.01))
+    fake_pool.get_result(timeout=0.1)
+    assert fake_pool.submit(frame, timeout=0.05) == 4
+
+
+def test_failed_and_lost_frames_return_none(fake_pool):
+    """失敗したフレームと終了したワーカーのフレームがNoneで返り、順序が止まらないテスト"""
+    frame = np.zeros((4, 6, 3), dtype=np.uint8)
+    for i in range(4):
+        fake_pool.submit(frame, meta=i)
+    lost = [task[0] for task in take_tasks(fake_pool, 1)]
+    kept = [task[0] for task in take_tasks(fake_pool, 0)]
+
+    fake_pool._processes[1].alive = False
+    fake_pool._result_queue.put((kept[0], 0, None, "boom", None))
+    fake_pool._result_queue.put((kept[1], 0, {"hand_count": 1}, None, 0.01))
+
+    results = {meta: (detection, seconds)
+               for meta, detection, seconds in (fake_pool.get_result(timeout=0.1) for _ in range(4))}
+    assert results[kept[0]] == (None, None)
+    assert results[kept[1]] == ({"hand_count": 1}, 0.01)
+    assert all(results[seq] == (None, None) for seq in lost)
+    assert fake_pool.stats["errors"] == 3
+
+    # 終了したワーカーには新しいフレームを渡さない
+    fake_pool.submit(frame)
+    assert len(take_tasks(fake_pool, 0)) == 1
+
+
+def test_rejects_frame_size_change(fake_pool):
+    """最初のフレームと形状が異なるフレームはエラーになるテスト"""
+    fake_pool.submit(np.zeros((4, 6, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        fake_pool.submit(np.zeros((8, 6, 3), dtype=np.uint8))
+
+
+def test_pool_with_worker_processes():
+    """実際のワーカープロセスで検出し、順番どおりに結果が返るテスト"""
+    pool = DetectorPool({"model_complexity": 0}, {"workers": 2, "slots_per_worker": 1})
+    assert pool.start() is True
+    try:
+        for i in range(6):
+            assert pool.submit(np.full((120, 160, 3), i * 10, dtype=np.uint8), meta=i, timeout=30) == i
+            if i >= 1:
+                result = pool.get_result(timeout=30)
+                assert result[0] == i - 1
+        meta, detection, detect_seconds = pool.get_result(timeout=30)
+    finally:
+        pool.stop()
+
+    assert meta == 5
+    assert detection["hand_count"] == 0
+    assert detect_seconds > 0
+    assert pool.stats == {"submitted": 6, "completed": 6, "errors": 0}
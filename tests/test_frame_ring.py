@@ -0,0 +1,129 @@
+"""
+Unit tests for Frame Ring Module
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import pytest
+import numpy as np
+from src.frame_ring import FrameRing, benchmark_transport
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing.create((4, 6, 3), np.uint8, slots=3)
+    yield ring
+    ring.close()
+
+
+def frame(value):
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+def test_write_and_read(ring):
+    """書き込んだフレームを連番で読めるテスト"""
+    assert ring.latest() == 0
+    assert ring.view(1) is None
+
+    assert ring.write(frame(7)) == 1
+    assert ring.write(frame(8)) == 2
+    assert ring.latest() == 2
+    assert ring.read(1).max() == 7
+    assert ring.view(2).min() == 8
+    assert not ring.view(2).flags.writeable
+
+
+def test_overwritten_frames_are_detected(ring):
+    """スロットが再利用されたフレームは読めず、保持していたビューも無効になるテスト"""
+    ring.write(frame(1))
+    view = ring.view(1)
+    assert ring.valid(1)
+
+    for value in (2, 3, 4):
+        ring.write(frame(value))
+
+    assert not ring.valid(1)
+    assert ring.view(1) is None
+    assert ring.read(1) is None
+    assert view.max() == 4  # ビューは上書きされた内容を指している
+    assert ring.read(4).max() == 4
+
+
+def test_read_into_buffer(ring):
+    """outを渡すとそこにコピーするテスト"""
+    ring.write(frame(5))
+    out = np.zeros((4, 6, 3), dtype=np.uint8)
+    assert ring.read(1, out=out) is out
+    assert out.max() == 5
+
+
+def test_rejects_mismatched_frame(ring):
+    """形状・dtypeの異なるフレームはエラーになるテスト"""
+    with pytest.raises(ValueError):
+        ring.write(np.zeros((4, 6), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        ring.write(np.zeros((4, 6, 3), dtype=np.float32))
+
+
+def test_attach_reads_layout_from_header(ring):
+    """attach()がヘッダから形状・dtype・スロット数を復元するテスト"""
+    ring.write(frame(9))
+    reader = FrameRing.attach(ring.name)
+    try:
+        assert reader.shape == (4, 6, 3)
+        assert reader.dtype == np.uint8
+        assert reader.slots == 3
+        assert reader.latest() == 1
+        assert reader.read(1).max() == 9
+    finally:
+        reader.close()
+
+
+def test_attach_rejects_other_shared_memory():
+    """フレームリングでない共有メモリへの接続はエラーになるテスト"""
+    shm = shared_memory.SharedMemory(create=True, size=128)
+    try:
+        with pytest.raises(ValueError):
+            FrameRing.attach(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_wait_times_out(ring):
+    """新しいフレームがなければwait()がNoneを返すテスト"""
+    assert ring.wait(0, timeout=0.01) is None
+    ring.write(frame(1))
+    assert ring.wait(0, timeout=0.01) == 1
+
+
+def _read_latest(name, result_queue):
+    reader = FrameRing.attach(name)
+    seq = reader.wait(0, timeout=10.0)
+    result_queue.put((seq, int(reader.read(seq).max())))
+    reader.close()
+
+
+def test_multiple_consumer_processes(ring):
+    """複数の読み出しプロセスが同じフレームを読めるテスト"""
+    context = mp.get_context("spawn")
+    result_queue = context.Queue()
+    ring.write(frame(42))
+    consumers = [context.Process(target=_read_latest, args=(ring.name, result_queue)) for _ in range(2)]
+    for consumer in consumers:
+        consumer.start()
+    results = [result_queue.get(timeout=30) for _ in consumers]
+    for consumer in consumers:
+        consumer.join(timeout=10)
+
+    assert results == [(1, 42), (1, 42)]
+
+
+@pytest.mark.parametrize("method", ["ring", "queue"])
+def test_benchmark_transport(method):
+    """転送ベンチマークが全フレームを届けて結果を返すテスト"""
+    result = benchmark_transport(method, frames=20, shape=(8, 8, 3), slots=2)
+    assert result["method"] == method
+    assert result["frames"] == 19
+    assert result["fps"] > 0
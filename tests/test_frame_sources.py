@@ -0,0 +1,189 @@
+"""
+Unit tests for Frame Sources Module
+"""
+
+import pytest
+import time
+import cv2
+import numpy as np
+from src.frame_sources import (
+    ImageDirectorySource, Pacer, SyntheticSource, VideoFileSource, create_frame_source
+)
+from src.camera_capture import CameraCapture
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    """テスト用の短い動画ファイル（5フレーム、10fps）"""
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(5):
+        writer.write(np.full((48, 64, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    """テスト用の画像ディレクトリ（3枚）"""
+    for i in range(3):
+        cv2.imwrite(str(tmp_path / f"frame_{i:03d}.png"), np.full((24, 32, 3), i * 50, dtype=np.uint8))
+    (tmp_path / "notes.txt").write_text("not an image")
+    return str(tmp_path)
+
+
+def test_pacer_fixed_rate():
+    """Pacerが指定fpsで待つテスト"""
+    pacer = Pacer(100)
+    start = time.monotonic()
+    for _ in range(11):
+        pacer.wait()
+    elapsed = time.monotonic() - start
+
+    assert 0.09 <= elapsed < 0.3
+
+
+def test_pacer_zero_fps_does_not_wait():
+    """fps=0のPacerが待たないテスト"""
+    pacer = Pacer(0)
+    start = time.monotonic()
+    for _ in range(1000):
+        pacer.wait()
+    assert time.monotonic() - start < 0.05
+
+
+def test_synthetic_source_is_deterministic():
+    """合成ソースが決定的なフレームを生成するテスト"""
+    a = SyntheticSource(64, 48, pacing="fast", num_frames=3)
+    b = SyntheticSource(64, 48, pacing="fast", num_frames=3)
+
+    frames_a = [a.read()[1].copy() for _ in range(3)]
+    frames_b = [b.read()[1].copy() for _ in range(3)]
+
+    for fa, fb in zip(frames_a, frames_b):
+        assert fa.shape == (48, 64, 3)
+        assert np.array_equal(fa, fb)
+    assert not np.array_equal(frames_a[0], frames_a[1])
+    assert a.read() == (False, None)
+
+
+def test_synthetic_source_writes_into_buffer():
+    """書き込み先バッファにそのままフレームが書かれるテスト"""
+    source = SyntheticSource(64, 48, pacing="fast")
+    buffer = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    ret, frame = source.read(buffer)
+
+    assert ret is True
+    assert frame is buffer
+    assert buffer.any()
+
+
+def test_synthetic_source_returns_fresh_frames():
+    """書き込み先を渡さなければ毎回新しい配列が返るテスト"""
+    source = SyntheticSource(64, 48, pacing="fast")
+
+    _, first = source.read()
+    snapshot = first.copy()
+    _, second = source.read()
+
+    assert second is not first
+    assert np.array_equal(first, snapshot)
+
+
+def test_video_file_source(video_file):
+    """動画ファイルソースが全フレームを読んで終端で止まるテスト"""
+    source = VideoFileSource(video_file, pacing="fast")
+
+    assert source.isOpened()
+    assert source.get(cv2.CAP_PROP_FPS) == pytest.approx(10.0)
+    frames = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(frame)
+    source.release()
+
+    assert len(frames) == 5
+    assert frames[0].shape == (48, 64, 3)
+    assert source.isOpened() is False
+
+
+def test_video_file_source_loop(video_file):
+    """loop有効時に終端で先頭に戻るテスト"""
+    source = VideoFileSource(video_file, pacing="fast", loop=True)
+    results = [source.read()[0] for _ in range(12)]
+    assert all(results)
+
+
+def test_video_file_source_missing(tmp_path):
+    """存在しないファイルは開けないテスト"""
+    source = VideoFileSource(str(tmp_path / "missing.avi"))
+    assert source.isOpened() is False
+    assert source.read() == (False, None)
+
+
+def test_image_directory_source(image_dir):
+    """画像ディレクトリをファイル名順に読むテスト"""
+    source = ImageDirectorySource(image_dir, pacing="fast")
+
+    assert len(source.files) == 3
+    values = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        values.append(int(frame[0, 0, 0]))
+
+    assert values == [0, 50, 100]
+    assert source.get(cv2.CAP_PROP_FRAME_WIDTH) == 32.0
+
+
+def test_realtime_pacing_uses_native_fps(video_file):
+    """realtimeでは動画本来のfps（10fps）で払い出すテスト"""
+    source = VideoFileSource(video_file, pacing="realtime")
+    start = time.monotonic()
+    for _ in range(3):
+        source.read()
+    assert time.monotonic() - start >= 0.18
+
+
+def test_create_frame_source_unknown():
+    """未知のソース・ペーシングでエラーになるテスト"""
+    with pytest.raises(ValueError):
+        create_frame_source({"source": "webcam"})
+    with pytest.raises(ValueError):
+        create_frame_source({"source": "synthetic", "pacing": "slow"})
+
+
+def test_camera_capture_with_synthetic_source():
+    """CameraCaptureが合成ソースで同じインターフェースで動くテスト"""
+    camera = CameraCapture({
+        "source": "synthetic", "width": 64, "height": 48,
+        "pacing": "fast", "num_frames": 4
+    })
+
+    assert camera.start() is True
+    frames = [camera.get_frame() for _ in range(5)]
+    camera.stop()
+
+    assert [ret for ret, _ in frames] == [True, True, True, True, False]
+    assert frames[0][1].shape == (48, 64, 3)
+
+
+def test_camera_capture_threaded_with_synthetic_source():
+    """スレッドモードと合成ソースの組み合わせのテスト"""
+    camera = CameraCapture({
+        "source": "synthetic", "width": 64, "height": 48,
+        "pacing": "fixed", "fps": 200, "threaded": True
+    })
+
+    assert camera.start() is True
+    try:
+        ret, frame, seq, _ = camera.read_latest(timeout=1.0)
+        assert ret is True
+        assert frame.shape == (48, 64, 3)
+        assert seq >= 1
+    finally:
+        camera.stop()
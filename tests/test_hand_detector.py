@@ -7,6 +7,7 @@ import pytest
 import numpy as np
 import cv2
 from src.hand_detector import HandDetector
+from src.landmarks import HandLandmarks
 
 
 @pytest.fixture
@@ -125,7 +126,7 @@ def test_landmarks_format(hand_detector):
         assert "landmarks" in hand
         assert "confidence" in hand
         assert hand["label"] in ["Left", "Right"]
-        assert isinstance(hand["landmarks"], list)
+        assert isinstance(hand["landmarks"], HandLandmarks)
         assert isinstance(hand["confidence"], float)
 
         # ランドマークが21個あることを確認
@@ -134,3 +135,274 @@ def test_landmarks_format(hand_detector):
             # 各ランドマークが[x, y, z]の形式であることを確認
             for landmark in hand["landmarks"]:
                 assert len(landmark) == 3
+
+
+def _fake_results(points):
+    """hands.process()の結果を模したオブジェクト（1つの手、21点とも同じ座標のリスト）"""
+    from types import SimpleNamespace
+
+    hands = []
+    handedness = []
+    for x, y in points:
+        landmark = [SimpleNamespace(x=x, y=y, z=0.1) for _ in range(21)]
+        # 手首だけ少しずらしてバウンディングボックスに幅を持たせる
+        landmark[0] = SimpleNamespace(x=x + 0.05, y=y + 0.05, z=0.1)
+        hands.append(SimpleNamespace(landmark=landmark))
+        handedness.append(SimpleNamespace(classification=[SimpleNamespace(label="Right", score=0.9)]))
+    return SimpleNamespace(multi_hand_landmarks=hands or None, multi_handedness=handedness or None)
+
+
+@pytest.fixture
+def roi_detector():
+    """ROIモードのHandDetector（hands.processは差し替える）"""
+    detector = HandDetector({
+        "model_complexity": 0,
+        "roi_enabled": True,
+        "roi_margin": 0.5,
+        "roi_redetect_interval": 3
+    })
+    detector.hands.close()
+    return detector
+
+
+def test_roi_crops_around_previous_hand(roi_detector):
+    """前フレームの手の周辺だけを検出器に渡し、座標を全体に戻すテスト"""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    shapes = []
+
+    def process(image):
+        shapes.append(image.shape)
+        return _fake_results([(0.5, 0.5)])
+
+    roi_detector.hands.process = process
+
+    first = roi_detector.detect(frame)
+    assert shapes[0] == (720, 1280, 3)
+    x0, y0, x1, y1 = roi_detector.roi
+    assert x1 - x0 == y1 - y0 < 720
+
+    second = roi_detector.detect(frame)
+    assert shapes[1] == (y1 - y0, x1 - x0, 3)
+    assert second["hand_count"] == 1
+
+    # ROIの中心 (0.5, 0.5) はフレーム全体での ROI 中心に戻る
+    landmarks = second["hands"][0]["landmarks"].array
+    assert landmarks[1, 0] == pytest.approx((x0 + x1) / 2 / 1280, abs=1e-6)
+    assert landmarks[1, 1] == pytest.approx((y0 + y1) / 2 / 720, abs=1e-6)
+    assert landmarks[1, 2] == pytest.approx(0.1 * (x1 - x0) / 1280, abs=1e-6)
+    assert first["hands"][0]["landmarks"].array[1, 0] == pytest.approx(0.5)
+
+
+def test_roi_redetects_full_frame_on_loss(roi_detector):
+    """ROI内で手を見失ったら同じフレームを全体で検出し直すテスト"""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    shapes = []
+    results = [_fake_results([(0.3, 0.3)]), _fake_results([]), _fake_results([(0.7, 0.7)])]
+
+    def process(image):
+        shapes.append(image.shape)
+        return results.pop(0)
+
+    roi_detector.hands.process = process
+    roi_detector.detect(frame)
+    result = roi_detector.detect(frame)
+
+    assert shapes[1] != (720, 1280, 3)
+    assert shapes[2] == (720, 1280, 3)
+    assert result["hand_count"] == 1
+    assert result["hands"][0]["landmarks"].array[1, 0] == pytest.approx(0.7)
+
+
+def test_roi_periodic_full_frame_redetect(roi_detector):
+    """roi_redetect_intervalごとにフレーム全体で検出するテスト"""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    shapes = []
+
+    def process(image):
+        shapes.append(image.shape)
+        return _fake_results([(0.5, 0.5)])
+
+    roi_detector.hands.process = process
+    for _ in range(7):
+        roi_detector.detect(frame)
+
+    full = [i for i, shape in enumerate(shapes) if shape == (720, 1280, 3)]
+    assert full == [0, 3, 6]
+
+
+def test_roi_downscale(roi_detector):
+    """roi_max_sizeを超える領域は縮小して渡すテスト"""
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    roi_detector.roi_max_size = 64
+    roi_detector.roi = (100, 100, 400, 400)
+    roi_detector._frames_since_full = 1
+    shapes = []
+
+    def process(image):
+        shapes.append(image.shape)
+        return _fake_results([(0.5, 0.5)])
+
+    roi_detector.hands.process = process
+    result = roi_detector.detect(frame)
+
+    assert shapes == [(64, 64, 3)]
+    # 縮小しても正規化座標はROIを基準に戻る
+    assert result["hands"][0]["landmarks"].array[1, 0] == pytest.approx(250 / 1280, abs=1e-6)
+
+
+def test_compute_roi_stays_inside_frame(roi_detector):
+    """フレーム端の手でもROIがフレーム内に収まるテスト"""
+    hands = [{"landmarks": HandLandmarks(np.full((21, 3), 0.99, dtype=np.float32))}]
+    hands[0]["landmarks"].array[0, :2] = 0.9
+
+    x0, y0, x1, y1 = roi_detector.compute_roi(hands, 1280, 720)
+
+    assert 0 <= x0 < x1 <= 1280
+    assert 0 <= y0 < y1 <= 720
+
+
+@pytest.fixture
+def reuse_detector():
+    """バッファ再利用モードのHandDetector（hands.processは差し替える）"""
+    detector = HandDetector({"model_complexity": 0, "reuse_buffers": True})
+    detector.hands.close()
+    return detector
+
+
+def test_reuse_buffers_converts_into_same_buffer(reuse_detector):
+    """RGB変換が毎回同じバッファに書き込まれるテスト"""
+    addresses = []
+    converted = []
+
+    def process(image):
+        addresses.append(image.__array_interface__["data"][0])
+        converted.append(image[0, 0].tolist())
+        return _fake_results([])
+
+    reuse_detector.hands.process = process
+    for blue in (10, 20, 30):
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        frame[..., 0] = blue
+        reuse_detector.detect(frame)
+
+    assert len(set(addresses)) == 1
+    assert converted == [[0, 0, 10], [0, 0, 20], [0, 0, 30]]
+
+
+def test_reuse_buffers_with_varying_roi(reuse_detector):
+    """ROIの大きさが変わってもバッファを広げて使い回すテスト"""
+    reuse_detector.roi_enabled = True
+    frame = np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    images = []
+
+    def process(image):
+        images.append(image.copy())
+        return _fake_results([(0.5, 0.5)])
+
+    reuse_detector.hands.process = process
+    for roi in (None, (100, 100, 300, 300), (0, 0, 150, 150)):
+        reuse_detector.roi = roi
+        reuse_detector._frames_since_full = 1
+        reuse_detector.detect(frame)
+
+    assert images[0].shape == (720, 1280, 3)
+    np.testing.assert_array_equal(images[1], cv2.cvtColor(frame[100:300, 100:300], cv2.COLOR_BGR2RGB))
+    np.testing.assert_array_equal(images[2], cv2.cvtColor(frame[0:150, 0:150], cv2.COLOR_BGR2RGB))
+    assert reuse_detector._buffers["rgb"].size == 720 * 1280 * 3
+
+
+def test_reuse_buffers_steady_state_allocations(reuse_detector):
+    """定常状態でフレーム大の確保が発生しないテスト"""
+    import tracemalloc
+
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    reuse_detector.hands.process = lambda image: _fake_results([])
+    reuse_detector.detect(frame)
+
+    tracemalloc.start()
+    try:
+        for _ in range(10):
+            reuse_detector.detect(frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < frame.nbytes / 10
+
+
+def test_draw_landmarks_uses_pooled_buffer(reuse_detector):
+    """描画が共有バッファに行われ、元のフレームを変更しないテスト"""
+    from unittest.mock import patch
+
+    frame = np.full((120, 160, 3), 7, dtype=np.uint8)
+    with patch.object(reuse_detector.mp_drawing, "draw_landmarks") as draw:
+        first = reuse_detector.draw_landmarks(frame, None)
+        second = reuse_detector.draw_landmarks(frame, None)
+
+    assert draw.call_args.args[0] is second
+    assert np.shares_memory(first, second)
+    assert not np.shares_memory(first, frame)
+    np.testing.assert_array_equal(second, frame)
+
+
+def test_set_model_complexity_rebuilds_only_on_change():
+    """モデルの複雑度が変わるときだけHandsを作り直すテスト"""
+    detector = HandDetector({"model_complexity": 0})
+    hands = detector.hands
+
+    assert detector.set_model_complexity(0) is False
+    assert detector.hands is hands
+    assert detector.set_model_complexity(1) is True
+    assert detector.hands is not hands
+    assert detector.model_complexity == 1
+    detector.hands.close()
+
+
+def test_warmup_runs_black_frames():
+    """ウォームアップが指定した大きさの黒画像で指定回数検出するテスト"""
+    from unittest.mock import patch
+
+    detector = HandDetector({"model_complexity": 0})
+    with patch.object(detector, "detect") as detect:
+        detector.warmup(320, 240, frames=2)
+    detector.hands.close()
+
+    assert detect.call_count == 2
+    frame = detect.call_args.args[0]
+    assert frame.shape == (240, 320, 3)
+    assert not frame.any()
+
+
+@pytest.mark.parametrize("config, expected", [
+    ({}, False),
+    ({"static_image_mode": True}, True),
+    ({"roi_enabled": True}, True),
+])
+def test_hands_static_image_mode_flag(config, expected):
+    """ROIモードではstatic_image_modeでHandsが作られるテスト（作り直しでも同じ）"""
+    from unittest.mock import patch
+
+    with patch("mediapipe.solutions.hands.Hands") as hands_class:
+        detector = HandDetector(dict(config, model_complexity=0))
+        detector.set_model_complexity(1)
+
+    assert hands_class.call_count == 2
+    for call in hands_class.call_args_list:
+        assert call.kwargs["static_image_mode"] is expected
+    assert detector.static_image_mode is expected
+
+
+def test_input_scale_downscales_frame(reuse_detector):
+    """input_scaleで縮小した画像を検出器に渡すテスト"""
+    shapes = []
+
+    def process(image):
+        shapes.append(image.shape)
+        return _fake_results([(0.5, 0.5)])
+
+    reuse_detector.hands.process = process
+    reuse_detector.input_scale = 0.5
+    result = reuse_detector.detect(np.zeros((720, 1280, 3), dtype=np.uint8))
+
+    assert shapes == [(360, 640, 3)]
+    assert result["hands"][0]["landmarks"].array[1, 0] == pytest.approx(0.5)
@@ -0,0 +1,73 @@
+"""
+Unit tests for Hand Identity Module
+"""
+
+import pytest
+import numpy as np
+from src.hand_identity import HandIdentityTracker
+from src.landmarks import HandLandmarks
+
+
+def make_hand(label, x, y):
+    """重心が (x, y) の手"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, 0] = x
+    points[:, 1] = y
+    return {"label": label, "landmarks": HandLandmarks(points), "confidence": 0.9}
+
+
+@pytest.fixture
+def tracker():
+    return HandIdentityTracker({"max_distance": 0.2, "expire_after": 0.5})
+
+
+def test_ids_follow_hands_when_order_changes(tracker):
+    """検出順が入れ替わってもIDが手に付いていくテスト"""
+    assert tracker.assign([make_hand("Left", 0.2, 0.5), make_hand("Right", 0.8, 0.5)], 0.0) == [0, 1]
+    assert tracker.assign([make_hand("Right", 0.79, 0.5), make_hand("Left", 0.21, 0.5)], 0.03) == [1, 0]
+
+
+def test_ids_stable_while_hands_cross(tracker):
+    """同じラベルの2つの手が交差するときも、動きの連続性でIDを保つテスト"""
+    ids = []
+    for step in range(11):
+        a = 0.2 + step * 0.06
+        b = 0.8 - step * 0.06
+        hands = [make_hand("Right", a, 0.5), make_hand("Right", b, 0.55)]
+        # MediaPipeは左から順に返すことがある
+        hands.sort(key=lambda hand: hand["landmarks"].array[0, 0])
+        tracker.assign(hands, step * 0.03)
+        ids.append({hand["hand_id"]: round(float(hand["landmarks"].array[0, 1]), 2) for hand in hands})
+
+    assert all(frame == {0: 0.5, 1: 0.55} for frame in ids)
+
+
+def test_track_age(tracker):
+    """追跡年齢が観測フレーム数で増えるテスト"""
+    for i in range(3):
+        hands = [make_hand("Right", 0.5, 0.5)]
+        tracker.assign(hands, i * 0.03)
+    assert hands[0]["track_age"] == 3
+
+
+def test_expired_track_releases_id(tracker):
+    """一定時間見えなかった追跡は破棄され、IDが再利用されるテスト"""
+    tracker.assign([make_hand("Left", 0.2, 0.5), make_hand("Right", 0.8, 0.5)], 0.0)
+    tracker.assign([make_hand("Right", 0.8, 0.5)], 0.4)
+
+    # Leftは0.9秒見えていないので破棄、ID 0 は新しい手に使われる
+    hands = [make_hand("Right", 0.8, 0.5), make_hand("Left", 0.1, 0.1)]
+    assert tracker.assign(hands, 0.9) == [1, 0]
+    assert hands[1]["track_age"] == 1
+
+
+def test_far_jump_is_new_hand(tracker):
+    """max_distanceを超えて離れた手は別の手とみなすテスト"""
+    tracker.assign([make_hand("Right", 0.1, 0.1)], 0.0)
+    assert tracker.assign([make_hand("Right", 0.9, 0.9)], 0.03) == [1]
+
+
+def test_label_breaks_ties(tracker):
+    """等距離ならラベルが一致する追跡を選ぶテスト"""
+    tracker.assign([make_hand("Left", 0.4, 0.5), make_hand("Right", 0.6, 0.5)], 0.0)
+    assert tracker.assign([make_hand("Right", 0.5, 0.5)], 0.03) == [1]
@@ -9,6 +9,10 @@ Agent5が実装
 import pytest
 from unittest.mock import Mock, patch, MagicMock, mock_open
 import sys
+import queue
+import subprocess
+import threading
+import time
 import os
 import yaml
 import numpy as np
@@ -18,6 +22,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from main import HandTrackingApp
+from landmarks import HandLandmarks
 
 
 @pytest.fixture
@@ -90,6 +95,9 @@ def mock_modules():
             "wrist_to_pinky": {"distance": 13.2, "unit": "cm"}
         }
     }
+    measurement_mock.calculate_distances_for_hands.side_effect = lambda hands: [
+        measurement_mock.calculate_distances.return_value for _ in hands
+    ]
 
     # DataSender モック
     sender_mock = Mock()
@@ -129,10 +137,10 @@ class TestHandTrackingApp:
         with pytest.raises(FileNotFoundError):
             app = HandTrackingApp(config_path="nonexistent_config.yaml")
 
-    @patch('main.CameraCapture')
-    @patch('main.HandDetector')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
     @patch('main.JointMeasurement')
-    @patch('main.DataSender')
+    @patch('data_sender.DataSender')
     def test_initialization_success(
         self, mock_sender_class, mock_measurement_class,
         mock_detector_class, mock_camera_class, mock_config, tmp_path
@@ -163,10 +171,10 @@ class TestHandTrackingApp:
         camera_mock.start.assert_called_once()
         sender_mock.connect.assert_called_once()
 
-    @patch('main.CameraCapture')
-    @patch('main.HandDetector')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
     @patch('main.JointMeasurement')
-    @patch('main.DataSender')
+    @patch('data_sender.DataSender')
     def test_initialization_camera_failure(
         self, mock_sender_class, mock_measurement_class,
         mock_detector_class, mock_camera_class, mock_config, tmp_path
@@ -192,10 +200,10 @@ class TestHandTrackingApp:
 
         assert result is False
 
-    @patch('main.CameraCapture')
-    @patch('main.HandDetector')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
     @patch('main.JointMeasurement')
-    @patch('main.DataSender')
+    @patch('data_sender.DataSender')
     def test_main_loop_with_hand_detection(
         self, mock_sender_class, mock_measurement_class,
         mock_detector_class, mock_camera_class, mock_config, tmp_path
@@ -274,10 +282,41 @@ class TestHandTrackingApp:
         assert measurement_mock.calculate_distances.call_count >= 1
         assert sender_mock.send_data.call_count >= 1
 
-    @patch('main.CameraCapture')
-    @patch('main.HandDetector')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
     @patch('main.JointMeasurement')
-    @patch('main.DataSender')
+    @patch('data_sender.DataSender')
+    def test_threaded_capture_keeps_grab_seq_and_time(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """スレッドモードではグラバーの連番と取得時刻がフレームに付くテスト"""
+        camera_mock = mock_modules["camera"]
+        camera_mock.threaded = True
+        grabbed_at = time.time() - 0.5
+        camera_mock.read_latest.return_value = (True, np.zeros((720, 1280, 3), dtype=np.uint8), 7, grabbed_at)
+        mock_camera_class.return_value = camera_mock
+        mock_detector_class.return_value = mock_modules["detector"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        mock_sender_class.return_value = mock_modules["sender"]
+
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        item = app.capture_frame()
+
+        camera_mock.get_frame.assert_not_called()
+        assert item["capture_seq"] == 7
+        assert item["captured_at"] == grabbed_at
+        # 取得してから0.5秒経ったフレームとして扱われる
+        assert time.monotonic() - item["capture_time"] >= 0.5
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
     def test_cleanup(
         self, mock_sender_class, mock_measurement_class,
         mock_detector_class, mock_camera_class, mock_config, tmp_path
@@ -306,10 +345,10 @@ class TestHandTrackingApp:
         camera_mock.stop.assert_called_once()
         sender_mock.disconnect.assert_called_once()
 
-    @patch('main.CameraCapture')
-    @patch('main.HandDetector')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
     @patch('main.JointMeasurement')
-    @patch('main.DataSender')
+    @patch('data_sender.DataSender')
     def test_handle_shutdown(
         self, mock_sender_class, mock_measurement_class,
         mock_detector_class, mock_camera_class, mock_config, tmp_path
@@ -335,6 +374,769 @@ class TestHandTrackingApp:
         # runningがFalseになったことを確認
         assert app.running is False
 
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_main_loop_pipelined(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """パイプラインモードでのメインループのテスト"""
+        mock_camera_class.return_value = mock_modules["camera"]
+        mock_detector_class.return_value = mock_modules["detector"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        mock_config["pipeline"] = {
+            "enabled": True,
+            "queue_size": 2,
+            "backpressure": "block",
+            "stats_interval": 0.05
+        }
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 5:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+
+        loop = threading.Thread(target=app.main_loop)
+        loop.start()
+        loop.join(timeout=5.0)
+
+        assert not loop.is_alive()
+        assert sender_mock.send_data.call_count >= 5
+        sent = sender_mock.send_data.call_args_list[0].args[0]
+        assert sent["hand_data"]["hand_count"] == 1
+        assert sent["hand_data"]["measurements"][0]["label"] == "Right"
+
+        stats = app.pipeline.get_stats()
+        assert list(stats) == ["capture", "detect", "measure", "send"]
+        assert stats["send"]["processed"] >= 5
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_metrics_endpoint(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """メトリクス有効時にステージのレイテンシと送信統計が公開されるテスト"""
+        import requests
+
+        mock_camera_class.return_value = mock_modules["camera"]
+        mock_detector_class.return_value = mock_modules["detector"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        sender_mock.async_send = False
+        sender_mock.transport = None
+        sender_mock.spool = None
+        sender_mock.get_stats.return_value = {
+            "dropped": 0, "queue_depth": 0, "send_failures": 2, "retries": 4
+        }
+        mock_sender_class.return_value = sender_mock
+
+        mock_config["metrics"] = {"enabled": True, "host": "127.0.0.1", "port": 0}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        assert app.initialize() is True
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 3:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        try:
+            app.main_loop()
+            url = f"http://127.0.0.1:{app.metrics_server.port}/metrics"
+            response = requests.get(url, timeout=5)
+        finally:
+            app.cleanup()
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        text = response.text
+        for stage in ("capture", "detect", "measure", "send"):
+            assert f'hand_tracker_stage_latency_seconds_count{{stage="{stage}"}} 3' in text
+        assert "hand_tracker_frames_total 3" in text
+        assert "hand_tracker_send_failures_total 2" in text
+        assert "hand_tracker_send_retries_total 4" in text
+        assert 'hand_tracker_dropped_frames_total{where="send_async"} 0' in text
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_cadence_skips_detection_while_idle(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """手がない間は検出を省略するテスト"""
+        camera_mock = mock_modules["camera"]
+        detector_mock = mock_modules["detector"]
+        detector_mock.detect.return_value = {"hand_count": 0, "hands": [], "timestamp": ""}
+        mock_camera_class.return_value = camera_mock
+        mock_detector_class.return_value = detector_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        mock_sender_class.return_value = mock_modules["sender"]
+
+        mock_config["cadence"] = {"enabled": True, "idle_after": 3, "idle_fps": 0}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        frame = np.zeros((72, 128, 3), dtype=np.uint8)
+
+        def get_frame():
+            if camera_mock.get_frame.call_count >= 20:
+                app.running = False
+            return True, frame
+
+        camera_mock.get_frame.side_effect = get_frame
+        app.main_loop()
+
+        assert app.frame_count == 20
+        assert detector_mock.detect.call_count == 3
+        assert app.cadence.state == "idle"
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_tracking_predicts_between_detections(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """detect_everyフレームに1回だけ検出し、間のフレームは予測を送るテスト"""
+        mock_camera_class.return_value = mock_modules["camera"]
+        detector_mock = mock_modules["detector"]
+        detector_mock.detect.side_effect = lambda frame: {
+            "hand_count": 1,
+            "hands": [{
+                "label": "Right",
+                "landmarks": HandLandmarks(np.full((21, 3), 0.5, dtype=np.float32)),
+                "confidence": 0.95
+            }],
+            "timestamp": datetime.now().isoformat()
+        }
+        mock_detector_class.return_value = detector_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        mock_config["tracking"] = {"enabled": True, "detect_every": 3}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 9:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        app.main_loop()
+
+        assert detector_mock.detect.call_count == 3
+        flags = [
+            call.args[0]["hand_data"]["measurements"][0].get("predicted", False)
+            for call in sender_mock.send_data.call_args_list
+        ]
+        assert flags == [False, True, True] * 3
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_smoothing_before_measurement(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """計測前にランドマークが平滑化されるテスト"""
+        mock_camera_class.return_value = mock_modules["camera"]
+        detector_mock = mock_modules["detector"]
+        values = iter([0.0, 0.1, 0.1])
+        detector_mock.detect.side_effect = lambda frame: {
+            "hand_count": 1,
+            "hands": [{
+                "label": "Right",
+                "landmarks": HandLandmarks(np.full((21, 3), next(values), dtype=np.float32)),
+                "confidence": 0.95
+            }],
+            "timestamp": datetime.now().isoformat()
+        }
+        mock_detector_class.return_value = detector_mock
+        measurement_mock = mock_modules["measurement"]
+        measured = []
+        measurement_mock.calculate_distances_for_hands.side_effect = lambda hands: [
+            measured.append(hand.array.copy()) or measurement_mock.calculate_distances.return_value
+            for hand in hands
+        ]
+        mock_measurement_class.return_value = measurement_mock
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        mock_config["smoothing"] = {"enabled": True, "method": "ema", "alpha": 0.5}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 3:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        app.main_loop()
+
+        assert [float(points[0, 0]) for points in measured] == pytest.approx([0.0, 0.05, 0.075])
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_hand_ids_stable_across_frames(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """検出順が入れ替わっても送信するhand_idが手に付いていくテスト"""
+        def hand(label, x):
+            return {
+                "label": label,
+                "landmarks": HandLandmarks(np.full((21, 3), x, dtype=np.float32)),
+                "confidence": 0.95
+            }
+
+        frames = iter([
+            [hand("Left", 0.2), hand("Right", 0.8)],
+            [hand("Right", 0.8), hand("Left", 0.2)],
+        ])
+        mock_camera_class.return_value = mock_modules["camera"]
+        detector_mock = mock_modules["detector"]
+        detector_mock.detect.side_effect = lambda frame: {
+            "hand_count": 2, "hands": next(frames), "timestamp": datetime.now().isoformat()
+        }
+        mock_detector_class.return_value = detector_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 2:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        app.main_loop()
+
+        sent = [
+            {m["label"]: m["hand_id"] for m in call.args[0]["hand_data"]["measurements"]}
+            for call in sender_mock.send_data.call_args_list
+        ]
+        assert sent == [{"Left": 0, "Right": 1}, {"Left": 0, "Right": 1}]
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_recording_raw_detections(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """検出した生のランドマークが記録されるテスト"""
+        from recorder import load_recording
+
+        mock_camera_class.return_value = mock_modules["camera"]
+        mock_detector_class.return_value = mock_modules["detector"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        recording_path = tmp_path / "session.htr"
+        mock_config["recording"] = {"enabled": True, "path": str(recording_path)}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 3:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        app.main_loop()
+        app.cleanup()
+
+        records = load_recording(str(recording_path))
+        assert records["frame_number"].tolist() == [1, 2, 3]
+        assert records["label"].tolist() == [1, 1, 1]
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_autotune_observes_detect_latency(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """自動調整が検出のレイテンシを計測して段階を変えるテスト"""
+        mock_camera_class.return_value = mock_modules["camera"]
+        detector_mock = mock_modules["detector"]
+        detector_mock.model_complexity = 1
+        detector_mock.input_scale = 1.0
+        detector_mock.set_model_complexity.return_value = False
+        mock_detector_class.return_value = detector_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        # 予算0.1ms（達成できない）で1段下げる
+        mock_config["autotune"] = {
+            "enabled": True, "target_fps": 10000, "budget_fraction": 1.0, "window": 3,
+            "levels": [[0, 1.0], [1, 1.0]]
+        }
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        detection = detector_mock.detect.return_value
+        detector_mock.detect.side_effect = lambda frame: time.sleep(0.001) or detection
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 3:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        app.main_loop()
+
+        assert app.autotuner.level == 0
+        detector_mock.set_model_complexity.assert_called_with(0)
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_startup_runs_phases_concurrently(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """カメラ起動・health check・モデル読み込みが並行して行われ、レポートに出るテスト"""
+        delay = 0.2
+        camera_mock = mock_modules["camera"]
+        camera_mock.start.side_effect = lambda: time.sleep(delay) or True
+        mock_camera_class.return_value = camera_mock
+        sender_mock = mock_modules["sender"]
+        sender_mock.connect.side_effect = lambda: time.sleep(delay) or True
+        mock_sender_class.return_value = sender_mock
+        detector_mock = mock_modules["detector"]
+        mock_detector_class.side_effect = lambda config: time.sleep(delay) or detector_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file), warmup=True)
+        # モデルはinitialize()まで読み込まない
+        mock_detector_class.assert_not_called()
+
+        start = time.perf_counter()
+        assert app.initialize() is True
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < delay * 2.5
+        assert app.detector is detector_mock
+        # ウォームアップはカメラ解像度で1回
+        detector_mock.warmup.assert_called_once_with(1280, 720, 1)
+
+        names = {phase["name"] for phase in app.startup.phases}
+        assert {"imports", "config", "logging", "construct",
+                "camera_open", "health_check", "model_load", "warmup"} <= names
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_camera_failure_does_not_wait_for_model(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """カメラの起動に失敗したらモデルの読み込みを待たずに失敗するテスト"""
+        camera_mock = mock_modules["camera"]
+        camera_mock.start.return_value = False
+        mock_camera_class.return_value = camera_mock
+        mock_sender_class.return_value = mock_modules["sender"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        loaded = threading.Event()
+        mock_detector_class.side_effect = lambda config: loaded.wait(5.0) and mock_modules["detector"]
+
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        start = time.perf_counter()
+        assert app.initialize() is False
+        assert time.perf_counter() - start < 1.0
+        loaded.set()
+
+        # cleanup()は読み込みの終了を待ち、中止後に読み込まれた検出器は使わずに閉じる
+        app.cleanup()
+        assert not app._model_load_thread.is_alive()
+        assert app.detector is None
+        mock_modules["detector"].hands.close.assert_called_once()
+
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_model_load_failure_stops_started_camera(
+        self, mock_sender_class, mock_measurement_class,
+        mock_detector_class, mock_camera_class, mock_config, mock_modules, tmp_path
+    ):
+        """カメラの起動後にモデルの読み込みが失敗したら、カメラを止めて終了するテスト"""
+        camera_mock = mock_modules["camera"]
+        mock_camera_class.return_value = camera_mock
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        mock_detector_class.side_effect = RuntimeError("model file missing")
+
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        with pytest.raises(SystemExit) as exc_info:
+            app.run()
+
+        assert exc_info.value.code == 1
+        camera_mock.start.assert_called_once()
+        camera_mock.stop.assert_called_once()
+        sender_mock.disconnect.assert_called_once()
+        assert app.detector is None
+
+    @patch('multi_camera.MultiCameraSource')
+    @patch('detector_pool.DetectorPool')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_warmup_passed_to_worker_processes(
+        self, mock_sender_class, mock_measurement_class, mock_detector_class,
+        mock_camera_class, mock_pool_class, mock_source_class, mock_config, tmp_path
+    ):
+        """検出プールとマルチカメラではウォームアップがワーカーの設定に渡されるテスト"""
+        mock_config["detector_pool"] = {"enabled": True, "workers": 2}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        HandTrackingApp(config_path=str(config_file), warmup=True)
+        pool_config = mock_pool_class.call_args.args[1]
+        assert pool_config["warmup_frames"] == 1
+        assert tuple(pool_config["warmup_size"]) == (1280, 720)
+
+        mock_config["cameras"] = [{"camera_id": 0, "device_id": 0}]
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        HandTrackingApp(config_path=str(config_file), warmup=True)
+        assert mock_source_class.call_args.args[2]["warmup_frames"] == 1
+        mock_detector_class.assert_not_called()
+
+    @patch('detector_pool.DetectorPool')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_detector_pool_results_sent_in_order(
+        self, mock_sender_class, mock_measurement_class, mock_detector_class,
+        mock_camera_class, mock_pool_class, mock_config, mock_modules, tmp_path
+    ):
+        """検出プールの結果がフレーム順に計測・送信されるテスト"""
+        mock_camera_class.return_value = mock_modules["camera"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+        detection = mock_modules["detector"].detect.return_value
+
+        submitted = queue.Queue()
+        pool_mock = Mock()
+        pool_mock.num_workers = 2
+        pool_mock.submit.side_effect = lambda frame, meta, timeout=None: submitted.put(meta)
+
+        def get_result(timeout=0.5):
+            try:
+                meta = submitted.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            # 2フレームごとに検出失敗（None）を混ぜる
+            if meta["frame_number"] % 2:
+                return meta, detection, 0.02
+            return meta, None, None
+
+        pool_mock.get_result.side_effect = get_result
+        mock_pool_class.return_value = pool_mock
+
+        mock_config["detector_pool"] = {"enabled": True, "workers": 2}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        # 検出はワーカープロセス側で行うためメインでは作らない
+        mock_detector_class.assert_not_called()
+        assert app.initialize() is True
+        pool_mock.start.assert_called_once()
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 3:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        app.main_loop()
+
+        sent = [call.args[0]["frame_number"] for call in sender_mock.send_data.call_args_list]
+        assert sent == [1, 3, 5]
+
+        app.cleanup()
+        pool_mock.stop.assert_called_once()
+
+    @patch('detector_pool.DetectorPool')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_detector_pool_metrics(
+        self, mock_sender_class, mock_measurement_class, mock_detector_class,
+        mock_camera_class, mock_pool_class, mock_config, mock_modules, tmp_path
+    ):
+        """検出プールの検出時間・キュー深さ・エラー数・ドロップ数がメトリクスに出るテスト"""
+        import requests
+
+        mock_camera_class.return_value = mock_modules["camera"]
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        sender_mock.async_send = False
+        sender_mock.transport = None
+        sender_mock.spool = None
+        sender_mock.get_stats.return_value = {
+            "dropped": 0, "queue_depth": 0, "send_failures": 0, "retries": 0
+        }
+        mock_sender_class.return_value = sender_mock
+        detection = mock_modules["detector"].detect.return_value
+
+        submitted = queue.Queue()
+        pool_mock = Mock()
+        pool_mock.num_workers = 2
+        pool_mock.stats = {"submitted": 0, "completed": 0, "errors": 2}
+        pool_mock.pending.return_value = 1
+
+        def submit(frame, meta, timeout=None):
+            # 3フレームごとに空きスロットを待ちきれなかったことにする
+            if meta["frame_number"] % 3 == 0:
+                return None
+            submitted.put(meta)
+            return meta["frame_number"]
+
+        def get_result(timeout=0.5):
+            try:
+                meta = submitted.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            return meta, detection, 0.02
+
+        pool_mock.submit.side_effect = submit
+        pool_mock.get_result.side_effect = get_result
+        mock_pool_class.return_value = pool_mock
+
+        mock_config["detector_pool"] = {"enabled": True, "workers": 2}
+        mock_config["metrics"] = {"enabled": True, "host": "127.0.0.1", "port": 0}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        assert app.initialize() is True
+
+        def stop_after_sends(data):
+            if sender_mock.send_data.call_count >= 4:
+                app.running = False
+            return True
+
+        sender_mock.send_data.side_effect = stop_after_sends
+        try:
+            app.main_loop()
+            dropped = app.detector_pool_dropped
+            url = f"http://127.0.0.1:{app.metrics_server.port}/metrics"
+            text = requests.get(url, timeout=5).text
+        finally:
+            app.cleanup()
+
+        sent = [call.args[0]["frame_number"] for call in sender_mock.send_data.call_args_list]
+        assert sent[:4] == [1, 2, 4, 5]
+        assert dropped >= 1
+        assert 'hand_tracker_stage_latency_seconds_count{stage="detect"} 4' in text
+        assert 'hand_tracker_queue_depth{queue="detector_pool"} 1' in text
+        assert "hand_tracker_detector_pool_errors_total 2" in text
+        assert f'hand_tracker_dropped_frames_total{{where="detector_pool"}} {dropped}' in text
+
+
+class TestMultiCameraApp:
+    """マルチカメラモードの HandTrackingApp のテストクラス"""
+
+    @patch('multi_camera.MultiCameraSource')
+    @patch('camera_capture.CameraCapture')
+    @patch('hand_detector.HandDetector')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_multi_camera_results_tagged_with_camera_id(
+        self, mock_sender_class, mock_measurement_class, mock_detector_class,
+        mock_camera_class, mock_source_class, mock_config, mock_modules, tmp_path
+    ):
+        """各カメラの結果がcamera_id付きで送信されるテスト"""
+        detection = mock_modules["detector"].detect.return_value
+        results = [
+            {"camera_id": 0, "frame_number": 1, "detection": detection},
+            {"camera_id": 1, "frame_number": 1, "detection": detection},
+            {"camera_id": 1, "frame_number": 2, "detection": {"hand_count": 0, "hands": []}},
+        ]
+        source_mock = Mock()
+        source_mock.start.return_value = True
+        source_mock.camera_configs = [{"camera_id": 0}, {"camera_id": 1}]
+        source_mock.get_result.side_effect = results + [None]
+        source_mock.is_running.side_effect = [True] * len(results) + [False]
+        mock_source_class.return_value = source_mock
+
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        sender_mock = mock_modules["sender"]
+        mock_sender_class.return_value = sender_mock
+
+        mock_config["cameras"] = [{"camera_id": 0, "device_id": 0}, {"camera_id": 1, "device_id": 1}]
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+
+        # 取得と検出はワーカープロセス側で行うためメインでは作らない
+        mock_camera_class.assert_not_called()
+        mock_detector_class.assert_not_called()
+        camera_configs = mock_source_class.call_args.args[0]
+        assert camera_configs[1]["device_id"] == 1
+        assert camera_configs[1]["width"] == 1280
+
+        assert app.initialize() is True
+        source_mock.start.assert_called_once()
+
+        app.main_loop()
+
+        sent = [call.args[0] for call in sender_mock.send_data.call_args_list]
+        assert [data["camera_id"] for data in sent] == [0, 1]
+
+        app.cleanup()
+        source_mock.stop.assert_called_once()
+
+    @patch('multi_camera.MultiCameraSource')
+    @patch('main.JointMeasurement')
+    @patch('data_sender.DataSender')
+    def test_multi_camera_records_worker_stage_timings(
+        self, mock_sender_class, mock_measurement_class, mock_source_class,
+        mock_config, mock_modules, tmp_path
+    ):
+        """ワーカーが測った取得・検出の処理時間がステージのメトリクスに記録されるテスト"""
+        detection = mock_modules["detector"].detect.return_value
+        results = [
+            {"camera_id": 0, "frame_number": 1, "detection": detection,
+             "timings": {"capture": 0.002, "detect": 0.03}},
+            {"camera_id": 1, "frame_number": 1, "detection": {"hand_count": 0, "hands": []},
+             "timings": {"capture": 0.004, "detect": 0.05}},
+        ]
+        source_mock = Mock()
+        source_mock.get_result.side_effect = results + [None]
+        source_mock.is_running.side_effect = [True] * len(results) + [False]
+        mock_source_class.return_value = source_mock
+        mock_measurement_class.return_value = mock_modules["measurement"]
+        mock_sender_class.return_value = mock_modules["sender"]
+
+        mock_config["cameras"] = [{"camera_id": 0, "device_id": 0}, {"camera_id": 1, "device_id": 1}]
+        mock_config["metrics"] = {"enabled": True, "host": "127.0.0.1", "port": 0}
+        config_file = tmp_path / "test_config.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(mock_config, f)
+
+        app = HandTrackingApp(config_path=str(config_file))
+        app.main_loop()
+
+        _, capture_sum, capture_count = app._stage_histogram("capture").snapshot()
+        _, detect_sum, detect_count = app._stage_histogram("detect").snapshot()
+        assert capture_count == 2 and capture_sum == pytest.approx(0.006)
+        assert detect_count == 2 and detect_sum == pytest.approx(0.08)
+        _, _, measure_count = app._stage_histogram("measure").snapshot()
+        assert measure_count == 1
+
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def test_import_main_does_not_load_heavy_modules():
+    """import mainではcv2・requests・mediapipeを読み込まないテスト（新しいプロセスで確認）"""
+    code = (
+        "import sys, main; "
+        "print(' '.join(m for m in ('cv2', 'requests', 'mediapipe') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_help_does_not_load_heavy_modules():
+    """--helpは重いモジュールを読み込まずに終了するテスト"""
+    code = (
+        "import runpy, sys; sys.argv = ['main.py', '--help']\n"
+        "try:\n    runpy.run_path('main.py', run_name='__main__')\n"
+        "except SystemExit as e:\n    assert e.code == 0\n"
+        "print('loaded:' + ' '.join(m for m in ('cv2', 'requests', 'mediapipe') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert "--warmup" in result.stdout
+    assert result.stdout.splitlines()[-1] == "loaded:"
+
 
 def test_full_pipeline():
     """全体パイプラインのテスト（エンドツーエンド）"""
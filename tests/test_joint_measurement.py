@@ -158,3 +158,89 @@ def test_get_joint_name():
     assert measurement._get_joint_name(0, 12) == "wrist_to_middle"
     assert measurement._get_joint_name(0, 16) == "wrist_to_ring"
     assert measurement._get_joint_name(0, 20) == "wrist_to_pinky"
+
+
+def test_joint_names_precomputed():
+    """関節名が初期化時に計算されるテスト"""
+    config = {
+        "landmarks_to_measure": [[0, 4], [4, 8], [3, 7]],
+        "unit": "cm",
+        "scale_factor": 1.0
+    }
+    measurement = JointMeasurement(config)
+
+    assert measurement.joint_names == [
+        "wrist_to_thumb", "thumb_to_index", "landmark_3_to_landmark_7"
+    ]
+
+
+def test_calculate_distances_for_hands():
+    """複数の手の一括計算が手ごとの計算と一致するテスト"""
+    config = {
+        "landmarks_to_measure": [[0, 4], [0, 8], [0, 12], [0, 16], [0, 20]],
+        "unit": "cm",
+        "scale_factor": 10.0
+    }
+    measurement = JointMeasurement(config)
+    rng = np.random.default_rng(0)
+    hands = rng.random((2, 21, 3)).tolist()
+
+    results = measurement.calculate_distances_for_hands(hands)
+
+    assert len(results) == 2
+    for hand, result in zip(hands, results):
+        assert result == measurement.calculate_distances(hand)
+    assert measurement.calculate_distances_for_hands([]) == []
+
+
+def test_compute_distance_array_batch_shapes():
+    """(N_frames, N_hands, 21, 3) の配列を一括計算できるテスト"""
+    config = {
+        "landmarks_to_measure": [[0, 4], [0, 8]],
+        "unit": "cm",
+        "scale_factor": 2.0
+    }
+    measurement = JointMeasurement(config)
+    rng = np.random.default_rng(1)
+    frames = rng.random((100, 2, 21, 3))
+
+    distances = measurement.compute_distance_array(frames)
+
+    assert distances.shape == (100, 2, 2)
+    expected = np.linalg.norm(frames[:, :, 0] - frames[:, :, 4], axis=-1) * 2.0
+    np.testing.assert_allclose(distances[:, :, 0], expected)
+
+
+def test_calculate_distances_with_landmark_container():
+    """HandLandmarksをそのまま受け取れるテスト"""
+    from src.landmarks import HandLandmarks
+
+    config = {
+        "landmarks_to_measure": [[0, 4], [0, 8]],
+        "unit": "cm",
+        "scale_factor": 10.0
+    }
+    measurement = JointMeasurement(config)
+    values = [[i * 0.1, i * 0.1, 0.0] for i in range(21)]
+
+    result = measurement.calculate_distances(HandLandmarks.from_list(values))
+    expected = measurement.calculate_distances(np.asarray(values, dtype=np.float32))
+
+    assert result == expected
+    assert measurement.calculate_distances_for_hands([HandLandmarks.from_list(values)]) == [expected]
+
+
+def test_compute_distance_array_keeps_float32():
+    """float32の入力がfloat64に昇格せずに計算されるテスト"""
+    config = {
+        "landmarks_to_measure": [[0, 4]],
+        "unit": "cm",
+        "scale_factor": 10.0
+    }
+    measurement = JointMeasurement(config)
+    hands = np.zeros((2, 21, 3), dtype=np.float32)
+    hands[:, 4] = [0.3, 0.4, 0.0]
+
+    assert measurement.compute_distance_array(hands).dtype == np.float32
+    results = measurement.calculate_distances_for_hands(list(hands))
+    assert [r["measurements"]["wrist_to_thumb"]["distance"] for r in results] == [5.0, 5.0]
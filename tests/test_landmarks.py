@@ -0,0 +1,81 @@
+"""
+Unit tests for Hand Landmarks Container
+"""
+
+import pytest
+import json
+import numpy as np
+from src.landmarks import HandLandmarks, NUM_LANDMARKS
+from src.serializers import JsonSerializer
+
+
+class MockLandmark:
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class MockHandLandmarks:
+    def __init__(self):
+        self.landmark = [MockLandmark(i * 0.01, i * 0.02, -i * 0.001) for i in range(21)]
+
+
+def test_from_mediapipe():
+    """MediaPipeのランドマークから (21, 3) float32配列が作られるテスト"""
+    landmarks = HandLandmarks.from_mediapipe(MockHandLandmarks())
+
+    assert landmarks.array.shape == (NUM_LANDMARKS, 3)
+    assert landmarks.array.dtype == np.float32
+    assert landmarks.array.flags["C_CONTIGUOUS"]
+    np.testing.assert_allclose(landmarks[4], [0.04, 0.08, -0.004], rtol=1e-6)
+
+
+def test_no_per_instance_dict():
+    """__slots__により点ごとのPythonオブジェクトを持たないテスト"""
+    landmarks = HandLandmarks(np.zeros((21, 3)))
+
+    assert not hasattr(landmarks, "__dict__")
+    with pytest.raises(AttributeError):
+        landmarks.extra = 1
+
+
+def test_invalid_shape():
+    """形状が不正な場合にエラーになるテスト"""
+    with pytest.raises(ValueError):
+        HandLandmarks(np.zeros((20, 3)))
+
+
+def test_array_protocol_is_zero_copy():
+    """np.asarrayがコピーせずに内部配列を返すテスト"""
+    landmarks = HandLandmarks(np.ones((21, 3), dtype=np.float32))
+
+    assert np.asarray(landmarks) is landmarks.array
+    assert np.asarray(landmarks, dtype=np.float64).dtype == np.float64
+
+
+def test_list_compatibility():
+    """リスト形式との互換性（len、反復、比較、tolist）のテスト"""
+    values = [[float(i), float(i) + 0.5, 0.0] for i in range(21)]
+    landmarks = HandLandmarks.from_list(values)
+
+    assert len(landmarks) == 21
+    assert all(len(point) == 3 for point in landmarks)
+    assert landmarks.tolist() == values
+    assert landmarks == values
+    assert values == landmarks
+    assert landmarks != [[0.0, 0.0, 0.0]] * 21
+
+
+def test_json_edge_conversion():
+    """JSONに出す時点でだけリストに変換されるテスト"""
+    landmarks = HandLandmarks(np.full((21, 3), 0.5, dtype=np.float32))
+    payload = {"hand_data": {"measurements": [{"hand_id": 0, "landmarks": landmarks}]}}
+    serializer = JsonSerializer()
+
+    converted = serializer.to_jsonable(payload)
+    assert converted["hand_data"]["measurements"][0]["landmarks"] == [[0.5, 0.5, 0.5]] * 21
+    assert payload["hand_data"]["measurements"][0]["landmarks"] is landmarks
+
+    decoded = json.loads(serializer.encode(payload))
+    assert decoded == converted
@@ -0,0 +1,114 @@
+"""
+Unit tests for Metrics Module
+"""
+
+import pytest
+import time
+import requests
+from src.metrics import Histogram, MetricsRegistry, MetricsServer, RateMeter
+
+
+def test_histogram_buckets():
+    """ヒストグラムのバケット集計のテスト"""
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+
+    for value in (0.005, 0.01, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    cumulative, total, count = histogram.snapshot()
+    # 上限ちょうどの値はそのバケットに入る（le = less than or equal）
+    assert cumulative == [2, 3, 4, 5]
+    assert total == pytest.approx(2.565)
+    assert count == 5
+
+
+def test_histogram_invalid_buckets():
+    """昇順でないバケットのエラーハンドリングテスト"""
+    with pytest.raises(ValueError):
+        Histogram(buckets=(0.1, 0.01))
+    with pytest.raises(ValueError):
+        Histogram(buckets=())
+
+
+def test_registry_returns_same_child():
+    """同じ名前・ラベルで同じインスタンスが返るテスト"""
+    registry = MetricsRegistry()
+
+    a = registry.counter("requests_total", "Requests", labels={"code": "200"})
+    b = registry.counter("requests_total", "Requests", labels={"code": "200"})
+    c = registry.counter("requests_total", "Requests", labels={"code": "500"})
+
+    assert a is b
+    assert a is not c
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests")
+
+
+def test_render_prometheus_text():
+    """Prometheusテキスト形式の出力テスト"""
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Frames").inc(3)
+    registry.gauge("temperature", "Temp", labels={"room": 'a"b'}).set(21.5)
+    registry.histogram("latency_seconds", "Latency", labels={"stage": "detect"},
+                       buckets=(0.1, 1.0)).observe(0.5)
+    registry.register_callback("queue_depth", "gauge", "Depth",
+                               lambda: [({"queue": "send"}, 4)])
+    registry.register_callback("fps", "gauge", "FPS", lambda: 29.97)
+
+    text = registry.render()
+
+    assert "# TYPE frames_total counter\nframes_total 3\n" in text
+    assert 'temperature{room="a\\"b"} 21.5' in text
+    assert 'latency_seconds_bucket{stage="detect",le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{stage="detect",le="1"} 1' in text
+    assert 'latency_seconds_bucket{stage="detect",le="+Inf"} 1' in text
+    assert 'latency_seconds_sum{stage="detect"} 0.5' in text
+    assert 'latency_seconds_count{stage="detect"} 1' in text
+    assert 'queue_depth{queue="send"} 4' in text
+    assert "fps 29.97" in text
+    assert text.endswith("\n")
+
+
+def test_callback_error_does_not_break_render():
+    """コールバックが失敗しても他のメトリクスは出力されるテスト"""
+    registry = MetricsRegistry()
+    registry.register_callback("broken", "gauge", "Broken", lambda: 1 / 0)
+    registry.counter("ok_total", "OK").inc()
+
+    text = registry.render()
+
+    assert "# ERROR broken" in text
+    assert "ok_total 1" in text
+
+
+def test_rate_meter():
+    """レート計測のテスト"""
+    meter = RateMeter(window=0.05)
+    assert meter.value() == 0.0
+
+    end = time.monotonic() + 0.12
+    while time.monotonic() < end:
+        meter.tick()
+        time.sleep(0.005)
+
+    assert meter.value() > 0
+    time.sleep(0.15)
+    # 更新が止まったら0に落ちる
+    assert meter.value() == 0.0
+
+
+def test_metrics_server():
+    """メトリクスエンドポイントのテスト"""
+    registry = MetricsRegistry()
+    registry.counter("frames_total", "Frames").inc(7)
+    server = MetricsServer(registry, port=0)
+    assert server.start() is True
+    try:
+        response = requests.get(f"http://127.0.0.1:{server.port}/metrics", timeout=5)
+        missing = requests.get(f"http://127.0.0.1:{server.port}/other", timeout=5)
+    finally:
+        server.stop()
+
+    assert response.status_code == 200
+    assert "frames_total 7" in response.text
+    assert missing.status_code == 404
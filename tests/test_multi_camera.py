@@ -0,0 +1,75 @@
+"""
+Unit tests for Multi-Camera Module
+"""
+
+import pytest
+import cv2
+import numpy as np
+from src.multi_camera import MultiCameraSource
+
+
+DETECTION_CONFIG = {
+    "model_complexity": 0,
+    "min_detection_confidence": 0.5,
+    "min_tracking_confidence": 0.5,
+    "max_num_hands": 2
+}
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    """テスト用の短い動画ファイル（10フレーム）"""
+    path = tmp_path / "source.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(10):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def test_multi_camera_merges_streams(video_file):
+    """ファイルソースの2カメラの結果がcamera_id付きで1本にまとまるテスト"""
+    cameras = [
+        {"camera_id": 0, "device_id": video_file, "threaded": False},
+        {"camera_id": 1, "device_id": video_file, "threaded": False},
+    ]
+    source = MultiCameraSource(cameras, DETECTION_CONFIG, {"max_failures": 1})
+
+    assert source.start() is True
+    results = []
+    try:
+        while source.is_running():
+            result = source.get_result(timeout=30.0)
+            if result is not None:
+                results.append(result)
+    finally:
+        source.stop()
+
+    assert source.errors == {}
+    assert source.frames_received == {0: 10, 1: 10}
+    for camera_id in (0, 1):
+        frame_numbers = [r["frame_number"] for r in results if r["camera_id"] == camera_id]
+        assert frame_numbers == list(range(1, 11))
+    assert all(r["detection"]["hand_count"] == 0 for r in results)
+    assert all(r["timings"]["capture"] >= 0 and r["timings"]["detect"] > 0 for r in results)
+
+
+def test_multi_camera_reports_open_failure(tmp_path):
+    """開けないソースのエラーが報告されるテスト"""
+    cameras = [{"device_id": str(tmp_path / "missing.avi"), "threaded": False}]
+    source = MultiCameraSource(cameras, DETECTION_CONFIG)
+
+    source.start()
+    try:
+        assert source.get_result(timeout=30.0) is None
+    finally:
+        source.stop()
+
+    assert source.is_running() is False
+    assert 0 in source.errors
+
+
+def test_multi_camera_without_cameras():
+    """カメラ設定が空の場合に起動しないテスト"""
+    source = MultiCameraSource([], DETECTION_CONFIG)
+    assert source.start() is False
@@ -0,0 +1,153 @@
+"""
+Unit tests for Pipeline Executor Module
+"""
+
+import pytest
+import threading
+import time
+from src.pipeline import BoundedQueue, Pipeline
+
+
+def test_bounded_queue_drop_oldest():
+    """drop_oldestポリシーで古い要素が捨てられるテスト"""
+    queue = BoundedQueue(2, "drop_oldest")
+    for i in range(5):
+        assert queue.put(i) is True
+
+    assert len(queue) == 2
+    assert queue.dropped == 3
+    assert queue.get(timeout=0.01) == (True, 3)
+    assert queue.get(timeout=0.01) == (True, 4)
+    assert queue.get(timeout=0.01) == (False, None)
+
+
+def test_bounded_queue_block_stops_on_event():
+    """blockポリシーで停止イベントにより待機が解除されるテスト"""
+    queue = BoundedQueue(1, "block")
+    stop_event = threading.Event()
+    queue.put("a")
+
+    stop_event.set()
+    assert queue.put("b", stop_event) is False
+    assert queue.dropped == 0
+    assert len(queue) == 1
+
+
+def test_bounded_queue_invalid_policy():
+    """未知のポリシーでエラーになるテスト"""
+    with pytest.raises(ValueError):
+        BoundedQueue(2, "drop_newest")
+
+
+def test_pipeline_processes_items_in_order():
+    """blockポリシーで全要素が順番通りに処理されるテスト"""
+    counter = iter(range(1, 51))
+    results = []
+    done = threading.Event()
+
+    def source():
+        value = next(counter, None)
+        if value is None:
+            time.sleep(0.01)
+        return value
+
+    def sink(item):
+        results.append(item)
+        if item == 100:
+            done.set()
+        return item
+
+    pipeline = Pipeline(
+        [("source", source), ("double", lambda x: x * 2), ("sink", sink)],
+        queue_size=2, backpressure="block"
+    )
+    pipeline.start()
+    try:
+        assert done.wait(timeout=5.0) is True
+    finally:
+        pipeline.stop()
+
+    assert results == [i * 2 for i in range(1, 51)]
+    assert pipeline.is_running() is False
+
+
+def test_pipeline_filters_none_and_reports_stats():
+    """Noneを返したステージで要素が止まり、統計が記録されるテスト"""
+    counter = iter(range(20))
+    received = []
+
+    def source():
+        value = next(counter, None)
+        if value is None:
+            time.sleep(0.01)
+        return value
+
+    pipeline = Pipeline(
+        [
+            ("source", source),
+            ("even", lambda x: x if x % 2 == 0 else None),
+            ("sink", lambda x: received.append(x) or x),
+        ],
+        queue_size=4, backpressure="block"
+    )
+    pipeline.start()
+    deadline = time.monotonic() + 5.0
+    while len(received) < 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+
+    assert received == list(range(0, 20, 2))
+    stats = pipeline.get_stats()
+    assert set(stats) == {"source", "even", "sink"}
+    assert stats["even"]["processed"] == 20
+    assert stats["even"]["filtered"] == 10
+    assert stats["sink"]["processed"] == 10
+    assert stats["sink"]["queue_depth"] == 0
+    assert stats["even"]["avg_service_ms"] >= 0.0
+
+
+def test_pipeline_drop_oldest_under_slow_stage():
+    """遅いステージの前でdrop_oldestにより要素が捨てられるテスト"""
+    def slow(item):
+        time.sleep(0.02)
+        return item
+
+    pipeline = Pipeline(
+        [("source", lambda: 1), ("slow", slow)],
+        queue_size=1, backpressure="drop_oldest"
+    )
+    pipeline.start()
+    time.sleep(0.2)
+    pipeline.stop()
+
+    stats = pipeline.get_stats()
+    assert stats["slow"]["dropped"] > 0
+    assert stats["slow"]["queue_depth"] <= 1
+    assert stats["slow"]["max_service_ms"] >= 20.0
+
+
+def test_pipeline_stage_errors_are_counted():
+    """ステージで例外が発生しても処理が継続するテスト"""
+    counter = iter(range(6))
+
+    def source():
+        value = next(counter, None)
+        if value is None:
+            time.sleep(0.01)
+        return value
+
+    def flaky(item):
+        if item % 3 == 0:
+            raise RuntimeError("boom")
+        return item
+
+    pipeline = Pipeline([("source", source), ("flaky", flaky)], backpressure="block")
+    pipeline.start()
+    deadline = time.monotonic() + 5.0
+    while pipeline.get_stats()["flaky"]["processed"] < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+
+    stats = pipeline.get_stats()
+    assert stats["flaky"]["errors"] == 2
+    assert stats["flaky"]["processed"] == 6
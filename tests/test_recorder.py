@@ -0,0 +1,140 @@
+"""
+Unit tests for Session Recorder Module
+"""
+
+import os
+
+import pytest
+import numpy as np
+from src.joint_measurement import JointMeasurement
+from src.landmarks import HandLandmarks
+from src.recorder import (
+    HEADER, RECORD_DTYPE, SessionRecorder, load_recording, reprocess, write_output
+)
+
+
+def make_detection(rng, labels=("Right",)):
+    """テスト用の検出結果"""
+    return {
+        "hand_count": len(labels),
+        "hands": [
+            {
+                "label": label,
+                "landmarks": HandLandmarks(rng.random((21, 3), dtype=np.float32)),
+                "confidence": 0.9
+            }
+            for label in labels
+        ]
+    }
+
+
+@pytest.fixture
+def measurement():
+    return JointMeasurement({
+        "landmarks_to_measure": [[0, 4], [0, 8], [4, 8]],
+        "unit": "mm",
+        "scale_factor": 25.0
+    })
+
+
+def test_record_and_load(tmp_path):
+    """記録したランドマークとメタデータが読み戻せるテスト"""
+    rng = np.random.default_rng(0)
+    path = str(tmp_path / "session.htr")
+    recorder = SessionRecorder(path, buffer_size=4)
+    detections = [make_detection(rng, ("Left", "Right")) for _ in range(5)]
+    for number, detection in enumerate(detections, start=1):
+        recorder.record(detection, number, camera_id=2, timestamp=100.0 + number)
+    recorder.close()
+
+    records = load_recording(path)
+
+    assert len(records) == 10
+    assert os.path.getsize(path) == HEADER.size + 10 * RECORD_DTYPE.itemsize
+    assert records["frame_number"].tolist() == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+    assert records["hand_index"].tolist() == [0, 1] * 5
+    assert records["label"].tolist() == [0, 1] * 5
+    assert set(records["camera_id"].tolist()) == {2}
+    assert records["timestamp"][-1] == 105.0
+    np.testing.assert_array_equal(records["landmarks"][3], detections[1]["hands"][1]["landmarks"].array)
+
+
+def test_append_to_existing_recording(tmp_path):
+    """既存の記録に追記され、書きかけのレコードは捨てられるテスト"""
+    rng = np.random.default_rng(1)
+    path = str(tmp_path / "session.htr")
+    recorder = SessionRecorder(path)
+    recorder.record(make_detection(rng), 1)
+    recorder.close()
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 10)
+
+    recorder = SessionRecorder(path)
+    recorder.record(make_detection(rng), 2)
+    recorder.close()
+
+    assert load_recording(path)["frame_number"].tolist() == [1, 2]
+
+
+def test_rejects_foreign_file(tmp_path):
+    """記録ファイルでないファイルはエラーになるテスト"""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a recording file")
+
+    with pytest.raises(ValueError):
+        load_recording(str(path))
+    with pytest.raises(ValueError):
+        SessionRecorder(str(path))
+
+
+def test_reprocess_matches_measurement(tmp_path, measurement):
+    """バッチ再計測の結果がフレームごとの計測と一致するテスト"""
+    rng = np.random.default_rng(2)
+    path = str(tmp_path / "session.htr")
+    recorder = SessionRecorder(path)
+    detections = [make_detection(rng) for _ in range(50)]
+    for number, detection in enumerate(detections):
+        recorder.record(detection, number)
+    recorder.close()
+
+    distances = reprocess(load_recording(path), measurement, batch_size=16)
+
+    assert distances.shape == (50, 3)
+    for row, detection in zip(distances, detections):
+        expected = measurement.calculate_distances(detection["hands"][0]["landmarks"])["measurements"]
+        assert row.tolist() == pytest.approx(
+            [joint["distance"] for joint in expected.values()], abs=0.01
+        )
+
+
+def test_write_output(tmp_path, measurement):
+    """npyとCSVに出力できるテスト"""
+    rng = np.random.default_rng(3)
+    path = str(tmp_path / "session.htr")
+    recorder = SessionRecorder(path)
+    for number in range(3):
+        recorder.record(make_detection(rng), number, timestamp=float(number))
+    recorder.close()
+    records = load_recording(path)
+    distances = reprocess(records, measurement)
+
+    write_output(str(tmp_path / "out.npy"), records, distances, measurement.joint_names)
+    output = np.load(tmp_path / "out.npy")
+    np.testing.assert_array_equal(output["distances"], distances)
+    assert output["frame_number"].tolist() == [0, 1, 2]
+
+    write_output(str(tmp_path / "out.csv"), records, distances, measurement.joint_names)
+    lines = (tmp_path / "out.csv").read_text().splitlines()
+    assert lines[0] == ("timestamp,frame_number,camera_id,hand_index,label,"
+                        "wrist_to_thumb,wrist_to_index,thumb_to_index")
+    assert len(lines) == 4
+
+
+def test_empty_recording(tmp_path, measurement):
+    """手のない記録も読み込めるテスト"""
+    path = str(tmp_path / "session.htr")
+    SessionRecorder(path).close()
+
+    records = load_recording(path)
+    assert len(records) == 0
+    assert reprocess(records, measurement).shape == (0, 3)
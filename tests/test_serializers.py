@@ -0,0 +1,210 @@
+"""
+Unit tests for Serializer Module
+"""
+
+import pytest
+import json
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from src.serializers import BinarySerializer, JsonSerializer, get_serializer
+
+
+def make_frame(frame_number=1, with_landmarks=True, timestamp=None):
+    """テスト用のフレームペイロード"""
+    landmarks = (np.arange(63, dtype=np.float32).reshape(21, 3) / 7.0).tolist()
+    hands = []
+    for hand_id, label in enumerate(["Right", "Left"]):
+        hand = {
+            "hand_id": hand_id,
+            "label": label,
+            "joints": {
+                "wrist_to_thumb": {"distance": 12.5 + hand_id, "unit": "cm"},
+                "wrist_to_index": {"distance": 15.37, "unit": "cm"},
+                "wrist_to_middle": {"distance": 16.81, "unit": "cm"},
+                "wrist_to_ring": {"distance": 15.1, "unit": "cm"},
+                "wrist_to_pinky": {"distance": 13.29, "unit": "cm"}
+            }
+        }
+        if with_landmarks:
+            hand["landmarks"] = landmarks
+        hands.append(hand)
+
+    return {
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "frame_number": frame_number,
+        "hand_data": {"hand_count": 2, "measurements": hands}
+    }
+
+
+def test_get_serializer():
+    """名前からシリアライザが生成されるテスト"""
+    assert isinstance(get_serializer(), JsonSerializer)
+    serializer = get_serializer("binary", schema_interval=5)
+    assert isinstance(serializer, BinarySerializer)
+    assert serializer.schema_interval == 5
+
+    with pytest.raises(ValueError):
+        get_serializer("msgpack")
+
+
+def test_json_roundtrip():
+    """JSONのエンコード・デコードのテスト"""
+    serializer = JsonSerializer()
+    frame = make_frame()
+    assert serializer.decode(serializer.encode(frame)) == frame
+
+
+@pytest.mark.parametrize("with_landmarks", [True, False])
+def test_binary_roundtrip_is_lossless(with_landmarks):
+    """バイナリ形式が可逆であるテスト"""
+    encoder = BinarySerializer()
+    decoder = BinarySerializer()
+    frame = make_frame(with_landmarks=with_landmarks)
+
+    assert decoder.decode(encoder.encode(frame)) == frame
+
+
+def test_binary_roundtrip_utc_timestamp():
+    """タイムゾーン付きタイムスタンプのテスト"""
+    encoder = BinarySerializer()
+    timestamp = datetime(2025, 11, 5, 12, 30, 15, 123456, tzinfo=timezone.utc).isoformat()
+    frame = make_frame(timestamp=timestamp)
+
+    assert encoder.decode(encoder.encode(frame))["timestamp"] == timestamp
+
+
+def test_binary_roundtrip_offset_timestamp():
+    """UTC以外のオフセット付きタイムスタンプがオフセットごと復元されるテスト"""
+    encoder = BinarySerializer()
+    tz = timezone(timedelta(hours=9))
+    timestamp = datetime(2025, 11, 5, 21, 30, 15, 123456, tzinfo=tz).isoformat()
+    frame = make_frame(timestamp=timestamp)
+
+    assert encoder.decode(encoder.encode(frame))["timestamp"] == timestamp
+
+
+def test_binary_rejects_sub_minute_offset():
+    """分単位でないUTCオフセットはエラーになるテスト"""
+    tz = timezone(timedelta(hours=1, seconds=30))
+    frame = make_frame(timestamp=datetime(2025, 11, 5, tzinfo=tz).isoformat())
+
+    with pytest.raises(ValueError):
+        BinarySerializer().encode(frame)
+
+
+def test_binary_is_much_smaller_than_json():
+    """バイナリ形式がJSONより大幅に小さいテスト"""
+    encoder = BinarySerializer(schema_interval=30)
+    frame = make_frame(with_landmarks=False)
+    encoder.encode(frame)  # スキーマ付きの初回フレーム
+
+    binary_size = len(encoder.encode(frame))
+    json_size = len(json.dumps(frame).encode("utf-8"))
+
+    assert binary_size * 5 < json_size
+
+
+def test_binary_schema_sent_periodically():
+    """スキーマが初回とschema_intervalごとにだけ送られるテスト"""
+    encoder = BinarySerializer(schema_interval=3)
+    sizes = [len(encoder.encode(make_frame(i))) for i in range(7)]
+
+    with_schema = [i for i, size in enumerate(sizes) if size > min(sizes)]
+    assert with_schema == [0, 3, 6]
+
+
+def test_binary_decode_unknown_schema():
+    """スキーマ未受信のフレームをデコードするとエラーになるテスト"""
+    encoder = BinarySerializer()
+    encoder.encode(make_frame(1))
+    second = encoder.encode(make_frame(2))
+
+    with pytest.raises(ValueError):
+        BinarySerializer().decode(second)
+
+
+def test_binary_batch_roundtrip():
+    """バッチのエンコード・デコードのテスト"""
+    encoder = BinarySerializer()
+    batch = {"frames": [make_frame(i) for i in range(5)]}
+
+    assert BinarySerializer().decode(encoder.encode(batch)) == batch
+
+
+def test_binary_self_contained_every_encode_decodable():
+    """self_containedでは各encode()の出力が単独でデコードできるテスト"""
+    encoder = BinarySerializer(self_contained=True)
+    frames = [make_frame(i) for i in range(3)]
+
+    for frame in frames:
+        assert BinarySerializer().decode(encoder.encode(frame)) == frame
+
+
+def test_binary_self_contained_batch_has_schema_once():
+    """self_containedのバッチではスキーマが1回だけ含まれるテスト"""
+    encoder = BinarySerializer(self_contained=True)
+    batch = {"frames": [make_frame(i) for i in range(3)]}
+    # 新しいシリアライザのバッチは先頭フレームにだけスキーマを含む
+    schema_once = len(BinarySerializer().encode(batch))
+
+    encoder.encode(make_frame(0))
+    payload = encoder.encode(batch)
+    assert len(payload) == schema_once
+    assert BinarySerializer().decode(payload) == batch
+    assert BinarySerializer().decode(encoder.encode(batch)) == batch
+
+
+def test_binary_reset_resends_schema():
+    """reset()後の最初のフレームにスキーマが含まれるテスト"""
+    encoder = BinarySerializer()
+    encoder.encode(make_frame(1))
+    encoder.encode(make_frame(2))
+    encoder.reset()
+
+    frame = make_frame(3)
+    assert BinarySerializer().decode(encoder.encode(frame)) == frame
+
+
+def test_binary_rejects_unknown_label():
+    """未知のラベルはエラーになるテスト"""
+    frame = make_frame()
+    frame["hand_data"]["measurements"][0]["label"] = "Unknown"
+
+    with pytest.raises(ValueError):
+        BinarySerializer().encode(frame)
+
+
+def test_binary_encodes_landmark_container():
+    """HandLandmarksを直接エンコードし、HandLandmarksとしてデコードされるテスト"""
+    from src.landmarks import HandLandmarks
+
+    frame = make_frame()
+    for hand in frame["hand_data"]["measurements"]:
+        hand["landmarks"] = HandLandmarks.from_list(hand["landmarks"])
+
+    decoded = BinarySerializer().decode(BinarySerializer().encode(frame))
+
+    assert decoded == frame
+    assert isinstance(decoded["hand_data"]["measurements"][0]["landmarks"], HandLandmarks)
+
+
+def test_binary_roundtrip_with_camera_id():
+    """camera_id付きのフレームが可逆に送れるテスト"""
+    frame = make_frame()
+    frame["camera_id"] = 3
+
+    decoded = BinarySerializer().decode(BinarySerializer().encode(frame))
+
+    assert decoded == frame
+
+
+def test_binary_roundtrip_predicted_flag():
+    """予測した手のフラグがバイナリ形式で保持されるテスト"""
+    encoder = BinarySerializer()
+    frame = make_frame()
+    frame["hand_data"]["measurements"][1]["predicted"] = True
+
+    decoded = encoder.decode(encoder.encode(frame))
+
+    assert decoded == frame
+    assert "predicted" not in decoded["hand_data"]["measurements"][0]
@@ -0,0 +1,107 @@
+"""
+Unit tests for Smoothing Module
+"""
+
+import pytest
+import numpy as np
+from src.smoothing import LandmarkSmoother
+
+
+DT = 1 / 30
+
+
+def test_first_frame_passes_through():
+    """最初のフレームは観測値をそのまま返すテスト"""
+    smoother = LandmarkSmoother({})
+    points = np.full((21, 3), 0.5, dtype=np.float32)
+
+    smoother.smooth([points], [0], 0.0)
+
+    np.testing.assert_array_equal(points, 0.5)
+
+
+def test_ema_step():
+    """EMAの更新式のテスト"""
+    smoother = LandmarkSmoother({"method": "ema", "alpha": 0.25})
+    smoother.smooth([np.zeros((21, 3), dtype=np.float32)], [0], 0.0)
+
+    points = np.ones((21, 3), dtype=np.float32)
+    smoother.smooth([points], [0], DT)
+
+    np.testing.assert_allclose(points, 0.25)
+
+
+def test_one_euro_reduces_jitter():
+    """静止した手のジッタをOne Euroフィルタが抑えるテスト"""
+    rng = np.random.default_rng(0)
+    smoother = LandmarkSmoother({"min_cutoff": 1.0, "beta": 10.0})
+    raw, smoothed = [], []
+
+    for i in range(120):
+        points = (0.5 + rng.normal(0, 0.005, (21, 3))).astype(np.float32)
+        raw.append(points.copy())
+        smoother.smooth([points], [0], i * DT)
+        smoothed.append(points.copy())
+
+    assert np.std(smoothed[30:]) < np.std(raw[30:]) / 2
+
+
+def test_one_euro_follows_fast_motion():
+    """速い動きでは遅れが小さい（betaでカットオフが上がる）テスト"""
+    slow = LandmarkSmoother({"min_cutoff": 1.0, "beta": 0.0})
+    fast = LandmarkSmoother({"min_cutoff": 1.0, "beta": 50.0})
+    errors = {}
+
+    for name, smoother in (("slow", slow), ("fast", fast)):
+        for i in range(30):
+            target = np.full((21, 3), i * 0.02, dtype=np.float32)
+            points = target.copy()
+            smoother.smooth([points], [0], i * DT)
+        errors[name] = float(np.abs(points - target).max())
+
+    assert errors["fast"] < errors["slow"] / 2
+
+
+def test_slots_are_independent():
+    """スロットごとに独立した状態を持つテスト"""
+    smoother = LandmarkSmoother({"method": "ema", "alpha": 0.5})
+    left = np.zeros((21, 3), dtype=np.float32)
+    right = np.ones((21, 3), dtype=np.float32)
+    smoother.smooth([left, right], [0, 1], 0.0)
+
+    left = np.ones((21, 3), dtype=np.float32)
+    right = np.zeros((21, 3), dtype=np.float32)
+    smoother.smooth([left, right], [0, 1], DT)
+
+    np.testing.assert_allclose(left, 0.5)
+    np.testing.assert_allclose(right, 0.5)
+
+
+def test_missing_slot_is_reset():
+    """現れなかったスロットは次に現れたとき初期化されるテスト"""
+    smoother = LandmarkSmoother({"method": "ema", "alpha": 0.5})
+    smoother.smooth([np.zeros((21, 3), dtype=np.float32)], [0], 0.0)
+    smoother.smooth([], [], DT)
+
+    points = np.ones((21, 3), dtype=np.float32)
+    smoother.smooth([points], [0], 2 * DT)
+
+    np.testing.assert_array_equal(points, 1.0)
+
+
+def test_stale_slot_is_reset():
+    """reset_after秒以上空いたスロットは初期化されるテスト"""
+    smoother = LandmarkSmoother({"method": "ema", "alpha": 0.5, "reset_after": 0.5})
+    smoother.smooth([np.zeros((21, 3), dtype=np.float32)], [0], 0.0)
+
+    points = np.ones((21, 3), dtype=np.float32)
+    smoother.smooth([points], [0], 1.0)
+
+    np.testing.assert_array_equal(points, 1.0)
+
+
+def test_unknown_method():
+    """未知の方式のエラーハンドリングテスト"""
+    with pytest.raises(ValueError):
+        LandmarkSmoother({"method": "kalman"})
+
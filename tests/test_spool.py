@@ -0,0 +1,127 @@
+"""
+Unit tests for Spool Module
+"""
+
+import os
+
+import pytest
+from src.spool import DiskSpool, RECORD_HEADER
+
+
+def drain(spool):
+    """スプールの中身を全て取り出す"""
+    payloads = []
+    while True:
+        payload = spool.peek()
+        if payload is None:
+            return payloads
+        payloads.append(payload)
+        spool.ack()
+
+
+def test_fifo_order(tmp_path):
+    """追記した順に取り出せるテスト"""
+    spool = DiskSpool(str(tmp_path))
+    for i in range(5):
+        spool.append(f"frame-{i}".encode())
+
+    assert len(spool) == 5
+    assert drain(spool) == [f"frame-{i}".encode() for i in range(5)]
+    assert len(spool) == 0
+    assert spool.peek() is None
+
+
+def test_peek_without_ack_returns_same_payload(tmp_path):
+    """ackするまで同じペイロードを返すテスト"""
+    spool = DiskSpool(str(tmp_path))
+    spool.append(b"first")
+    spool.append(b"second")
+
+    assert spool.peek() == b"first"
+    assert spool.peek() == b"first"
+    spool.ack()
+    assert spool.peek() == b"second"
+
+
+def test_segments_roll_and_are_removed(tmp_path):
+    """セグメントが切り替わり、読み終えたセグメントが削除されるテスト"""
+    spool = DiskSpool(str(tmp_path), segment_size=64)
+    payloads = [bytes([i]) * 40 for i in range(6)]
+    for payload in payloads:
+        spool.append(payload)
+
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".seg")]) == 3
+    assert drain(spool) == payloads
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".seg")]) <= 1
+
+
+def test_oldest_first_eviction(tmp_path):
+    """上限サイズを超えたら古いセグメントから捨てるテスト"""
+    record = RECORD_HEADER.size + 40
+    spool = DiskSpool(str(tmp_path), segment_size=record * 2, max_bytes=record * 4)
+    payloads = [bytes([i]) * 40 for i in range(10)]
+    for payload in payloads:
+        spool.append(payload)
+
+    assert spool.size_bytes() <= record * 4
+    assert spool.stats["evicted"] == 6
+    assert drain(spool) == payloads[6:]
+
+
+def test_eviction_of_partially_read_segment(tmp_path):
+    """読み出し途中のセグメントが捨てられても順序と件数が保たれるテスト"""
+    record = RECORD_HEADER.size + 40
+    spool = DiskSpool(str(tmp_path), segment_size=record * 2, max_bytes=record * 4)
+    payloads = [bytes([i]) * 40 for i in range(8)]
+    for payload in payloads[:4]:
+        spool.append(payload)
+    assert spool.peek() == payloads[0]
+    spool.ack()
+
+    for payload in payloads[4:]:
+        spool.append(payload)
+
+    assert spool.stats["evicted"] == 3
+    assert len(spool) == 4
+    assert drain(spool) == payloads[4:]
+
+
+def test_recovers_after_restart(tmp_path):
+    """再起動後に未送信分から再開するテスト"""
+    spool = DiskSpool(str(tmp_path), segment_size=64)
+    for i in range(5):
+        spool.append(f"frame-{i}".encode())
+    for _ in range(2):
+        spool.peek()
+        spool.ack()
+    spool.close()
+
+    reopened = DiskSpool(str(tmp_path), segment_size=64)
+    assert len(reopened) == 3
+    reopened.append(b"frame-5")
+    assert drain(reopened) == [f"frame-{i}".encode() for i in range(2, 6)]
+
+
+def test_truncates_torn_write(tmp_path):
+    """クラッシュで途中まで書かれたレコードを捨てて開けるテスト"""
+    spool = DiskSpool(str(tmp_path))
+    spool.append(b"complete")
+    spool.close()
+
+    segment = [n for n in os.listdir(tmp_path) if n.endswith(".seg")][0]
+    with open(tmp_path / segment, "ab") as f:
+        f.write(RECORD_HEADER.pack(100, 0) + b"partial")
+
+    reopened = DiskSpool(str(tmp_path))
+    assert len(reopened) == 1
+    assert drain(reopened) == [b"complete"]
+
+
+@pytest.mark.parametrize("size", [0, 1, 100000])
+def test_payload_sizes(tmp_path, size):
+    """空や大きなペイロードも保存できるテスト"""
+    spool = DiskSpool(str(tmp_path), segment_size=1024)
+    payload = os.urandom(size)
+    spool.append(payload)
+
+    assert drain(spool) == [payload]
@@ -0,0 +1,66 @@
+"""
+Unit tests for Startup Timer Module
+"""
+
+import threading
+import time
+
+import pytest
+from src.startup import StartupTimer
+
+
+def test_phases_are_recorded_relative_to_origin():
+    """フェーズの開始時刻が基準時刻からの経過として記録されるテスト"""
+    origin = time.perf_counter()
+    timer = StartupTimer(origin=origin)
+    timer.record("imports", origin, origin + 0.25)
+    with timer.phase("config"):
+        time.sleep(0.01)
+
+    imports, config = timer.phases
+    assert imports == {"name": "imports", "start": 0.0, "duration": 0.25}
+    assert config["name"] == "config"
+    assert config["start"] >= 0
+    assert config["duration"] >= 0.01
+    assert timer.elapsed() >= config["start"] + config["duration"]
+
+
+def test_phase_is_recorded_on_error():
+    """例外で終わったフェーズも記録されるテスト"""
+    timer = StartupTimer()
+    with pytest.raises(RuntimeError):
+        with timer.phase("camera_open"):
+            raise RuntimeError("no camera")
+    assert [phase["name"] for phase in timer.phases] == ["camera_open"]
+
+
+def test_report_orders_concurrent_phases_by_start():
+    """並行したフェーズが開始順に並び、全体の所要時間が最後に終わったフェーズまでになるテスト"""
+    origin = 100.0
+    timer = StartupTimer(origin=origin)
+    timer.record("model_load", origin + 0.2, origin + 1.5)
+    timer.record("camera_open", origin + 0.1, origin + 0.4)
+    timer.record("health_check", origin + 0.2, origin + 0.3)
+
+    lines = timer.report()
+    assert [line.split()[0] for line in lines] == ["camera_open", "model_load", "health_check", "total"]
+    assert "took   1300.0ms" in lines[1]
+    assert lines[-1].endswith("1500.0ms")
+
+
+def test_record_from_threads():
+    """複数スレッドから同時に記録できるテスト"""
+    timer = StartupTimer()
+
+    def work(name):
+        with timer.phase(name):
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=work, args=(f"phase-{i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(phase["name"] for phase in timer.phases) == sorted(f"phase-{i}" for i in range(8))
+    assert len(timer.report()) == 9
@@ -0,0 +1,93 @@
+"""
+Unit tests for Landmark Tracker Module
+"""
+
+import pytest
+import numpy as np
+from src.landmarks import HandLandmarks
+from src.tracker import LandmarkTracker
+
+
+def make_detection(*hands):
+    """(label, 座標配列) の組からHandDetector形式の検出結果を作る"""
+    return {
+        "hand_count": len(hands),
+        "hands": [
+            {"label": label, "landmarks": HandLandmarks(points), "confidence": 0.9}
+            for label, points in hands
+        ],
+        "timestamp": ""
+    }
+
+
+@pytest.fixture
+def base_points():
+    """基準の手の座標"""
+    rng = np.random.default_rng(0)
+    return rng.random((21, 3)).astype(np.float32) * 0.2 + 0.3
+
+
+@pytest.fixture
+def tracker():
+    return LandmarkTracker({"max_predicted_frames": 3})
+
+
+def test_detected_hands_are_not_modified(tracker, base_points):
+    """検出したフレームのランドマークはそのまま返すテスト"""
+    detection = tracker.update(make_detection(("Right", base_points)), 0.0)
+
+    assert detection["hands"][0]["predicted"] is False
+    assert detection["hands"][0]["landmarks"] == base_points
+    assert len(tracker.tracks) == 1
+
+
+def test_constant_velocity_prediction(tracker, base_points):
+    """等速で動く手の位置を予測するテスト"""
+    velocity = np.array([0.3, -0.15, 0.0], dtype=np.float32)  # 正規化座標/秒
+    dt = 1 / 30
+
+    for i in range(6):
+        tracker.update(make_detection(("Right", base_points + velocity * i * 2 * dt)), i * 2 * dt)
+
+    t = 11 * dt
+    predicted = tracker.predict(t)
+
+    assert predicted["predicted"] is True
+    assert predicted["hand_count"] == 1
+    hand = predicted["hands"][0]
+    assert hand["predicted"] is True
+    assert hand["label"] == "Right"
+    np.testing.assert_allclose(hand["landmarks"].array, base_points + velocity * t, atol=2e-3)
+
+
+def test_prediction_stops_after_max_frames(tracker, base_points):
+    """観測なしの予測はmax_predicted_framesで打ち切るテスト"""
+    tracker.update(make_detection(("Right", base_points)), 0.0)
+
+    counts = [tracker.predict(0.03 * (i + 1))["hand_count"] for i in range(5)]
+
+    assert counts == [1, 1, 1, 0, 0]
+    assert tracker.tracks == []
+
+
+def test_tracks_follow_labels(tracker, base_points):
+    """左右の手がそれぞれの追跡に対応付けられるテスト"""
+    left = base_points - 0.2
+    right = base_points + 0.2
+    tracker.update(make_detection(("Left", left), ("Right", right)), 0.0)
+    # 検出の順序が入れ替わっても同じ追跡を更新する
+    tracker.update(make_detection(("Right", right + 0.01), ("Left", left - 0.01)), 0.1)
+
+    predicted = tracker.predict(0.2)
+    by_label = {hand["label"]: hand["landmarks"].array for hand in predicted["hands"]}
+
+    assert by_label["Right"][0, 0] > right[0, 0]
+    assert by_label["Left"][0, 0] < left[0, 0]
+
+
+def test_lost_hand_is_dropped(tracker, base_points):
+    """検出で見えなくなった手は追跡から外れるテスト"""
+    tracker.update(make_detection(("Right", base_points)), 0.0)
+    tracker.update(make_detection(), 0.03)
+
+    assert tracker.predict(0.06)["hand_count"] == 0